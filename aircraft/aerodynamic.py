@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry, Nicolas Monrolin
+"""
+
+import numpy as np
+
+import earth
+
+
+class Aerodynamics(object):
+
+    def __init__(self, requirement):
+
+        self.hld_conf_to = 0.30
+        self.hld_conf_ld = 1.00
+
+        self.cx_correction = 0.     # Drag correction on the zero lift drag
+        self.cx_tap = 0.0008        # Drag of the parts not modelled, antennas, sensors, ...
+        self.cz_design = 0.5        # Lift coefficient of the cruise drag divergence Mach number
+
+
+class Polar(object):
+    """
+    Drag polar of an aircraft whose geometry has been evaluated, over arrays of lift coefficient, Mach and altitude
+
+    Geometry is read at construction : the wetted area, aerodynamic length and form factor of every airframe
+    component (get_net_wet_area, get_aero_length, get_form_factor), wing and fuselage dimensions.
+    Build a new polar when the geometry changes. All geometry values can hold N designs.
+    Zero lift drag, where the friction of each component depends on the Reynolds number, is kept for the last
+    cache_size conditions (mach, altp, disa), so that the many queries of a mission at the same flight condition
+    only compute the lift dependent drag.
+    """
+    def __init__(self, aircraft, cache_size=256):
+        airframe = aircraft.airframe
+        aerodynamics = aircraft.aerodynamics
+
+        self.wing_area = airframe.wing.area
+        self.cruise_mach = aircraft.requirement.cruise_mach
+        self.cx_correction = aerodynamics.cx_correction
+        self.cx_tap = aerodynamics.cx_tap
+        self.cz_design = aerodynamics.cz_design
+
+        self.components = []        # Wetted area, aerodynamic length and form factor of the components that have drag
+        net_wet_area = 0.
+        for comp in vars(airframe).values():
+            nwa = comp.get_net_wet_area()
+            if np.all(nwa==0.):
+                continue
+            self.components.append((nwa, comp.get_aero_length(), comp.get_form_factor()))
+            net_wet_area = net_wet_area + nwa
+
+        knwa = net_wet_area/1000.
+        self.kp = (0.0247*knwa - 0.11)*knwa + 0.166     # Parasitic drag factor (seals, steps, gaps, ...)
+
+        # Induced drag factor
+        self.ki = (1.05 + (airframe.fuselage.width/airframe.wing.span)**2) / (np.pi*airframe.wing.aspect_ratio)
+
+        self.cache_size = cache_size
+        self.cache = {}
+        self.n_hit = 0
+        self.n_miss = 0
+
+    def zero_lift_drag(self, mach, altp, disa=0.):
+        """
+        Friction drag of the components, with parasitic drag and corrections, cached per condition
+        """
+        key = tuple((np.shape(v), np.asarray(v).tobytes()) for v in (mach, altp, disa))
+        if key in self.cache:
+            self.n_hit += 1
+            return self.cache[key]
+        self.n_miss += 1
+
+        pamb,tamb,tstd,dtodz = earth.atmosphere(altp, disa)
+        re = earth.reynolds_number(pamb, tamb, mach)        # Per meter
+        fac = 1. + 0.126*mach**2
+
+        cxf = 0.
+        for nwa,ael,frm in self.components:
+            if np.all(ael>0.):
+                # Flat plate friction over the aerodynamic length
+                cf = (0.455/fac)*(np.log(10.)/np.log(re*ael))**2.58
+            else:
+                # Drag area model where there is no aerodynamic length, nwa is then a frontal area
+                ael_ = np.where(ael>0., ael, 1.)
+                cf = np.where(ael>0., (0.455/fac)*(np.log(10.)/np.log(re*ael_))**2.58, 1.)
+            cxf = cxf + frm*cf*(nwa/self.wing_area)
+
+        cx0 = cxf*(1.+self.kp) + self.cx_correction + self.cx_tap
+
+        if (len(self.cache)>=self.cache_size):
+            self.cache.clear()
+        if (self.cache_size>0):
+            if isinstance(cx0, np.ndarray):
+                cx0.flags.writeable = False     # Shared by all queries at this condition
+            self.cache[key] = cx0
+        return cx0
+
+    def drag(self, cz, mach, altp, disa=0.):
+        """
+        Drag coefficient and lift to drag ratio, all inputs and geometry values are broadcast together
+        """
+        cx0 = self.zero_lift_drag(mach, altp, disa)
+
+        cxi = self.ki*cz**2     # Induced drag
+
+        # Compressibility drag, freely inspired from Korn equation
+        mach_div = self.cruise_mach + (0.03 + 0.1*(self.cz_design - cz))
+        cxc = 0.0025*np.exp(40.*(mach - mach_div))
+
+        cx = cx0 + cxi + cxc
+        return cx, cz/cx
@@ -12,25 +12,167 @@ import unit
 import earth
 
 
+NOT_COMPUTED = np.full(3, np.nan)      # Shared read-only values of vectors and tensors not computed yet
+NOT_COMPUTED.flags.writeable = False
+NOT_COMPUTED_TENSOR = np.full((3,3), np.nan)
+NOT_COMPUTED_TENSOR.flags.writeable = False
+
+
+SLOTS = {}      # All slot names of each component class, see Component.all_slots
+
+
+def vector(*coords):
+    """
+    Build a float coordinate vector, a (3,N) array when some coordinates hold N designs
+    The vector is complex when some coordinate is complex (complex step derivatives)
+    Undefined coordinates (None) are set to NaN
+    """
+    coords = [np.nan if c is None else c for c in coords]
+    dtype = np.result_type(float, *coords)
+    try:
+        return np.array(coords, dtype=dtype)
+    except ValueError:      # Coordinates of different shapes
+        return np.array(np.broadcast_arrays(*coords), dtype=dtype)
+
+
+# Maximum lift coefficients of different airfoils versus hld_type, DUBS 1987
+HLD_CZ_MAX_LD = np.array([1.45,     # 0 : Clean
+                          2.25,     # 1 : Flap only, Rotation without slot
+                          2.60,     # 2 : Flap only, Rotation single slot      (ATR)
+                          2.80,     # 3 : Flap only, Rotation double slot
+                          2.80,     # 4 : Fowler Flap
+                          2.00,     # 5 : Slat only
+                          2.45,     # 6 : Slat + Flap rotation without slot
+                          2.70,     # 7 : Slat + Flap rotation single slot
+                          2.90,     # 8 : Slat + Flap rotation double slot
+                          3.00,     # 9 : Slat + Fowler                      (A320)
+                          3.20])    # 10 : Slat + Fowler + Fowler double slot (A321)
+HLD_CZ_MAX_LD.flags.writeable = False
+
+
+def high_lift_table(hld_type):
+    """
+    Maximum lift coefficient in landing configuration of hld_type, an integer or an array of integers,
+    and whether the device is a flap only one (no slat)
+    """
+    if np.any((np.asarray(hld_type)<0) | (len(HLD_CZ_MAX_LD)<=np.asarray(hld_type))):
+        raise Exception("high_lift, hld_type out of range")
+    return HLD_CZ_MAX_LD[hld_type], np.asarray(hld_type)<5
+
+
+def readonly_view(array):
+    """
+    Read-only view of array, array itself stays writable
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+VECTORS = ["frame_origin", "frame_angles", "cg", "c_g", "cg_furnishing", "cg_op_item",
+           "loc_root", "loc_kink", "loc_tip", "loc_mac", "loc_axe"]      # Attributes holding x,y,z vectors
+
+
+def owner(aircraft, slot):
+    """
+    Object holding the attributes of slot : a component of aircraft.airframe or a top level object of aircraft
+    """
+    obj = getattr(aircraft.airframe, slot, None)
+    if obj is None:
+        obj = getattr(aircraft, slot, None)
+    if obj is None:
+        raise Exception("aircraft has no component or data named "+slot)
+    return obj
+
+
 class Component(object):
     """
     Define common features of all airplane components
+
+    Geometry and mass of a component are computed by geometry_kernel and mass_kernel, functions of floats or
+    arrays without access to the aircraft. Each component declares the arguments and the results of its kernels
+    as "slot.attribute" names, slot being the name of a component in aircraft.airframe or a top level object of
+    the aircraft (requirement, arrangement, weight_cg, aerodynamics). eval_geometry and eval_mass read the inputs
+    from the aircraft, call the kernel and store its results, process.scheduler orders evaluations from the same
+    declarations and process.plan compiles the kernels into a flat evaluation plan
     """
+    __slots__ = ("aircraft", "frame_origin", "frame_angles", "mass", "cg", "inertia_tensor", "gross_wet_area",
+                 "net_wet_area", "aero_length", "form_factor", "modified")
+    geometry_inputs = []
+    geometry_outputs = []
+    mass_inputs = []
+    mass_outputs = []
+
     def __init__(self, aircraft):
+        object.__setattr__(self, "modified", set())     # Names of attributes set since last scheduler run
+
         self.aircraft = aircraft
 
-        self.frame_origin = np.full(3,None)
-        self.frame_angles = np.full(3,None)
+        self.frame_origin = NOT_COMPUTED
+        self.frame_angles = NOT_COMPUTED
 
         self.mass = None
-        self.cg = np.full(3,None)
-        self.inertia_tensor = np.full((3,3),None)
+        self.cg = NOT_COMPUTED
+        self.inertia_tensor = NOT_COMPUTED_TENSOR
 
         self.gross_wet_area = 0.    # wetted area of the component alone
         self.net_wet_area = 0.      # wetted area of the component in the assembly (without footprints)
         self.aero_length = 0.       # characteristic length of the component in the dirction of the flow
         self.form_factor = 0.       # factor on skin friction to account for lift independent pressure drag
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        self.modified.add(name)
+
+    def __setstate__(self, state):
+        # Restore copies and pickles without going through __setattr__
+        dict_state,slots_state = state
+        object.__setattr__(self, "modified", set())
+        for name,value in slots_state.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def all_slots(cls):
+        if cls not in SLOTS:
+            SLOTS[cls] = [name for c in cls.__mro__ for name in getattr(c, "__slots__", ())]
+        return SLOTS[cls]
+
+    def clone(self, aircraft):
+        """
+        Shallow copy of the component attached to aircraft, arrays are read-only views of the arrays of self
+        """
+        comp = object.__new__(type(self))
+        for name in self.all_slots():
+            try:
+                value = getattr(self, name)
+            except AttributeError:      # Slot not set yet
+                continue
+            if isinstance(value, np.ndarray):
+                value = readonly_view(value)
+            object.__setattr__(comp, name, value)
+        object.__setattr__(comp, "aircraft", aircraft)
+        object.__setattr__(comp, "modified", set())
+        return comp
+
+    def eval_step(self, step):
+        """
+        Read the declared inputs of step ("geometry" or "mass"), call its kernel and store the declared outputs
+        """
+        inputs = []
+        for name in getattr(self, step+"_inputs"):
+            slot,attr = name.split(".")
+            inputs.append(getattr(owner(self.aircraft, slot), attr))
+        outputs = getattr(self, step+"_kernel")(*inputs)
+        for name,value in zip(getattr(self, step+"_outputs"), outputs):
+            slot,attr = name.split(".")
+            setattr(owner(self.aircraft, slot), attr, value)
+
+    def eval_geometry(self):
+        self.eval_step("geometry")
+
+    def eval_mass(self):
+        self.eval_step("mass")
+
     def get_mass_mwe(self):
         raise NotImplementedError
 
@@ -57,6 +199,13 @@ class Component(object):
 
 
 class Cabin(Component):
+    __slots__ = ("width", "length", "projected_area", "co2_metric_area", "m_furnishing", "m_op_item",
+                 "cg_furnishing", "cg_op_item")
+    geometry_inputs = ["requirement.n_pax_ref", "requirement.n_pax_front", "requirement.n_aisle"]
+    geometry_outputs = ["cabin.width", "cabin.length", "cabin.projected_area"]
+    mass_inputs = ["requirement.n_pax_ref", "requirement.design_range", "cabin.frame_origin", "cabin.length"]
+    mass_outputs = ["cabin.m_furnishing", "cabin.m_op_item", "cabin.cg_furnishing", "cabin.cg_op_item",
+                    "cabin.mass", "cabin.cg"]
 
     def __init__(self, aircraft):
 
@@ -72,31 +221,30 @@ class Cabin(Component):
         self.cg_furnishing = None
         self.cg_op_item = None
 
-    def eval_geometry(self):
-        n_pax_ref = self.aircraft.requirement.n_pax_ref
-        n_pax_front = self.aircraft.requirement.n_pax_front
-        n_aisle = self.aircraft.requirement.n_aisle
+    @staticmethod
+    def geometry_kernel(n_pax_ref, n_pax_front, n_aisle):
+        width = 0.38*n_pax_front + 1.05*n_aisle + 0.15     # Statistical regression
+        length = 6.3*(width - 0.24) + 0.005*(n_pax_ref/n_pax_front)**2.25     # Statistical regression
 
-        self.width = 0.38*n_pax_front + 1.05*n_aisle + 0.15     # Statistical regression
-        self.length = 6.3*(self.width - 0.24) + 0.005*(n_pax_ref/n_pax_front)**2.25     # Statistical regression
+        projected_area = 0.95*length*width       # Factor 0.95 accounts for tapered parts
 
-        self.projected_area = 0.95*self.length*self.width       # Factor 0.95 accounts for tapered parts
+        return width, length, projected_area
 
-    def eval_mass(self):
-        n_pax_ref = self.aircraft.requirement.n_pax_ref
-        design_range = self.aircraft.requirement.design_range
-
-        self.m_furnishing = (0.063*n_pax_ref**2 + 9.76*n_pax_ref)       # Furnishings mass
-        self.m_op_item = 5.2*(n_pax_ref*design_range*1e-6)          # Operator items mass
+    @staticmethod
+    def mass_kernel(n_pax_ref, design_range, frame_origin, length):
+        m_furnishing = (0.063*n_pax_ref**2 + 9.76*n_pax_ref)       # Furnishings mass
+        m_op_item = 5.2*(n_pax_ref*design_range*1e-6)          # Operator items mass
 
-        x_cg_furnishing = self.frame_origin[0] + 0.55*self.length      # Rear cabin is heavier because of higher density
+        x_cg_furnishing = frame_origin[0] + 0.55*length      # Rear cabin is heavier because of higher density
         x_cg_op_item = x_cg_furnishing    # Operator items cg
 
-        self.cg_furnishing = np.array([x_cg_furnishing, 0., 0.])
-        self.cg_op_item = np.array([x_cg_op_item, 0., 0.])
+        cg_furnishing = vector(x_cg_furnishing, 0., 0.)
+        cg_op_item = vector(x_cg_op_item, 0., 0.)
+
+        mass = m_furnishing + m_op_item
+        cg = (cg_furnishing*m_furnishing + cg_op_item*m_op_item) / mass
 
-        self.mass = self.m_furnishing + self.m_op_item
-        self.cg = (self.cg_furnishing*self.m_furnishing + self.cg_op_item*self.m_op_item) / self.mass
+        return m_furnishing, m_op_item, cg_furnishing, cg_op_item, mass, cg
 
     def get_mass_mwe(self):
         return self.m_furnishing
@@ -106,6 +254,14 @@ class Cabin(Component):
 
 
 class Fuselage(Component):
+    __slots__ = ("width", "height", "length", "tail_cone_length")
+    geometry_inputs = ["cabin.width", "cabin.length"]
+    geometry_outputs = ["fuselage.frame_origin", "fuselage.frame_angles", "cabin.frame_origin",
+                        "cabin.frame_angles", "fuselage.width", "fuselage.height", "fuselage.length",
+                        "fuselage.tail_cone_length", "fuselage.gross_wet_area", "fuselage.net_wet_area",
+                        "fuselage.aero_length", "fuselage.form_factor"]
+    mass_inputs = ["fuselage.length", "fuselage.width", "fuselage.height"]
+    mass_outputs = ["fuselage.mass", "fuselage.cg"]
 
     def __init__(self, aircraft):
 
@@ -116,36 +272,55 @@ class Fuselage(Component):
         self.length = None
         self.tail_cone_length = None
 
-    def eval_geometry(self):
-        self.frame_origin = [0., 0., 0.]
-        self.frame_angles = [0., 0., 0.]
-
-        cabin_width = self.aircraft.airframe.cabin.width
-        cabin_length = self.aircraft.airframe.cabin.length
+    @staticmethod
+    def geometry_kernel(cabin_width, cabin_length):
+        frame_origin = vector(0., 0., 0.)
+        frame_angles = vector(0., 0., 0.)
 
         fwd_limit = 4.      # Cabin starts 4 meters behind fuselage nose
 
-        self.aircraft.airframe.cabin.frame_origin = [fwd_limit, 0., 0.]     # cabin position inside the fuselage
-        self.aircraft.airframe.cabin.frame_angles = [0., 0., 0.]            # cabin orientation inside the fuselage
+        cabin_frame_origin = vector(fwd_limit, 0., 0.)     # cabin position inside the fuselage
+        cabin_frame_angles = vector(0., 0., 0.)            # cabin orientation inside the fuselage
 
-        self.width = cabin_width + 0.4      # Fuselage walls are supposed 0.2m thick
-        self.height = 1.25*(cabin_width - 0.15)
-        self.length = fwd_limit + cabin_length + 1.50*self.width
-        self.tail_cone_length = 3.45*self.width
+        width = cabin_width + 0.4      # Fuselage walls are supposed 0.2m thick
+        height = 1.25*(cabin_width - 0.15)
+        length = fwd_limit + cabin_length + 1.50*width
+        tail_cone_length = 3.45*width
 
-        self.gross_wet_area = 2.70*self.length*np.sqrt(self.width*self.height)
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.70*length*np.sqrt(width*height)
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.length
-        self.form_factor = 1.05
+        aero_length = length
+        form_factor = 1.05
 
-    def eval_mass(self):
-        kfus = np.pi*self.length*np.sqrt(self.width*self.height)
-        self.mass = 5.47*kfus**1.2      # Statistical regression versus fuselage built surface
-        self.cg = np.array([0.50*self.length, 0., 0.40*self.height])     # Middle of the fuselage
+        return frame_origin, frame_angles, cabin_frame_origin, cabin_frame_angles, width, height, length, \
+               tail_cone_length, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(length, width, height):
+        kfus = np.pi*length*np.sqrt(width*height)
+        mass = 5.47*kfus**1.2      # Statistical regression versus fuselage built surface
+        cg = vector(0.50*length, 0., 0.40*height)     # Middle of the fuselage
+        return mass, cg
 
 
 class Wing(Component):
+    __slots__ = ("morphing", "area", "span", "aspect_ratio", "taper_ratio", "sweep0", "sweep25", "sweep100",
+                 "dihedral", "setting", "hld_type", "loc_root", "toc_root", "c_root", "y_kink", "loc_kink",
+                 "toc_kink", "c_kink", "loc_tip", "toc_tip", "c_tip", "loc_mac", "mac")
+    geometry_inputs = ["arrangement.wing_attachment", "requirement.cruise_mach", "requirement.cruise_altp",
+                       "weight_cg.mtow", "fuselage.width", "fuselage.length", "fuselage.height", "wing.morphing",
+                       "wing.area", "wing.span", "wing.aspect_ratio", "wing.taper_ratio", "wing.y_kink"]
+    geometry_outputs = ["wing.toc_tip", "wing.toc_kink", "wing.toc_root", "wing.sweep25", "wing.dihedral",
+                        "wing.span", "wing.aspect_ratio", "wing.c_root", "wing.c_kink", "wing.c_tip", "wing.mac",
+                        "wing.loc_root", "wing.loc_kink", "wing.loc_tip", "wing.loc_mac", "wing.frame_origin",
+                        "wing.frame_angles", "wing.gross_wet_area", "wing.net_wet_area", "wing.aero_length",
+                        "wing.form_factor", "wing.setting"]
+    mass_inputs = ["weight_cg.mtow", "weight_cg.mzfw", "aerodynamics.hld_conf_ld", "wing.hld_type", "wing.area",
+                   "wing.span", "wing.aspect_ratio", "wing.toc_root", "wing.toc_kink", "wing.toc_tip",
+                   "wing.sweep25", "wing.loc_root", "wing.c_root", "wing.loc_kink", "wing.c_kink", "wing.loc_tip",
+                   "wing.c_tip"]
+    mass_outputs = ["wing.mass", "wing.cg"]
 
     def __init__(self, aircraft):
 
@@ -168,108 +343,109 @@ class Wing(Component):
         self.setting = None
         self.hld_type = 9
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.toc_root = None                # thickness over chord ratio of root chord
         self.c_root = None                  # root chord length
 
         x_kink = 1.2*(0.38*n_pax_front + 1.05*n_aisle + 0.55)
 
-        self.loc_kink = np.array([x_kink, None, None])     # Position of kink chord leading edge
+        self.y_kink = x_kink                # Span wise position of kink chord, eval_geometry overwrites loc_kink
+        self.loc_kink = vector(x_kink, None, None)     # Position of kink chord leading edge
         self.toc_kink = None                # thickness over chord ratio of kink chord
         self.c_kink = None                  # kink chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.toc_tip = None                 # thickness over chord ratio of tip chord
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        wing_attachment = self.aircraft.arrangement.wing_attachment
-        cruise_mach = self.aircraft.requirement.cruise_mach
-        fuselage_width = self.aircraft.airframe.fuselage.width
-        fuselage_length = self.aircraft.airframe.fuselage.length
-        fuselage_height = self.aircraft.airframe.fuselage.height
-
-        self.toc_tip = 0.10
-        self.toc_kink = self.toc_tip + 0.01
-        self.toc_root = self.toc_kink + 0.03
+    @staticmethod
+    def geometry_kernel(wing_attachment, cruise_mach, cruise_altp, mtow, fuselage_width, fuselage_length,
+                        fuselage_height, morphing, area, span, aspect_ratio, taper_ratio, y_kink):
+        toc_tip = 0.10
+        toc_kink = toc_tip + 0.01
+        toc_root = toc_kink + 0.03
 
-        self.sweep25 = 1.6*max(0.,(cruise_mach - 0.5))     # Empirical law
+        sweep25 = 1.6*np.maximum(0.,(cruise_mach - 0.5))     # Empirical law
 
-        self.dihedral = unit.rad_deg(5.)
+        dihedral = unit.rad_deg(5.)
 
-        if(self.morphing=="aspect_ratio_driven"):   # Aspect ratio is driving parameter
-            self.span = np.sqrt(self.aspect_ratio*self.area)
-        elif(self.morphing=="span_driven"): # Span is driving parameter
-            self.aspect_ratio = self.span**2/self.area
+        if(morphing=="aspect_ratio_driven"):   # Aspect ratio is driving parameter
+            span = np.sqrt(aspect_ratio*area)
+        elif(morphing=="span_driven"): # Span is driving parameter
+            aspect_ratio = span**2/area
         else:
             print("geometry_predesign_, wing_morphing index is unkown")
 
         y_root = 0.5*fuselage_width
-        y_kink = self.loc_kink[0]
-        y_tip = 0.5*self.span
+        y_tip = 0.5*span
+
+        # Both branches are evaluated and selected per design, kink exists if sweep25 is above 15°
+        kink = (15<unit.deg_rad(np.real(sweep25)))
 
-        if(15<unit.deg_rad(self.sweep25)):  # With kink
-          Phi100intTE = max( 0. , 2.*(self.sweep25-unit.rad_deg(32.)) )
-          tan_phi100 = np.tan(Phi100intTE)
-          A = ((1-0.25*self.taper_ratio)*y_kink+0.25*self.taper_ratio*y_root-y_tip) / (0.75*y_kink+0.25*y_root-y_tip)
-          B = (np.tan(self.sweep25)-tan_phi100) * ((y_tip-y_kink)*(y_kink-y_root)) / (0.25*y_root+0.75*y_kink-y_tip)
-          self.c_root = (self.area-B*(y_tip-y_root)) / (y_root+y_kink+A*(y_tip-y_root)+self.taper_ratio*(y_tip-y_kink))
-          self.c_kink = A*self.c_root + B
-          self.c_tip = self.taper_ratio*self.c_root
+        # With kink
+        Phi100intTE = np.maximum( 0. , 2.*(sweep25-unit.rad_deg(32.)) )
+        tan_phi100 = np.tan(Phi100intTE)
+        A = ((1-0.25*taper_ratio)*y_kink+0.25*taper_ratio*y_root-y_tip) / (0.75*y_kink+0.25*y_root-y_tip)
+        B = (np.tan(sweep25)-tan_phi100) * ((y_tip-y_kink)*(y_kink-y_root)) / (0.25*y_root+0.75*y_kink-y_tip)
+        c_root_k = (area-B*(y_tip-y_root)) / (y_root+y_kink+A*(y_tip-y_root)+taper_ratio*(y_tip-y_kink))
+        c_kink_k = A*c_root_k + B
 
-        else:		# Without kink
-          self.c_root = 2.*self.area / (2.*y_root*(1.-self.taper_ratio) + (1.+self.taper_ratio)*np.sqrt(self.aspect_ratio*self.area))
-          self.c_tip = self.taper_ratio*self.c_root
-          self.c_kink = ((y_tip-y_kink)*self.c_root + (y_kink-y_root)*self.c_tip) / (y_tip-y_root)
+        # Without kink
+        c_root_n = 2.*area / (2.*y_root*(1.-taper_ratio) + (1.+taper_ratio)*np.sqrt(aspect_ratio*area))
+        c_kink_n = ((y_tip-y_kink)*c_root_n + (y_kink-y_root)*taper_ratio*c_root_n) / (y_tip-y_root)
 
+        c_root = np.where(kink, c_root_k, c_root_n)[()]
+        c_kink = np.where(kink, c_kink_k, c_kink_n)[()]
+        c_tip = taper_ratio*c_root
 
-        tan_phi0 = 0.25*(self.c_kink-self.c_tip)/(y_tip-y_kink) + np.tan(self.sweep25)
 
-        self.mac = 2.*( 3.*y_root*self.c_root**2 \
-                       +(y_kink-y_root)*(self.c_root**2+self.c_kink**2+self.c_root*self.c_kink) \
-                       +(y_tip-y_kink)*(self.c_kink**2+self.c_tip**2+self.c_kink*self.c_tip) \
-                      )/(3*self.area)
+        tan_phi0 = 0.25*(c_kink-c_tip)/(y_tip-y_kink) + np.tan(sweep25)
 
-        y_mac = (  3.*self.c_root*y_root**2 \
-                 +(y_kink-y_root)*(self.c_kink*(y_root+y_kink*2.)+self.c_root*(y_kink+y_root*2.)) \
-                 +(y_tip-y_kink)*(self.c_tip*(y_kink+y_tip*2.)+self.c_kink*(y_tip+y_kink*2.)) \
-                )/(3.*self.area)
+        mac = 2.*( 3.*y_root*c_root**2 \
+                  +(y_kink-y_root)*(c_root**2+c_kink**2+c_root*c_kink) \
+                  +(y_tip-y_kink)*(c_kink**2+c_tip**2+c_kink*c_tip) \
+                 )/(3*area)
 
-        x_mac_local = ( (y_kink-y_root)*tan_phi0*((y_kink-y_root)*(self.c_kink*2.+self.c_root) \
-                       +(y_tip-y_kink)*(self.c_kink*2.+self.c_tip))+(y_tip-y_root)*tan_phi0*(y_tip-y_kink)*(self.c_tip*2.+self.c_kink) \
-                      )/(3*self.area)
+        y_mac = (  3.*c_root*y_root**2 \
+                 +(y_kink-y_root)*(c_kink*(y_root+y_kink*2.)+c_root*(y_kink+y_root*2.)) \
+                 +(y_tip-y_kink)*(c_tip*(y_kink+y_tip*2.)+c_kink*(y_tip+y_kink*2.)) \
+                )/(3.*area)
 
-        x_root = 0.33*fuselage_length**1.1 - (x_mac_local + 0.25*self.mac)
+        x_mac_local = ( (y_kink-y_root)*tan_phi0*((y_kink-y_root)*(c_kink*2.+c_root) \
+                       +(y_tip-y_kink)*(c_kink*2.+c_tip))+(y_tip-y_root)*tan_phi0*(y_tip-y_kink)*(c_tip*2.+c_kink) \
+                      )/(3*area)
+
+        x_root = 0.33*fuselage_length**1.1 - (x_mac_local + 0.25*mac)
         x_kink = x_root + (y_kink-y_root)*tan_phi0
         x_tip = x_root + (y_tip-y_root)*tan_phi0
 
-        x_mac = x_root+( (x_kink-x_root)*((y_kink-y_root)*(self.c_kink*2.+self.c_root) \
-                            +(y_tip-y_kink)*(self.c_kink*2.+self.c_tip))+(x_tip-x_root)*(y_tip-y_kink)*(self.c_tip*2.+self.c_kink) \
-                           )/(self.area*3.)
+        x_mac = x_root+( (x_kink-x_root)*((y_kink-y_root)*(c_kink*2.+c_root) \
+                            +(y_tip-y_kink)*(c_kink*2.+c_tip))+(x_tip-x_root)*(y_tip-y_kink)*(c_tip*2.+c_kink) \
+                           )/(area*3.)
         if (wing_attachment=="low"):
             z_root = 0.
         else:
-            z_root = fuselage_height - 0.5*self.toc_root*self.c_root
+            z_root = fuselage_height - 0.5*toc_root*c_root
 
-        z_kink = z_root+(y_kink-y_root)*np.tan(self.dihedral)
-        z_tip = z_root+(y_tip-y_root)*np.tan(self.dihedral)
+        z_kink = z_root+(y_kink-y_root)*np.tan(dihedral)
+        z_tip = z_root+(y_tip-y_root)*np.tan(dihedral)
 
-        self.loc_root = np.array([x_root, y_root, z_root])
-        self.loc_kink = np.array([x_kink, y_kink, z_kink])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, None])
+        loc_root = vector(x_root, y_root, z_root)
+        loc_kink = vector(x_kink, y_kink, z_kink)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, None)
 
-        self.frame_origin = [x_root, 0., z_root]
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = vector(x_root, 0., z_root)
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 2.00*(self.area - self.c_root*fuselage_width)
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.00*(area - c_root*fuselage_width)
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
         # Wing setting
         #-----------------------------------------------------------------------------------------------------------
@@ -277,44 +453,65 @@ class Wing(Component):
         r,gam,Cp,Cv = earth.gas_data()
 
         disa = 0.
-        rca = self.aircraft.requirement.cruise_altp
-        mach = self.aircraft.requirement.cruise_mach
-        mass = 0.95*self.aircraft.weight_cg.mtow
+        rca = cruise_altp
+        mach = cruise_mach
+        mass = 0.95*mtow
 
         pamb,tamb,tstd,dtodz = earth.atmosphere(rca,disa)
 
-        cza_wing = self.cza(mach, fuselage_width, self.aspect_ratio, self.span, self.sweep25)
+        cza_wing = Wing.cza(mach, fuselage_width, aspect_ratio, span, sweep25)
 
         # AoA = 2.5° at cruise start
-        self.setting = (0.97*mass*g)/(0.5*gam*pamb*mach**2*self.area*cza_wing) - unit.rad_deg(2.5)
+        setting = (0.97*mass*g)/(0.5*gam*pamb*mach**2*area*cza_wing) - unit.rad_deg(2.5)
+
+        return toc_tip, toc_kink, toc_root, sweep25, dihedral, span, aspect_ratio, c_root, c_kink, c_tip, mac, \
+               loc_root, loc_kink, loc_tip, loc_mac, frame_origin, frame_angles, gross_wet_area, net_wet_area, \
+               aero_length, form_factor, setting
+
+    @staticmethod
+    def mass_kernel(mtow, mzfw, hld_conf_ld, hld_type, area, span, aspect_ratio, toc_root, toc_kink, toc_tip,
+                    sweep25, loc_root, c_root, loc_kink, c_kink, loc_tip, c_tip):
+        (cz_max_ld,cz0) = Wing.high_lift_kernel(hld_type, hld_conf_ld)
+
+        A = 32*area**1.1
+        B = 4.*span**2 * np.sqrt(mtow*mzfw)
+        C = 1.1e-6*(1.+2.*aspect_ratio)/(1.+aspect_ratio)
+        D = (0.6*toc_root+0.3*toc_kink+0.1*toc_tip) * (area/span)
+        E = np.cos(sweep25)**2
+        F = 1200.*(cz_max_ld - 1.8)**1.5
 
-    def eval_mass(self):
-        mtow = self.aircraft.weight_cg.mtow
-        mzfw = self.aircraft.weight_cg.mzfw
-        hld_conf_ld = self.aircraft.aerodynamics.hld_conf_ld
+        mass = A + (B*C)/(D*E) + F   # Shevell formula + high lift device regression
 
-        (cz_max_ld,cz0) = self.high_lift(hld_conf_ld)
+        cg =  0.25*(loc_root + 0.40*vector(c_root, 0., 0.)) \
+            + 0.55*(loc_kink + 0.40*vector(c_kink, 0., 0.)) \
+            + 0.20*(loc_tip + 0.40*vector(c_tip, 0., 0.))
 
-        A = 32*self.area**1.1
-        B = 4.*self.span**2 * np.sqrt(mtow*mzfw)
-        C = 1.1e-6*(1.+2.*self.aspect_ratio)/(1.+self.aspect_ratio)
-        D = (0.6*self.toc_root+0.3*self.toc_kink+0.1*self.toc_tip) * (self.area/self.span)
-        E = np.cos(self.sweep25)**2
-        F = 1200.*(cz_max_ld - 1.8)**1.5
+        return mass, cg
 
-        self.mass = A + (B*C)/(D*E) + F   # Shevell formula + high lift device regression
+    @staticmethod
+    def  cza(mach, fuselage_width, aspect_ratio, span, sweep):
+        """
+        Polhamus formula
+        """
+        k_num,k_sq,k_mach = Wing.cza_coefficients(fuselage_width, aspect_ratio, span, sweep)
+        return k_num / (1.+np.sqrt(k_sq - k_mach*mach**2))
 
-        self.cg =  0.25*(self.loc_root + 0.40*np.array([self.c_root, 0., 0.])) \
-                 + 0.55*(self.loc_kink + 0.40*np.array([self.c_kink, 0., 0.])) \
-                 + 0.20*(self.loc_tip + 0.40*np.array([self.c_tip, 0., 0.]))
+    @staticmethod
+    def cza_coefficients(fuselage_width, aspect_ratio, span, sweep):
+        """
+        Terms of the Polhamus formula that do not depend on Mach number :
+        cza = k_num / (1 + sqrt(k_sq - k_mach*mach**2))
+        """
+        k_num = np.pi*aspect_ratio*(1.07*(1+fuselage_width/span)**2)*(1.-fuselage_width/span)
+        k_mach = 0.25*aspect_ratio**2
+        k_sq = 1. + k_mach*(1+np.tan(sweep)**2)
+        return k_num, k_sq, k_mach
 
-    def  cza(self, mach, fuselage_width, aspect_ratio, span, sweep):
+    def lift_table(self):
         """
-        Polhamus formula
+        Low speed lift laws of the wing with their coefficients computed once, see Wing_lift
         """
-        cza =  (np.pi*aspect_ratio*(1.07*(1+fuselage_width/span)**2)*(1.-fuselage_width/span)) \
-             / (1+np.sqrt(1.+0.25*aspect_ratio**2*(1+np.tan(sweep)**2-mach**2)))
-        return cza
+        return Wing_lift(self)
 
     def high_lift(self, hld_conf):
         """
@@ -323,35 +520,60 @@ class Wing(Component):
         Typically : hld_conf = 1 ==> cz_max_ld
                   : hld_conf = 0.1 to 0.5 ==> cz_max_to
         """
+        return self.high_lift_kernel(self.hld_type, hld_conf)
 
-        # Maximum lift coefficients of different airfoils, DUBS 1987
-        cz_max_ld = {0 : 1.45 ,  # Clean
-                     1 : 2.25 ,  # Flap only, Rotation without slot
-                     2 : 2.60 ,  # Flap only, Rotation single slot      (ATR)
-                     3 : 2.80 ,  # Flap only, Rotation double slot
-                     4 : 2.80 ,  # Fowler Flap
-                     5 : 2.00 ,  # Slat only
-                     6 : 2.45 ,  # Slat + Flap rotation without slot
-                     7 : 2.70 ,  # Slat + Flap rotation single slot
-                     8 : 2.90 ,  # Slat + Flap rotation double slot
-                     9 : 3.00 ,  # Slat + Fowler                      (A320)
-                     10 : 3.20,  # Slat + Fowler + Fowler double slot (A321)
-                     }.get(self.hld_type, "Erreur - high_lift_, HLDtype out of range")    # 9 is default if x not found
-
-        if (self.hld_type<5):
-            cz_max_base = 1.45      # Flap only
-        else:
-            if (hld_conf==0):
-                cz_max_base = 1.45  # Clean
-            else:
-                cz_max_base = 2.00  # Slat + Flap
+    @staticmethod
+    def high_lift_kernel(hld_type, hld_conf):
+        cz_max_ld,flap_only = high_lift_table(hld_type)
+        return Wing.high_lift_law(cz_max_ld, flap_only, hld_conf)
+
+    @staticmethod
+    def high_lift_law(cz_max_ld, flap_only, hld_conf):
+        cz_max_base = np.where(flap_only | (np.real(hld_conf)==0), 1.45, 2.00)[()]     # Flap only, Clean or Slat + Flap
 
         cz_max = (1-hld_conf)*cz_max_base + hld_conf*cz_max_ld
         cz_0 = cz_max - cz_max_base  # Assumed the Lift vs AoA is just translated upward and Cz0 clean equal to zero
         return cz_max, cz_0
 
 
+class Wing_lift(object):
+    """
+    Low speed lift laws of an evaluated wing : maximum lift, lift at zero angle of attack and lift slope
+    High lift coefficients of hld_type and the Mach independent terms of the Polhamus formula are computed once at
+    construction, build a new one when the wing geometry or hld_type change
+    """
+    __slots__ = ("cz_max_ld", "flap_only", "k_num", "k_sq", "k_mach")
+
+    def __init__(self, wing):
+        fuselage_width = wing.aircraft.airframe.fuselage.width
+        self.cz_max_ld,self.flap_only = high_lift_table(wing.hld_type)
+        self.k_num,self.k_sq,self.k_mach = Wing.cza_coefficients(fuselage_width, wing.aspect_ratio, wing.span,
+                                                                 wing.sweep25)
+
+    def __call__(self, hld_conf, mach):
+        """
+        cz_max, cz_0 and cza for hld_conf and mach, broadcast together and with the designs of the wing
+        """
+        cz_max,cz_0 = Wing.high_lift_law(self.cz_max_ld, self.flap_only, hld_conf)
+        cza = self.k_num / (1.+np.sqrt(self.k_sq - self.k_mach*mach**2))
+        return cz_max, cz_0, cza
+
+
 class VTP_classic(Component):
+    __slots__ = ("area", "height", "aspect_ratio", "taper_ratio", "toc", "sweep25", "volume", "x_anchor",
+                 "lever_arm", "loc_root", "c_root", "loc_tip", "c_tip", "loc_mac", "mac", "c_g")
+    geometry_inputs = ["fuselage.length", "fuselage.height", "fuselage.tail_cone_length", "wing.sweep25",
+                       "wing.loc_mac", "wing.mac", "vertical_stab.area", "vertical_stab.aspect_ratio",
+                       "vertical_stab.taper_ratio"]
+    geometry_outputs = ["vertical_stab.height", "vertical_stab.c_root", "vertical_stab.c_tip",
+                        "vertical_stab.sweep25", "vertical_stab.x_anchor", "vertical_stab.mac",
+                        "vertical_stab.lever_arm", "vertical_stab.loc_root", "vertical_stab.loc_tip",
+                        "vertical_stab.loc_mac", "vertical_stab.frame_origin", "vertical_stab.frame_angles",
+                        "vertical_stab.gross_wet_area", "vertical_stab.net_wet_area", "vertical_stab.aero_length",
+                        "vertical_stab.form_factor"]
+    mass_inputs = ["vertical_stab.area", "vertical_stab.loc_mac", "vertical_stab.mac"]
+    mass_outputs = ["vertical_stab.mass", "vertical_stab.c_g"]
+    sizing_inputs = ["vertical_stab.volume", "weight_cg.mtow", "wing.span", "vertical_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -369,63 +591,89 @@ class VTP_classic(Component):
         self.x_anchor = None
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        fuselage_length = self.aircraft.airframe.fuselage.length
-        fuselage_height = self.aircraft.airframe.fuselage.height
-        tail_cone_length = self.aircraft.airframe.fuselage.tail_cone_length
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-
-        self.height = np.sqrt(self.aspect_ratio*self.area)
-        self.c_root = 2*self.area/(self.height*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_root
+    @staticmethod
+    def geometry_kernel(fuselage_length, fuselage_height, tail_cone_length, wing_sweep25, wing_loc_mac, wing_mac,
+                        area, aspect_ratio, taper_ratio):
+        height = np.sqrt(aspect_ratio*area)
+        c_root = 2*area/(height*(1+taper_ratio))
+        c_tip = taper_ratio*c_root
 
-        self.sweep25 = max(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
+        sweep25 = np.maximum(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
 
-        self.x_anchor = 0.85       # Locate self versus end fuselage length
-        x_root = fuselage_length*(1-tail_cone_length/fuselage_length*(1-self.x_anchor)) - self.c_root
-        x_tip = x_root + 0.25*(self.c_root-self.c_tip) + self.height*np.tan(self.sweep25)
+        x_anchor = 0.85       # Locate self versus end fuselage length
+        x_root = fuselage_length*(1-tail_cone_length/fuselage_length*(1-x_anchor)) - c_root
+        x_tip = x_root + 0.25*(c_root-c_tip) + height*np.tan(sweep25)
 
         y_root = 0.
         y_tip = 0.
 
         z_root = fuselage_height
-        z_tip = z_root + self.height
+        z_tip = z_root + height
 
-        self.mac = self.height*(self.c_root**2+self.c_tip**2+self.c_root*self.c_tip)/(3*self.area)
-        x_mac = x_root+(x_tip-x_root)*self.height*(2*self.c_tip+self.c_root)/(6*self.area)
+        mac = height*(c_root**2+c_tip**2+c_root*c_tip)/(3*area)
+        x_mac = x_root+(x_tip-x_root)*height*(2*c_tip+c_root)/(6*area)
         y_mac = 0.
-        z_mac = z_tip**2*(2*self.c_tip+self.c_root)/(6*self.area)
+        z_mac = z_tip**2*(2*c_tip+c_root)/(6*area)
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (x_mac + 0.25*self.mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_root = np.array([x_root, y_root, z_root])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_root = vector(x_root, y_root, z_root)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = [x_root, 0., z_root]
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = vector(x_root, 0., z_root)
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 2.01*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.01*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 25. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return height, c_root, c_tip, sweep25, x_anchor, mac, lever_arm, loc_root, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 25. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, mtow, wing_span, lever_arm):
+        """
+        Area balancing the yaw moment of one failed engine at take off
+        Thrust and lateral position of the engine are estimated from mtow and wing span until engines are modelled
+        """
+        reference_thrust = 0.155*mtow*earth.gravity()   # Take off thrust of one engine of a twin
+        y_engine = 0.17*wing_span
+        return volume*(1.e-3*reference_thrust*y_engine)/lever_arm
 
 
 class VTP_T(Component):
+    __slots__ = ("area", "height", "aspect_ratio", "taper_ratio", "toc", "sweep25", "volume", "x_anchor",
+                 "lever_arm", "loc_root", "c_root", "loc_tip", "c_tip", "loc_mac", "mac", "c_g")
+    geometry_inputs = ["fuselage.length", "fuselage.height", "fuselage.tail_cone_length", "wing.sweep25",
+                       "wing.loc_mac", "wing.mac", "vertical_stab.area", "vertical_stab.aspect_ratio",
+                       "vertical_stab.taper_ratio"]
+    geometry_outputs = ["vertical_stab.height", "vertical_stab.c_root", "vertical_stab.c_tip",
+                        "vertical_stab.sweep25", "vertical_stab.x_anchor", "vertical_stab.mac",
+                        "vertical_stab.lever_arm", "vertical_stab.loc_root", "vertical_stab.loc_tip",
+                        "vertical_stab.loc_mac", "vertical_stab.frame_origin", "vertical_stab.frame_angles",
+                        "vertical_stab.gross_wet_area", "vertical_stab.net_wet_area", "vertical_stab.aero_length",
+                        "vertical_stab.form_factor"]
+    mass_inputs = ["vertical_stab.area", "vertical_stab.loc_mac", "vertical_stab.mac"]
+    mass_outputs = ["vertical_stab.mass", "vertical_stab.c_g"]
+    sizing_inputs = ["vertical_stab.volume", "weight_cg.mtow", "wing.span", "vertical_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -443,63 +691,87 @@ class VTP_T(Component):
         self.x_anchor = None
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        fuselage_length = self.aircraft.airframe.fuselage.length
-        fuselage_height = self.aircraft.airframe.fuselage.height
-        tail_cone_length = self.aircraft.airframe.fuselage.tail_cone_length
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-
-        self.height = np.sqrt(self.aspect_ratio*self.area)
-        self.c_root = 2*self.area/(self.height*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_root
+    @staticmethod
+    def geometry_kernel(fuselage_length, fuselage_height, tail_cone_length, wing_sweep25, wing_loc_mac, wing_mac,
+                        area, aspect_ratio, taper_ratio):
+        height = np.sqrt(aspect_ratio*area)
+        c_root = 2*area/(height*(1+taper_ratio))
+        c_tip = taper_ratio*c_root
 
-        self.sweep25 = max(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
+        sweep25 = np.maximum(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
 
-        self.x_anchor = 0.85       # Locate self versus end fuselage length
-        x_root = fuselage_length*(1-tail_cone_length/fuselage_length*(1-self.x_anchor)) - self.c_root
-        x_tip = x_root + 0.25*(self.c_root-self.c_tip) + self.height*np.tan(self.sweep25)
+        x_anchor = 0.85       # Locate self versus end fuselage length
+        x_root = fuselage_length*(1-tail_cone_length/fuselage_length*(1-x_anchor)) - c_root
+        x_tip = x_root + 0.25*(c_root-c_tip) + height*np.tan(sweep25)
 
         y_root = 0.
         y_tip = 0.
 
         z_root = fuselage_height
-        z_tip = z_root + self.height
+        z_tip = z_root + height
 
-        self.mac = self.height*(self.c_root**2+self.c_tip**2+self.c_root*self.c_tip)/(3*self.area)
-        x_mac = x_root+(x_tip-x_root)*self.height*(2*self.c_tip+self.c_root)/(6*self.area)
+        mac = height*(c_root**2+c_tip**2+c_root*c_tip)/(3*area)
+        x_mac = x_root+(x_tip-x_root)*height*(2*c_tip+c_root)/(6*area)
         y_mac = 0.
-        z_mac = z_tip**2*(2*self.c_tip+self.c_root)/(6*self.area)
+        z_mac = z_tip**2*(2*c_tip+c_root)/(6*area)
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (x_mac + 0.25*self.mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_root = np.array([x_root, y_root, z_root])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_root = vector(x_root, y_root, z_root)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = [x_root, 0., z_root]
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = vector(x_root, 0., z_root)
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 2.01*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.01*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 28. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return height, c_root, c_tip, sweep25, x_anchor, mac, lever_arm, loc_root, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 28. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, mtow, wing_span, lever_arm):
+        """
+        Area balancing the yaw moment of one failed engine at take off
+        Thrust and lateral position of the engine are estimated from mtow and wing span until engines are modelled
+        """
+        reference_thrust = 0.155*mtow*earth.gravity()   # Take off thrust of one engine of a twin
+        y_engine = 0.17*wing_span
+        return volume*(1.e-3*reference_thrust*y_engine)/lever_arm
 
 
 class VTP_H(Component):
+    __slots__ = ("area", "height", "aspect_ratio", "taper_ratio", "toc", "sweep25", "volume", "lever_arm",
+                 "loc_root", "c_root", "loc_tip", "c_tip", "loc_mac", "mac", "c_g")
+    geometry_inputs = ["horizontal_stab.loc_tip", "wing.sweep25", "wing.loc_mac", "wing.mac",
+                       "vertical_stab.area", "vertical_stab.aspect_ratio", "vertical_stab.taper_ratio"]
+    geometry_outputs = ["vertical_stab.height", "vertical_stab.c_root", "vertical_stab.c_tip",
+                        "vertical_stab.sweep25", "vertical_stab.mac", "vertical_stab.lever_arm",
+                        "vertical_stab.loc_root", "vertical_stab.loc_tip", "vertical_stab.loc_mac",
+                        "vertical_stab.frame_origin", "vertical_stab.frame_angles", "vertical_stab.gross_wet_area",
+                        "vertical_stab.net_wet_area", "vertical_stab.aero_length", "vertical_stab.form_factor"]
+    mass_inputs = ["vertical_stab.area", "vertical_stab.loc_mac", "vertical_stab.mac"]
+    mass_outputs = ["vertical_stab.mass", "vertical_stab.c_g"]
+    sizing_inputs = ["vertical_stab.volume", "weight_cg.mtow", "wing.span", "vertical_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -516,60 +788,88 @@ class VTP_H(Component):
         self.volume = 0.4           # Design rule
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        htp_loc_tip = self.aircraft.airframe.horizontal_stab.loc_tip
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-
-        self.height = np.sqrt(self.aspect_ratio*(0.5*self.area))
-        self.c_root = 2*(0.5*self.area)/(self.height*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_root
+    @staticmethod
+    def geometry_kernel(htp_loc_tip, wing_sweep25, wing_loc_mac, wing_mac, area, aspect_ratio, taper_ratio):
+        height = np.sqrt(aspect_ratio*(0.5*area))
+        c_root = 2*(0.5*area)/(height*(1+taper_ratio))
+        c_tip = taper_ratio*c_root
 
-        self.sweep25 = max(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
+        sweep25 = np.maximum(unit.rad_deg(25.), wing_sweep25 + unit.rad_deg(10.)) # Empirical law
 
         x_root = htp_loc_tip[0]
-        x_tip = x_root + 0.25*(self.c_root-self.c_tip) + self.height*np.tan(self.sweep25)
+        x_tip = x_root + 0.25*(c_root-c_tip) + height*np.tan(sweep25)
 
         y_root = htp_loc_tip[1]
         y_tip = htp_loc_tip[1]
 
         z_root = htp_loc_tip[2]
-        z_tip = z_root + self.height
+        z_tip = z_root + height
 
-        self.mac = self.height*(self.c_root**2+self.c_tip**2+self.c_root*self.c_tip)/(3*(0.5*self.area))
-        x_mac = x_root+(x_tip-x_root)*self.height*(2*self.c_tip+self.c_root)/(6*(0.5*self.area))
+        mac = height*(c_root**2+c_tip**2+c_root*c_tip)/(3*(0.5*area))
+        x_mac = x_root+(x_tip-x_root)*height*(2*c_tip+c_root)/(6*(0.5*area))
         y_mac = y_tip
-        z_mac = z_tip**2*(2*self.c_tip+self.c_root)/(6*self.area)
+        z_mac = z_tip**2*(2*c_tip+c_root)/(6*area)
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (x_mac + 0.25*self.mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_root = np.array([x_root, y_root, z_root])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_root = vector(x_root, y_root, z_root)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = [x_root, y_root, z_root]
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = vector(x_root, y_root, z_root)
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 2.01*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.01*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 25. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return height, c_root, c_tip, sweep25, mac, lever_arm, loc_root, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 25. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, mtow, wing_span, lever_arm):
+        """
+        Area balancing the yaw moment of one failed engine at take off
+        Thrust and lateral position of the engine are estimated from mtow and wing span until engines are modelled
+        """
+        reference_thrust = 0.155*mtow*earth.gravity()   # Take off thrust of one engine of a twin
+        y_engine = 0.17*wing_span
+        return volume*(1.e-3*reference_thrust*y_engine)/lever_arm
 
 
 class HTP_classic(Component):
+    __slots__ = ("area", "span", "aspect_ratio", "taper_ratio", "toc", "sweep25", "dihedral", "volume",
+                 "lever_arm", "loc_root", "c_root", "c_axe", "loc_axe", "loc_tip", "c_tip", "loc_mac", "mac",
+                 "c_g")
+    geometry_inputs = ["fuselage.height", "vertical_stab.loc_root", "vertical_stab.c_root", "wing.sweep25",
+                       "wing.loc_mac", "wing.mac", "horizontal_stab.area", "horizontal_stab.aspect_ratio",
+                       "horizontal_stab.taper_ratio", "horizontal_stab.dihedral"]
+    geometry_outputs = ["horizontal_stab.span", "horizontal_stab.c_axe", "horizontal_stab.c_tip",
+                        "horizontal_stab.sweep25", "horizontal_stab.mac", "horizontal_stab.lever_arm",
+                        "horizontal_stab.loc_axe", "horizontal_stab.loc_tip", "horizontal_stab.loc_mac",
+                        "horizontal_stab.frame_origin", "horizontal_stab.frame_angles",
+                        "horizontal_stab.gross_wet_area", "horizontal_stab.net_wet_area",
+                        "horizontal_stab.aero_length", "horizontal_stab.form_factor"]
+    mass_inputs = ["horizontal_stab.area", "horizontal_stab.loc_mac", "horizontal_stab.mac"]
+    mass_outputs = ["horizontal_stab.mass", "horizontal_stab.c_g"]
+    sizing_inputs = ["horizontal_stab.volume", "wing.area", "wing.mac", "horizontal_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -587,68 +887,90 @@ class HTP_classic(Component):
         self.volume = 0.94                  # Design rule
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        fuselage_height = self.aircraft.airframe.fuselage.height
-        vtp_loc_root = self.aircraft.airframe.vertical_stab.loc_root
-        vtp_c_root = self.aircraft.airframe.vertical_stab.c_root
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-        wing_loc_mac = self.aircraft.airframe.wing.loc_mac
-        wing_mac = self.aircraft.airframe.wing.mac
-
-        self.span = np.sqrt(self.aspect_ratio*self.area)
+    @staticmethod
+    def geometry_kernel(fuselage_height, vtp_loc_root, vtp_c_root, wing_sweep25, wing_loc_mac, wing_mac,
+                        area, aspect_ratio, taper_ratio, dihedral):
+        span = np.sqrt(aspect_ratio*area)
         y_axe = 0.
-        y_tip = 0.5*self.span
+        y_tip = 0.5*span
 
         htp_z_wise_anchor = 0.80       # Locate HTP versus end fuselage height
         z_axe = htp_z_wise_anchor*fuselage_height
-        z_tip = z_axe + y_tip*np.tan(self.dihedral)
+        z_tip = z_axe + y_tip*np.tan(dihedral)
 
-        self.c_axe = 2.*self.area/(self.span*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_axe
+        c_axe = 2.*area/(span*(1+taper_ratio))
+        c_tip = taper_ratio*c_axe
 
-        self.sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
+        sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
 
-        self.mac = self.span*(self.c_axe**2+self.c_tip**2+self.c_axe*self.c_tip)/(3.*self.area)
-        y_mac = y_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        z_mac = z_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        x_tip_local = 0.25*(self.c_axe-self.c_tip) + y_tip*np.tan(self.sweep25)
-        x_mac_local = y_tip*x_tip_local*(self.c_tip*2.+self.c_axe)/(3.*self.area)
+        mac = span*(c_axe**2+c_tip**2+c_axe*c_tip)/(3.*area)
+        y_mac = y_tip**2*(2*c_tip+c_axe)/(3*area)
+        z_mac = z_tip**2*(2*c_tip+c_axe)/(3*area)
+        x_tip_local = 0.25*(c_axe-c_tip) + y_tip*np.tan(sweep25)
+        x_mac_local = y_tip*x_tip_local*(c_tip*2.+c_axe)/(3.*area)
 
-        x_axe = vtp_loc_root[0] + 0.50*vtp_c_root - 0.2*self.c_axe
+        x_axe = vtp_loc_root[0] + 0.50*vtp_c_root - 0.2*c_axe
 
         x_tip = x_axe + x_tip_local
         x_mac = x_axe + x_mac_local
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (wing_loc_mac[0] + 0.25*wing_mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_axe = np.array([x_axe, y_axe, z_axe])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_axe = vector(x_axe, y_axe, z_axe)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = self.loc_axe
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = loc_axe
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 1.63*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 1.63*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 22. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return span, c_axe, c_tip, sweep25, mac, lever_arm, loc_axe, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 22. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, wing_area, wing_mac, lever_arm):
+        """
+        Area giving the volume coefficient of the HTP
+        """
+        return volume*wing_area*wing_mac/lever_arm
 
 
 class HTP_T(Component):
+    __slots__ = ("area", "span", "aspect_ratio", "taper_ratio", "toc", "sweep25", "dihedral", "volume",
+                 "lever_arm", "loc_root", "c_root", "c_axe", "loc_axe", "loc_tip", "c_tip", "loc_mac", "mac",
+                 "c_g")
+    geometry_inputs = ["fuselage.height", "vertical_stab.loc_tip", "vertical_stab.c_tip",
+                       "vertical_stab.height", "wing.sweep25", "wing.loc_mac", "wing.mac", "horizontal_stab.area",
+                       "horizontal_stab.aspect_ratio", "horizontal_stab.taper_ratio", "horizontal_stab.dihedral"]
+    geometry_outputs = ["horizontal_stab.span", "horizontal_stab.c_axe", "horizontal_stab.c_tip",
+                        "horizontal_stab.sweep25", "horizontal_stab.mac", "horizontal_stab.lever_arm",
+                        "horizontal_stab.loc_axe", "horizontal_stab.loc_tip", "horizontal_stab.loc_mac",
+                        "horizontal_stab.frame_origin", "horizontal_stab.frame_angles",
+                        "horizontal_stab.gross_wet_area", "horizontal_stab.net_wet_area",
+                        "horizontal_stab.aero_length", "horizontal_stab.form_factor"]
+    mass_inputs = ["horizontal_stab.area", "horizontal_stab.loc_mac", "horizontal_stab.mac"]
+    mass_outputs = ["horizontal_stab.mass", "horizontal_stab.c_g"]
+    sizing_inputs = ["horizontal_stab.volume", "wing.area", "wing.mac", "horizontal_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -666,69 +988,90 @@ class HTP_T(Component):
         self.volume = 0.94                  # Design rule
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        fuselage_height = self.aircraft.airframe.fuselage.height
-        vtp_loc_tip = self.aircraft.airframe.vertical_stab.loc_tip
-        vtp_c_tip = self.aircraft.airframe.vertical_stab.c_tip
-        vtp_height = self.aircraft.airframe.vertical_stab.height
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-        wing_loc_mac = self.aircraft.airframe.wing.loc_mac
-        wing_mac = self.aircraft.airframe.wing.mac
-
-        self.span = np.sqrt(self.aspect_ratio*self.area)
+    @staticmethod
+    def geometry_kernel(fuselage_height, vtp_loc_tip, vtp_c_tip, vtp_height, wing_sweep25, wing_loc_mac, wing_mac,
+                        area, aspect_ratio, taper_ratio, dihedral):
+        span = np.sqrt(aspect_ratio*area)
         y_axe = 0.
-        y_tip = 0.5*self.span
+        y_tip = 0.5*span
 
         htp_z_wise_anchor = 0.80       # Locate HTP versus end fuselage height
         z_axe = fuselage_height + vtp_height
-        z_tip = z_axe + y_tip*np.tan(self.dihedral)
+        z_tip = z_axe + y_tip*np.tan(dihedral)
 
-        self.c_axe = 2.*self.area/(self.span*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_axe
+        c_axe = 2.*area/(span*(1+taper_ratio))
+        c_tip = taper_ratio*c_axe
 
-        self.sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
+        sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
 
-        self.mac = self.span*(self.c_axe**2+self.c_tip**2+self.c_axe*self.c_tip)/(3.*self.area)
-        y_mac = y_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        z_mac = z_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        x_tip_local = 0.25*(self.c_axe-self.c_tip) + y_tip*np.tan(self.sweep25)
-        x_mac_local = y_tip*x_tip_local*(self.c_tip*2.+self.c_axe)/(3.*self.area)
+        mac = span*(c_axe**2+c_tip**2+c_axe*c_tip)/(3.*area)
+        y_mac = y_tip**2*(2*c_tip+c_axe)/(3*area)
+        z_mac = z_tip**2*(2*c_tip+c_axe)/(3*area)
+        x_tip_local = 0.25*(c_axe-c_tip) + y_tip*np.tan(sweep25)
+        x_mac_local = y_tip*x_tip_local*(c_tip*2.+c_axe)/(3.*area)
 
-        x_axe = vtp_loc_tip[0] + 0.30*vtp_c_tip - 0.80*self.c_tip
+        x_axe = vtp_loc_tip[0] + 0.30*vtp_c_tip - 0.80*c_tip
 
         x_tip = x_axe + x_tip_local
         x_mac = x_axe + x_mac_local
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (wing_loc_mac[0] + 0.25*wing_mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_axe = np.array([x_axe, y_axe, z_axe])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_axe = vector(x_axe, y_axe, z_axe)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = self.loc_axe
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = loc_axe
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 2.01*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 2.01*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 22. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return span, c_axe, c_tip, sweep25, mac, lever_arm, loc_axe, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 22. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, wing_area, wing_mac, lever_arm):
+        """
+        Area giving the volume coefficient of the HTP
+        """
+        return volume*wing_area*wing_mac/lever_arm
 
 
 class HTP_H(Component):
+    __slots__ = ("area", "span", "aspect_ratio", "taper_ratio", "toc", "sweep25", "dihedral", "volume",
+                 "lever_arm", "loc_root", "c_root", "c_axe", "loc_axe", "loc_tip", "c_tip", "loc_mac", "mac",
+                 "c_g")
+    geometry_inputs = ["fuselage.length", "fuselage.height", "fuselage.tail_cone_length", "wing.sweep25",
+                       "wing.loc_mac", "wing.mac", "horizontal_stab.area", "horizontal_stab.aspect_ratio",
+                       "horizontal_stab.taper_ratio", "horizontal_stab.dihedral"]
+    geometry_outputs = ["horizontal_stab.span", "horizontal_stab.c_axe", "horizontal_stab.c_tip",
+                        "horizontal_stab.sweep25", "horizontal_stab.mac", "horizontal_stab.lever_arm",
+                        "horizontal_stab.loc_axe", "horizontal_stab.loc_tip", "horizontal_stab.loc_mac",
+                        "horizontal_stab.frame_origin", "horizontal_stab.frame_angles",
+                        "horizontal_stab.gross_wet_area", "horizontal_stab.net_wet_area",
+                        "horizontal_stab.aero_length", "horizontal_stab.form_factor"]
+    mass_inputs = ["horizontal_stab.area", "horizontal_stab.loc_mac", "horizontal_stab.mac"]
+    mass_outputs = ["horizontal_stab.mass", "horizontal_stab.c_g"]
+    sizing_inputs = ["horizontal_stab.volume", "wing.area", "wing.mac", "horizontal_stab.lever_arm"]
 
     def __init__(self, aircraft):
 
@@ -746,69 +1089,78 @@ class HTP_H(Component):
         self.volume = 0.94                  # Design rule
         self.lever_arm = None
 
-        self.loc_root = np.full(3,None)     # Position of root chord leading edge
+        self.loc_root = NOT_COMPUTED        # Position of root chord leading edge
         self.c_root = None                  # root chord length
 
-        self.loc_tip = np.full(3,None)      # Position of tip chord leading edge
+        self.loc_tip = NOT_COMPUTED         # Position of tip chord leading edge
         self.c_tip = None                   # tip chord length
 
-        self.loc_mac = np.full(3,None)      # Position of MAC chord leading edge
+        self.loc_mac = NOT_COMPUTED         # Position of MAC chord leading edge
         self.mac = None
 
-    def eval_geometry(self):
-        fuselage_length = self.aircraft.airframe.fuselage.length
-        fuselage_height = self.aircraft.airframe.fuselage.height
-        fuselage_cone_length = self.aircraft.airframe.fuselage.tail_cone_length
-        wing_sweep25 = self.aircraft.airframe.wing.sweep25
-        wing_loc_mac = self.aircraft.airframe.wing.loc_mac
-        wing_mac = self.aircraft.airframe.wing.mac
-
-        self.span = np.sqrt(self.aspect_ratio*self.area)
+    @staticmethod
+    def geometry_kernel(fuselage_length, fuselage_height, fuselage_cone_length, wing_sweep25, wing_loc_mac, wing_mac,
+                        area, aspect_ratio, taper_ratio, dihedral):
+        span = np.sqrt(aspect_ratio*area)
         y_axe = 0.
-        y_tip = 0.5*self.span
+        y_tip = 0.5*span
 
         htp_z_wise_anchor = 0.80       # Locate HTP versus end fuselage height
         z_axe = htp_z_wise_anchor*fuselage_height
-        z_tip = z_axe + y_tip*np.tan(self.dihedral)
+        z_tip = z_axe + y_tip*np.tan(dihedral)
 
-        self.c_axe = 2.*self.area/(self.span*(1+self.taper_ratio))
-        self.c_tip = self.taper_ratio*self.c_axe
+        c_axe = 2.*area/(span*(1+taper_ratio))
+        c_tip = taper_ratio*c_axe
 
-        self.sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
+        sweep25 = wing_sweep25 + unit.rad_deg(5)     # Design rule
 
-        self.mac = self.span*(self.c_axe**2+self.c_tip**2+self.c_axe*self.c_tip)/(3.*self.area)
-        y_mac = y_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        z_mac = z_tip**2*(2*self.c_tip+self.c_axe)/(3*self.area)
-        x_tip_local = 0.25*(self.c_axe-self.c_tip) + y_tip*np.tan(self.sweep25)
-        x_mac_local = y_tip*x_tip_local*(self.c_tip*2.+self.c_axe)/(3.*self.area)
+        mac = span*(c_axe**2+c_tip**2+c_axe*c_tip)/(3.*area)
+        y_mac = y_tip**2*(2*c_tip+c_axe)/(3*area)
+        z_mac = z_tip**2*(2*c_tip+c_axe)/(3*area)
+        x_tip_local = 0.25*(c_axe-c_tip) + y_tip*np.tan(sweep25)
+        x_mac_local = y_tip*x_tip_local*(c_tip*2.+c_axe)/(3.*area)
 
         htp_x_wise_anchor = 0.85
-        x_axe = fuselage_length*(1-fuselage_cone_length/fuselage_length*(1-htp_x_wise_anchor)) - self.c_axe
+        x_axe = fuselage_length*(1-fuselage_cone_length/fuselage_length*(1-htp_x_wise_anchor)) - c_axe
 
         x_tip = x_axe + x_tip_local
         x_mac = x_axe + x_mac_local
 
-        self.lever_arm = (x_mac + 0.25*self.mac) - (wing_loc_mac[0] + 0.25*wing_mac)
+        lever_arm = (x_mac + 0.25*mac) - (wing_loc_mac[0] + 0.25*wing_mac)
 
-        self.loc_axe = np.array([x_axe, y_axe, z_axe])
-        self.loc_tip = np.array([x_tip, y_tip, z_tip])
-        self.loc_mac = np.array([x_mac, y_mac, z_mac])
+        loc_axe = vector(x_axe, y_axe, z_axe)
+        loc_tip = vector(x_tip, y_tip, z_tip)
+        loc_mac = vector(x_mac, y_mac, z_mac)
 
-        self.frame_origin = self.loc_axe
-        self.frame_angles = [0., 0., 0.]
+        frame_origin = loc_axe
+        frame_angles = vector(0., 0., 0.)
 
-        self.gross_wet_area = 1.63*self.area
-        self.net_wet_area = self.gross_wet_area
+        gross_wet_area = 1.63*area
+        net_wet_area = gross_wet_area
 
-        self.aero_length = self.mac
-        self.form_factor = 1.40
+        aero_length = mac
+        form_factor = 1.40
 
-    def eval_mass(self):
-        self.mass = 22. * self.area
-        self.c_g = self.loc_mac + 0.20*np.array([self.mac, 0., 0.])
+        return span, c_axe, c_tip, sweep25, mac, lever_arm, loc_axe, loc_tip, loc_mac, \
+               frame_origin, frame_angles, gross_wet_area, net_wet_area, aero_length, form_factor
+
+    @staticmethod
+    def mass_kernel(area, loc_mac, mac):
+        mass = 22. * area
+        c_g = loc_mac + 0.20*vector(mac, 0., 0.)
+        return mass, c_g
+
+    @staticmethod
+    def sizing_kernel(volume, wing_area, wing_mac, lever_arm):
+        """
+        Area giving the volume coefficient of the HTP
+        """
+        return volume*wing_area*wing_mac/lever_arm
 
 
 class Tank_wing_box(Component):
+    __slots__ = ("cantilever_volume", "central_volume", "max_volume", "mfw_volume_limited", "m_furnishing",
+                 "m_op_item", "cg_furnishing", "cg_op_item")
 
     def __init__(self, aircraft):
 
@@ -855,8 +1207,4 @@ class Tank_wing_box(Component):
 
 
     def eval_mass(self):
-
-
-
-
-
+        raise NotImplementedError
@@ -6,6 +6,8 @@ Created on Thu Jan 20 20:20:20 2020
 
 """
 
+import numpy as np
+
 import unit
 
 #===========================================================================================================
@@ -64,33 +66,19 @@ class Requirement(object):
 
     #-----------------------------------------------------------------------------------------------------------
     def __n_pax_front__(self):
-        if  (self.n_pax_ref<=8):   n_pax_front = 2
-        elif(self.n_pax_ref<=16):  n_pax_front = 3
-        elif(self.n_pax_ref<=70):  n_pax_front = 4
-        elif(self.n_pax_ref<=120): n_pax_front = 5
-        elif(self.n_pax_ref<=225): n_pax_front = 6
-        elif(self.n_pax_ref<=300): n_pax_front = 8
-        elif(self.n_pax_ref<=375): n_pax_front = 9
-        else:                      n_pax_front = 10
-        return n_pax_front
+        n_pax_max =     [8, 16, 70, 120, 225, 300, 375]
+        n_pax_front = [2, 3,  4,  5,   6,   8,   9,   10]
+        return np.take(n_pax_front, np.searchsorted(n_pax_max, self.n_pax_ref))[()]
 
     #-----------------------------------------------------------------------------------------------------------
     def __n_aisle__(self):
-        if(self.n_pax_front <= 6): n_aisle = 1
-        else:                      n_aisle = 2
-        return n_aisle
+        return np.where(self.n_pax_front <= 6, 1, 2)[()]
 
     #-----------------------------------------------------------------------------------------------------------
     def __tofl__(self):
-        if(self.design_range <= unit.m_NM(1500.)):
-            req_tofl = 1500.
-        elif(self.design_range <= unit.m_NM(3500.)):
-            req_tofl = 2000.
-        elif(self.design_range <= unit.m_NM(5500.)):
-            req_tofl = 2500.
-        else:
-            req_tofl = 3000.
-        return req_tofl
+        range_max = unit.m_NM(np.array([1500., 3500., 5500.]))
+        req_tofl = [1500., 2000., 2500., 3000.]
+        return np.take(req_tofl, np.searchsorted(range_max, self.design_range))[()]
 
 
     #-----------------------------------------------------------------------------------------------------------
@@ -108,13 +96,9 @@ class Requirement(object):
 
     #-----------------------------------------------------------------------------------------------------------
     def __app_speed__(self):
-        if (self.n_pax_ref<=100):
-            req_app_speed = unit.mps_kt(120.)
-        elif (self.n_pax_ref<=200):
-            req_app_speed = unit.mps_kt(137.)
-        else:
-            req_app_speed = unit.mps_kt(140.)
-        return req_app_speed
+        n_pax_max = [100, 200]
+        req_app_speed = unit.mps_kt(np.array([120., 137., 140.]))
+        return np.take(req_app_speed, np.searchsorted(n_pax_max, self.n_pax_ref))[()]
 
     #-----------------------------------------------------------------------------------------------------------
     def __oei_min_path__(self,arrangement):
@@ -143,28 +127,20 @@ class Requirement(object):
             altp = unit.m_ft(16000.)
         else:
             raise Exception("propulsion.architecture index is out of range")
-        top_of_climb = min(altp, self.cruise_altp-unit.m_ft(4000.))
+        top_of_climb = np.minimum(altp, self.cruise_altp-unit.m_ft(4000.))[()]
         return top_of_climb
 
 
     #-----------------------------------------------------------------------------------------------------------
     def __ttc_cas1__(self):
-        if (self.cruise_mach>=0.6):
-            cas1 = unit.mps_kt(250.)
-        elif (self.cruise_mach>=0.4):
-            cas1 = unit.mps_kt(180.)
-        else:
-            cas1 = unit.mps_kt(70.)
-        return cas1
+        mach_min = [0.4, 0.6]
+        cas1 = unit.mps_kt(np.array([70., 180., 250.]))
+        return np.take(cas1, np.searchsorted(mach_min, self.cruise_mach, side="right"))[()]
 
     #-----------------------------------------------------------------------------------------------------------
     def __ttc_cas2__(self):
-        if (self.cruise_mach>=0.6):
-            cas2 = unit.mps_kt(300.)
-        elif (self.cruise_mach>=0.4):
-            cas2 = unit.mps_kt(200.)
-        else:
-            cas2 = unit.mps_kt(70.)
-        return cas2
+        mach_min = [0.4, 0.6]
+        cas2 = unit.mps_kt(np.array([70., 200., 300.]))
+        return np.take(cas2, np.searchsorted(mach_min, self.cruise_mach, side="right"))[()]
 
 
@@ -5,8 +5,17 @@ Created on Thu Jan 20 20:20:20 2020
 @author: DRUOT Thierry, Nicolas Monrolin
 """
 
+from copy import copy
+
+import numpy as np
+
+import unit
+import earth
+
 from aircraft.requirement import Requirement
 from aircraft.arrangement import Arrangement
+from aircraft.aerodynamic import Aerodynamics
+from aircraft.airframe.component import readonly_view
 
 
 
@@ -30,14 +39,32 @@ class Weight_cg(object):
         self.mzfw = 25000. + 41.e-6*n_pax_ref*design_range
         self.owe = None
         self.mwe = None
+        self.mfw = None     # Max fuel weight, capacity of the tanks
 
+        # Data of the mass loop closure, engines, landing gears, systems and fuel are estimated until they are modelled
+        self.m_pax_nominal = 100.       # Mass of one passenger with luggage, nominal mission
+        self.m_pax_max = 130.           # Mass of one passenger with luggage and freight, max payload
+        self.other_mass_ratio = 0.18    # Mass of engines, landing gears and systems over mtow
+        self.cruise_lod = 17.           # Lift over drag ratio in cruise
+        self.cruise_sfc = unit.convert_from("kg/daN/h", 0.55)   # Specific fuel consumption in cruise
+        self.reserve_ratio = 0.05       # Reserve fuel over mission fuel
 
-class Aerodynamics(object):
+    def closure(self, airframe_mass, mtow, n_pax_ref, design_range, cruise_mach, cruise_altp):
+        """
+        Masses implied by a guess of mtow and the airframe mass computed with it, Breguet mission fuel
+        Returns owe, mtow and mzfw, the mass loop is converged when mtow and mzfw equal the guess
+        """
+        g = earth.gravity()
+        pamb,tamb,tstd,dtodz = earth.atmosphere(cruise_altp, 0.)
+        vtas = cruise_mach*earth.sound_speed(tamb)
 
-    def __init__(self, requirement):
+        owe = airframe_mass + self.other_mass_ratio*mtow
+        fuel_ratio = 1. - np.exp(-(design_range*g*self.cruise_sfc)/(vtas*self.cruise_lod))
+        mission_fuel = (1.+self.reserve_ratio)*fuel_ratio*mtow
 
-        self.hld_conf_to = 0.30
-        self.hld_conf_ld = 1.00
+        new_mtow = owe + self.m_pax_nominal*n_pax_ref + mission_fuel
+        new_mzfw = owe + self.m_pax_max*n_pax_ref
+        return owe, new_mtow, new_mzfw
 
 
 #--------------------------------------------------------------------------------------------------------------------------------
@@ -71,6 +98,28 @@ class Aircraft(object):
         #
         # self.system = None
 
+    def clone(self):
+        """
+        Copy on write clone, for variants of a baseline aircraft
+        Top level objects (requirement, arrangement, aerodynamics, weight_cg) and components are shallow copied,
+        so the clone shares all their values with self. Numpy arrays of the clone are read-only views of the ones
+        of self : a variant replaces an attribute instead of modifying it in place, which leaves self unchanged.
+        Arrays of self are left writable, in place changes of self are seen by its clones.
+        Lists and dicts of requirement are also shared and must be replaced, not modified.
+        """
+        ac = copy(self)
+        for name in ["requirement", "arrangement", "aerodynamics", "weight_cg"]:
+            obj = copy(getattr(self, name))
+            for attr,value in vars(obj).items():
+                if isinstance(value, np.ndarray):
+                    setattr(obj, attr, readonly_view(value))
+            setattr(ac, name, obj)
+
+        ac.airframe = Airframe()
+        for slot,comp in vars(self.airframe).items():
+            setattr(ac.airframe, slot, comp.clone(ac) if hasattr(comp, "clone") else comp)
+        return ac
+
 
 
 #       geom, mass, aero,
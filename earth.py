@@ -11,8 +11,6 @@ import numpy
 
 import unit
 
-from scipy.optimize import fsolve
-
 
 #===========================================================================================================
 def gravity():
@@ -55,11 +53,7 @@ def sea_level_sound_speed():
     return vc0
 
 #===========================================================================================================
-def gas_data(gas="air"):
-    """
-    Gas data for a single gas
-    """
-    r = {"air" : 287.053 ,
+GAS_R = {"air" : 287.053 ,
          "argon" : 208. ,
          "carbon_dioxide" : 188.9 ,
          "carbon_monoxide" : 297. ,
@@ -71,58 +65,78 @@ def gas_data(gas="air"):
          "propane" : 189. ,
          "sulphur_dioxide" : 130. ,
          "steam" : 462.
-         }.get(gas, "Erreur: type of gas is unknown")
-
-    gam = {"air" : 1.40 ,
-           "argon" : 1.66 ,
-           "carbon_dioxide" : 1.30 ,
-           "carbon_monoxide" : 1.40 ,
-           "helium" : 1.66 ,
-           "hydrogen" : 1.41 ,
-           "methane" : 1.32 ,
-           "nitrogen" : 1.40 ,
-           "oxygen" : 1.40 ,
-           "propane" : 1.13 ,
-           "sulphur_dioxide" : 1.29 ,
-           "steam" : 1.33
-           }.get(gas, "Erreur: type of gas is unknown")
+         }
+
+GAS_GAMMA = {"air" : 1.40 ,
+             "argon" : 1.66 ,
+             "carbon_dioxide" : 1.30 ,
+             "carbon_monoxide" : 1.40 ,
+             "helium" : 1.66 ,
+             "hydrogen" : 1.41 ,
+             "methane" : 1.32 ,
+             "nitrogen" : 1.40 ,
+             "oxygen" : 1.40 ,
+             "propane" : 1.13 ,
+             "sulphur_dioxide" : 1.29 ,
+             "steam" : 1.33
+             }
+
+def gas_data(gas="air"):
+    """
+    Gas data for a single gas or a mixture
+    gas is a gas name or a dict of gas names and mass fractions, fractions can be floats or numpy arrays
+    """
+    if isinstance(gas, dict):
+        r,cp,cv = 0.,0.,0.
+        for g,frac in gas.items():
+            rg,gamg,cpg,cvg = gas_data(g)
+            r = r + frac*rg
+            cp = cp + frac*cpg
+            cv = cv + frac*cvg
+        return r,cp/cv,cp,cv
+
+    r = GAS_R.get(gas, "Erreur: type of gas is unknown")
+    gam = GAS_GAMMA.get(gas, "Erreur: type of gas is unknown")
 
     cv = r/(gam-1.)
     cp = gam*cv
     return r,gam,cp,cv
 
 #===========================================================================================================
+GAS_SUTHERLAND = {"air"             : (1.715e-5, 273.15, 110.4) ,
+                  "ammonia"         : (0.92e-5, 273.15, 382.9) ,
+                  "argon"           : (2.10e-5, 273.15, 155.6) ,
+                  "benzene"         : (0.70e-5, 273.15, 173.1) ,
+                  "carbon_dioxide"  : (1.37e-5, 273.15, 253.4) ,
+                  "carbon_monoxide" : (1.66e-5, 273.15,  94.0) ,
+                  "chlorine"        : (1.23e-5, 273.15, 273.0) ,
+                  "chloroform"      : (0.94e-5, 273.15, 284.2) ,
+                  "ethylene"        : (0.97e-5, 273.15, 163.7) ,
+                  "helium"          : (1.87e-5, 273.15,  69.7) ,
+                  "hydrogen"        : (0.84e-5, 273.15,  60.4) ,
+                  "methane"         : (1.03e-5, 273.15, 166.3) ,
+                  "neon"            : (2.98e-5, 273.15,  80.8) ,
+                  "nitrogen"        : (1.66e-5, 273.15, 110.9) ,
+                  "nitrous oxide"   : (1.37e-5, 273.15, 253.4) ,
+                  "oxygen"          : (1.95e-5, 273.15,  57.9) ,
+                  "steam"           : (0.92e-5, 273.15, 154.8) ,
+                  "sulphur_dioxide" : (1.16e-5, 273.15, 482.3) ,
+                  "xenon"           : (2.12e-5, 273.15, 302.6)
+                  }                 #  mu0      T0      S
+
 def gas_viscosity(tamb, gas="air"):
     """
     Mixed gas dynamic viscosity, Sutherland's formula
+    gas is a gas name or a dict of gas names and fractions, tamb and fractions can be floats or numpy arrays
     WARNING : result will not be accurate if gas is mixing components of too different molecular weight
     """
-    data = {"air"             : [1.715e-5, 273.15, 110.4] ,
-            "ammonia"         : [0.92e-5, 273.15, 382.9] ,
-            "argon"           : [2.10e-5, 273.15, 155.6] ,
-            "benzene"         : [0.70e-5, 273.15, 173.1] ,
-            "carbon_dioxide"  : [1.37e-5, 273.15, 253.4] ,
-            "carbon_monoxide" : [1.66e-5, 273.15,  94.0] ,
-            "chlorine"        : [1.23e-5, 273.15, 273.0] ,
-            "chloroform"      : [0.94e-5, 273.15, 284.2] ,
-            "ethylene"        : [0.97e-5, 273.15, 163.7] ,
-            "helium"          : [1.87e-5, 273.15,  69.7] ,
-            "hydrogen"        : [0.84e-5, 273.15,  60.4] ,
-            "methane"         : [1.03e-5, 273.15, 166.3] ,
-            "neon"            : [2.98e-5, 273.15,  80.8] ,
-            "nitrogen"        : [1.66e-5, 273.15, 110.9] ,
-            "nitrous oxide"   : [1.37e-5, 273.15, 253.4] ,
-            "oxygen"          : [1.95e-5, 273.15,  57.9] ,
-            "steam"           : [0.92e-5, 273.15, 154.8] ,
-            "sulphur_dioxide" : [1.16e-5, 273.15, 482.3] ,
-            "xenon"           : [2.12e-5, 273.15, 302.6]
-            }                 #  mu0      T0      S
-    # gas={"nitrogen":0.80, "oxygen":0.20}
-    # mu = 0.
-    # for g in list(gas.keys()):
-    #     [mu0,T0,S] = data[g]
-    #     mu = mu + gas[g]*(mu0*((T0+S)/(tamb+S))*(tamb/T0)**1.5)
-    mu0,T0,S = data[gas]
+    if isinstance(gas, dict):
+        mu = 0.
+        for g,frac in gas.items():
+            mu = mu + frac*gas_viscosity(tamb, g)
+        return mu
+
+    mu0,T0,S = GAS_SUTHERLAND[gas]
     mu = (mu0*((T0+S)/(tamb+S))*(tamb/T0)**1.5)
     return mu
 
@@ -150,175 +164,264 @@ def reynolds_number(pamb,tamb,mach):
 
 
 #===========================================================================================================
-def atmosphere(altp,disa):
+_isa_table = None
+
+def isa_layers():
     """
-    Pressure from pressure altitude from ground to 50 km
+    Standard atmosphere layer boundaries from ground to 50 km, built once on first call
+    Returns boundary pressure altitudes, temperature gradients, boundary pressures and temperatures
+    WARNING : returned arrays are shared by all ISA functions and are read only
+    """
+    global _isa_table
+    if _isa_table is None:
+        Z = numpy.array([0., 11000., 20000.,32000., 47000., 50000.])
+        dtodz = numpy.array([-0.0065, 0., 0.0010, 0.0028, 0.])
+
+        P = numpy.array([sea_level_pressure(), 0., 0., 0., 0., 0.])
+        T = numpy.array([sea_level_temperature(), 0., 0., 0., 0., 0.])
+
+        for j in range(len(dtodz)):
+            T[j+1] = T[j] + dtodz[j]*(Z[j+1]-Z[j])
+            P[j+1] = layer_pressure(P[j],T[j],dtodz[j],Z[j+1]-Z[j])
+
+        for table in (Z,dtodz,P,T):
+            table.flags.writeable = False
+        _isa_table = (Z,dtodz,P,T)
+
+    return _isa_table
+
+#===========================================================================================================
+_isa_geo_tables = {}
+
+def isa_geo_layers(disa):
+    """
+    Layer boundaries versus geometric altitude for a given ISA temperature shift
+    Layer thicknesses are stretched by the ratio between actual and standard temperature at the layer base
+    Returned arrays have the layer index as first axis and the shape of disa after
+    Tables for scalar real disa are kept once computed (read only)
+    """
+    Z,dtodz,P,T = isa_layers()
+
+    disa = numpy.asarray(disa)
+    cached = (disa.ndim==0 and not numpy.iscomplexobj(disa))
+    if (cached and float(disa) in _isa_geo_tables):
+        return _isa_geo_tables[float(disa)]
+
+    n = len(dtodz)
+
+    Zg = numpy.zeros((n+1,)+disa.shape, dtype=numpy.result_type(disa,float))
+    dtodzg = numpy.zeros((n,)+disa.shape, dtype=Zg.dtype)
+    Pg = numpy.zeros_like(Zg)
+    Pg[0] = P[0]
+
+    for j in range(n):
+        K = 1. + disa/T[j]
+        dtodzg[j] = dtodz[j]/K
+        Zg[j+1] = Zg[j] + (Z[j+1]-Z[j])*K
+        Pg[j+1] = layer_pressure(Pg[j],T[j]+disa,dtodzg[j],Zg[j+1]-Zg[j])
+
+    if cached:
+        if (len(_isa_geo_tables)>=256):
+            _isa_geo_tables.clear()
+        for table in (Zg,dtodzg,Pg):
+            table.flags.writeable = False
+        _isa_geo_tables[float(disa)] = (Zg,dtodzg,Pg)
+
+    return Zg,dtodzg,Pg
+
+#===========================================================================================================
+def layer_pressure(pbase,tbase,dtodz,dz):
+    """
+    Pressure at height dz above the base of a layer with constant temperature gradient
+    All inputs can be numpy arrays, isothermal layers are those where dtodz is zero
     """
     g = gravity()
     R,gam,Cp,Cv = gas_data()
 
-    Z = numpy.array([0., 11000., 20000.,32000., 47000., 50000.])
-    dtodz = numpy.array([-0.0065, 0., 0.0010, 0.0028, 0.])
+    if (numpy.ndim(dtodz)==0):
+        if (0.<numpy.abs(dtodz)):
+            pamb = pbase*(1. + (dtodz/tbase)*dz)**(-g/(R*dtodz))
+        else:
+            pamb = pbase*numpy.exp(-(g/R)*(dz/tbase))
+    else:
+        iso = (dtodz==0.)
+        dtodz_ = numpy.where(iso, 1., dtodz)      # Avoid division by zero in the unused branch
+        pamb = numpy.where(iso, pbase*numpy.exp(-(g/R)*(dz/tbase)),
+                                pbase*(1. + (dtodz_/tbase)*dz)**(-g/(R*dtodz_)))
+    return pamb
+
+#===========================================================================================================
+def atmosphere(altp,disa):
+    """
+    Pressure from pressure altitude from ground to 50 km
+    altp and disa can be floats or numpy arrays, tamb is broadcast over both, other outputs follow altp
+    """
+    altp = numpy.asarray(altp)
 
-    P = numpy.array([sea_level_pressure(), 0., 0., 0., 0., 0.])
-    T = numpy.array([sea_level_temperature(), 0., 0., 0., 0., 0.])
+    Z,dtodz,P,T = isa_layers()
 
-    if (Z[-1]<altp):
+    if (Z[-1]<altp).any():
         raise Exception("atmosphere, altitude cannot exceed 50km")
 
-    j = 0
-
-    while (Z[1+j]<=altp):
-        T[j+1] = T[j] + dtodz[j]*(Z[j+1]-Z[j])
-        if (0.<numpy.abs(dtodz[j])):
-            P[j+1] = P[j]*(1. + (dtodz[j]/T[j])*(Z[j+1]-Z[j]))**(-g/(R*dtodz[j]))
-        else:
-            P[j+1] = P[j]*numpy.exp(-(g/R)*((Z[j+1]-Z[j])/T[j]))
-        j = j + 1
+    j = Z[1:-1].searchsorted(altp.real, side="right")     # Layer index
 
-    if (0.<numpy.abs(dtodz[j])):
-        pamb = P[j]*(1 + (dtodz[j]/T[j])*(altp-Z[j]))**(-g/(R*dtodz[j]))
-    else:
-        pamb = P[j]*numpy.exp(-(g/R)*((altp-Z[j])/T[j]))
+    pamb = layer_pressure(P[j],T[j],dtodz[j],altp-Z[j])
     tstd = T[j] + dtodz[j]*(altp-Z[j])
     tamb = tstd + disa
 
-    return pamb,tamb,tstd,dtodz[j]
+    return pamb[()],tamb[()],tstd[()],dtodz[j][()]
+
+
+
+#===========================================================================================================
+def atmosphere_derivatives(altp,disa):
+    """
+    Atmosphere with its exact partial derivatives, same inputs and broadcasting as atmosphere
+    Returns pamb, tamb, d(pamb)/d(altp), d(tamb)/d(altp) and d(tamb)/d(disa)
+    pamb does not depend on disa, derivatives are taken in the upper layer at layer boundaries
+    """
+    g = gravity()
+    R,gam,Cp,Cv = gas_data()
+
+    pamb,tamb,tstd,dtodz = atmosphere(altp,disa)
+
+    dpamb_daltp = -(g/R)*(pamb/tstd)
+    dtamb_daltp = dtodz + numpy.zeros_like(tamb)
+    dtamb_ddisa = numpy.ones_like(tamb)
 
+    return pamb,tamb,dpamb_daltp,dtamb_daltp[()],dtamb_ddisa[()]
 
 #===========================================================================================================
 def altg_from_altp(altp,disa):
+    """
+    Geometric altitude from pressure altitude from ground to 50 km
+    Exact inverse of atmosphere_geo, layer by layer, altp and disa can be floats or numpy arrays
+    """
+    pamb = numpy.asarray(pressure(altp))
 
-    def fct_altg_from_altp(altg,altp,disa):
-        pamb,tamb,dtodz = atmosphere_geo(altg,disa)
-        zp = pressure_altitude(pamb)
-        return altp-zp
+    Z,dtodz,P,T = isa_layers()
 
-    output_dict = fsolve(fct_altg_from_altp, x0=altp, args=(altp,disa), full_output=True)
+    if (numpy.ndim(disa)==0):
+        Zg,dtodzg,Pg = isa_geo_layers(disa)
+        j = (len(dtodz)-1) - Pg[-2:0:-1].searchsorted(pamb.real, side="right")     # Layer index, Pg is decreasing
+        Zj,dtodzj,Pj = Zg[j],dtodzg[j],Pg[j]
+    else:
+        pamb,disa = numpy.broadcast_arrays(pamb,disa)
+        Zg,dtodzg,Pg = isa_geo_layers(disa)
+        j = numpy.sum(pamb.real<Pg[1:-1].real, axis=0)     # Layer index, boundaries depend on disa
+        Zj,dtodzj,Pj = [numpy.take_along_axis(table, j[None], axis=0)[0] for table in (Zg,dtodzg,Pg)]
 
-    altg = output_dict[0][0]
+    altg = Zj + layer_altitude(Pj,T[j]+disa,dtodzj,pamb)
 
-    return altg
+    return altg[()]
 
 
 #===========================================================================================================
 def atmosphere_geo(altg,disa):
     """
-    Pressure from pressure altitude from ground to 50 km
+    Pressure from geometric altitude from ground to 50 km
+    altg and disa can be floats or numpy arrays, they are broadcast together
     """
-    g = gravity()
-    R,gam,Cp,Cv = gas_data()
+    altg = numpy.asarray(altg)
 
-    Zi = numpy.array([0., 11000., 20000.,32000., 47000., 50000.])
-    dtodzi = numpy.array([-0.0065, 0., 0.0010, 0.0028, 0.])
+    Z,dtodz,P,T = isa_layers()
 
-    Z = numpy.zeros_like(Zi)
-    dtodz = numpy.zeros_like(dtodzi)
-
-    P = numpy.array([sea_level_pressure(), 0., 0., 0., 0., 0.])
-    T = numpy.array([sea_level_temperature(), 0., 0., 0., 0., 0.])
+    if (numpy.ndim(disa)==0):
+        Zg,dtodzg,Pg = isa_geo_layers(disa)
+        j = Zg[1:-1].searchsorted(altg.real, side="right")     # Layer index
+        Zj,dtodzj,Pj = Zg[j],dtodzg[j],Pg[j]
+    else:
+        altg,disa = numpy.broadcast_arrays(altg,disa)
+        Zg,dtodzg,Pg = isa_geo_layers(disa)
+        j = numpy.sum(Zg[1:-1].real<=altg.real, axis=0)     # Layer index, boundaries depend on disa
+        Zj,dtodzj,Pj = [numpy.take_along_axis(table, j[None], axis=0)[0] for table in (Zg,dtodzg,Pg)]
 
-    K = 1 + disa/T[0]
-    dtodz[0] = dtodzi[0]/K
-    Z[1] = Z[0] + (Zi[1]-Zi[0])*K
+    if (Zg[-1]<altg).any():
+        raise Exception("atmosphere_geo, altitude cannot exceed 50km")
 
-    n = len(P)-1
-    j = 0
+    Tj = T[j]
 
-    while (j<n and Z[1+j]<=altg):
-        T[j+1] = T[j] + dtodz[j]*(Z[j+1]-Z[j])
-        if (0.<numpy.abs(dtodz[j])):
-            P[j+1] = P[j]*(1. + (dtodz[j]/(T[j]+disa))*(Z[j+1]-Z[j]))**(-g/(R*dtodz[j]))
-        else:
-            P[j+1] = P[j]*numpy.exp(-(g/R)*((Z[j+1]-Z[j])/(T[j]+disa)))
-        j = j + 1
-        K = 1 + disa/T[j]
-        dtodz[j] = dtodzi[j]/K
-        Z[j+1] = Z[j] + (Zi[j+1]-Zi[j])*K
+    pamb = layer_pressure(Pj,Tj+disa,dtodzj,altg-Zj)
+    tamb = Tj + dtodzj*(altg-Zj) + disa
 
-    if (Z[1+j]<altg):
-        raise Exception("atmosphere_geo, altitude cannot exceed 50km")
+    return pamb[()],tamb[()],dtodzj[()]
 
-    if (0.<numpy.abs(dtodz[j])):
-        pamb = P[j]*(1 + (dtodz[j]/(T[j]+disa))*(altg-Z[j]))**(-g/(R*dtodz[j]))
-    else:
-        pamb = P[j]*numpy.exp(-(g/R)*((altg-Z[j])/(T[j]+disa)))
-    tamb = T[j] + dtodz[j]*(altg-Z[j]) + disa
 
-    return pamb,tamb,dtodz[j]
+#===========================================================================================================
+def layer_altitude(pbase,tbase,dtodz,pamb):
+    """
+    Height above the base of a layer with constant temperature gradient where pressure is pamb
+    Inverse of layer_pressure, all inputs can be numpy arrays
+    """
+    g = gravity()
+    R,gam,Cp,Cv = gas_data()
 
+    if (numpy.ndim(dtodz)==0):
+        if (0.<numpy.abs(dtodz)):
+            dz = ((pamb/pbase)**(-(R*dtodz)/g) - 1)*(tbase/dtodz)
+        else:
+            dz = -(tbase/(g/R))*numpy.log(pamb/pbase)
+    else:
+        iso = (dtodz==0.)
+        dtodz_ = numpy.where(iso, 1., dtodz)      # Avoid division by zero in the unused branch
+        dz = numpy.where(iso, -(tbase/(g/R))*numpy.log(pamb/pbase),
+                              ((pamb/pbase)**(-(R*dtodz_)/g) - 1)*(tbase/dtodz_))
+    return dz
 
 #===========================================================================================================
 def pressure_altitude(pamb):
     """
     Pressure altitude from ground to 50 km
+    pamb can be a float or a numpy array
     """
-    g = gravity()
-    R,gam,Cp,Cv = gas_data()
-
-    Z = numpy.array([0., 11000., 20000.,32000., 47000., 50000.])
-    dtodz = numpy.array([-0.0065, 0., 0.0010, 0.0028, 0.])
+    pamb = numpy.asarray(pamb)
 
-    P = numpy.array([sea_level_pressure(), 0., 0., 0., 0., 0.])
-    T = numpy.array([sea_level_temperature(), 0., 0., 0., 0., 0.])
+    Z,dtodz,P,T = isa_layers()
 
-    j = 0
-    n = len(P)-1
-    P[1] = P[0]*(1. + (dtodz[0]/T[0])*(Z[1]-Z[0]))**(-g/(R*dtodz[0]))
-    T[1] = T[0] + dtodz[0]*(Z[1]-Z[0])
+    if (pamb<P[-1]).any():
+        raise Exception("pressure_altitude, altitude cannot exceed 50km")
 
-    while (j<n and pamb<P[j+1]):
-        j = j + 1
-        T[j+1] = T[j] + dtodz[j]*(Z[j+1]-Z[j])
-        if (0.<numpy.abs(dtodz[j])):
-            P[j+1] = P[j]*(1. + (dtodz[j]/T[j])*(Z[j+1]-Z[j]))**(-g/(R*dtodz[j]))
-        else:
-            P[j+1] = P[j]*numpy.exp(-(g/R)*((Z[j+1]-Z[j])/T[j]))
+    j = (len(dtodz)-1) - P[-2:0:-1].searchsorted(pamb.real, side="right")     # Layer index, P is decreasing
 
-    if (pamb<P[j+1]):
-        raise Exception("pressure_altitude, altitude cannot exceed 50km")
+    altp = Z[j] + layer_altitude(P[j],T[j],dtodz[j],pamb)
 
-    if (0.<numpy.abs(dtodz[j])):
-        altp = Z[j] + ((pamb/P[j])**(-(R*dtodz[j])/g) - 1)*(T[j]/dtodz[j])
-    else:
-        altp = Z[j] - (T[j]/(g/R))*numpy.log(pamb/P[j])
+    return altp[()]
 
-    return altp
 
 
 #===========================================================================================================
-def pressure(altp):
+def pressure_altitude_derivative(pamb):
     """
-    Pressure from pressure altitude from ground to 50 km
+    Pressure altitude with its exact derivative d(altp)/d(pamb), pamb can be a float or a numpy array
     """
     g = gravity()
     R,gam,Cp,Cv = gas_data()
 
-    Z = numpy.array([0., 11000., 20000.,32000., 47000., 50000.])
-    dtodz = numpy.array([-0.0065, 0., 0.0010, 0.0028, 0.])
+    altp = pressure_altitude(pamb)
+    tstd = atmosphere(altp,0.)[2]
 
-    P = numpy.array([sea_level_pressure(), 0., 0., 0., 0., 0.])
-    T = numpy.array([sea_level_temperature(), 0., 0., 0., 0., 0.])
+    daltp_dpamb = -(R/g)*(tstd/pamb)
 
-    if (Z[-1]<altp):
-        raise Exception("pressure, altitude cannot exceed 50km")
+    return altp,daltp_dpamb
+
+#===========================================================================================================
+def pressure(altp):
+    """
+    Pressure from pressure altitude from ground to 50 km
+    altp can be a float or a numpy array
+    """
+    altp = numpy.asarray(altp)
 
-    j = 0
+    Z,dtodz,P,T = isa_layers()
 
-    while (Z[1+j]<=altp):
-        T[j+1] = T[j] + dtodz[j]*(Z[j+1]-Z[j])
-        if (0.<numpy.abs(dtodz[j])):
-            P[j+1] = P[j]*(1. + (dtodz[j]/T[j])*(Z[j+1]-Z[j]))**(-g/(R*dtodz[j]))
-        else:
-            P[j+1] = P[j]*numpy.exp(-(g/R)*((Z[j+1]-Z[j])/T[j]))
-        j = j + 1
+    if (Z[-1]<altp).any():
+        raise Exception("pressure, altitude cannot exceed 50km")
 
-    if (0.<numpy.abs(dtodz[j])):
-        pamb = P[j]*(1 + (dtodz[j]/T[j])*(altp-Z[j]))**(-g/(R*dtodz[j]))
-    else:
-        pamb = P[j]*numpy.exp(-(g/R)*((altp-Z[j])/T[j]))
+    j = Z[1:-1].searchsorted(altp.real, side="right")     # Layer index
 
-    return pamb
+    pamb = layer_pressure(P[j],T[j],dtodz[j],altp-Z[j])
+
+    return pamb[()]
 
 #===========================================================================================================
 def air_density(pamb,tamb):
@@ -368,6 +471,22 @@ def vtas_from_mach(altp,disa,mach):
     vtas = vsnd*mach
     return vtas
 
+
+#===========================================================================================================
+def vtas_from_mach_derivatives(altp,disa,mach):
+    """
+    True air speed from Mach number with its exact partial derivatives, subsonic only
+    Returns vtas, d(vtas)/d(altp), d(vtas)/d(disa) and d(vtas)/d(mach)
+    """
+    pamb,tamb,tstd,dtodz = atmosphere(altp,disa)
+    vsnd = sound_speed(tamb)
+    vtas = vsnd*mach
+
+    dvtas_dtamb = 0.5*vtas/tamb
+    dvtas_dmach = vsnd + 0.*vtas
+
+    return vtas,dvtas_dtamb*dtodz,dvtas_dtamb,dvtas_dmach
+
 #===========================================================================================================
 def mach_from_vcas(pamb,Vcas):
     """
@@ -380,6 +499,30 @@ def mach_from_vcas(pamb,Vcas):
     mach = numpy.sqrt(((((((gam-1.)/2.)*(Vcas/vc0)**2+1)**fac-1.)*P0/pamb+1.)**(1./fac)-1.)*(2./(gam-1.)))
     return mach
 
+
+#===========================================================================================================
+def mach_from_vcas_derivatives(pamb,Vcas):
+    """
+    Mach number from calibrated air speed with its exact partial derivatives, subsonic only
+    Returns mach, d(mach)/d(pamb) and d(mach)/d(Vcas)
+    """
+    r,gam,Cp,Cv = gas_data()
+    P0 = sea_level_pressure()
+    vc0 = sea_level_sound_speed()
+    fac = gam/(gam-1.)
+    k = (gam-1.)/2.
+
+    a = 1. + k*(Vcas/vc0)**2
+    qc = (a**fac-1.)*P0                 # Impact pressure
+    b = qc/pamb + 1.
+    mach = numpy.sqrt((b**(1./fac)-1.)/k)
+
+    dmach_db = b**(1./fac-1.)/(2.*k*fac*mach)
+    dmach_dpamb = -dmach_db*qc/pamb**2
+    dmach_dvcas = dmach_db*(P0/pamb)*fac*a**(fac-1.)*(2.*k*Vcas/vc0**2)
+
+    return mach,dmach_dpamb,dmach_dvcas
+
 #===========================================================================================================
 def vcas_from_mach(pamb,mach):
     """
@@ -392,6 +535,29 @@ def vcas_from_mach(pamb,mach):
     vcas = vc0*numpy.sqrt(5.*((((pamb/P0)*((1.+((gam-1.)/2.)*mach**2)**fac-1.))+1.)**(1./fac)-1.))
     return vcas
 
+
+#===========================================================================================================
+def vcas_from_mach_derivatives(pamb,mach):
+    """
+    Calibrated air speed from Mach number with its exact partial derivatives, subsonic only
+    Returns vcas, d(vcas)/d(pamb) and d(vcas)/d(mach)
+    """
+    r,gam,Cp,Cv = gas_data()
+    P0 = sea_level_pressure()
+    vc0 = sea_level_sound_speed()
+    fac = gam/(gam-1.)
+    k = (gam-1.)/2.
+
+    a = 1. + k*mach**2
+    c = (pamb/P0)*(a**fac-1.) + 1.
+    vcas = vc0*numpy.sqrt(5.*(c**(1./fac)-1.))
+
+    dvcas_dc = (5.*vc0**2/(2.*fac))*c**(1./fac-1.)/vcas
+    dvcas_dpamb = dvcas_dc*(a**fac-1.)/P0
+    dvcas_dmach = dvcas_dc*(pamb/P0)*fac*a**(fac-1.)*(2.*k*mach)
+
+    return vcas,dvcas_dpamb,dvcas_dmach
+
 #===========================================================================================================
 def vtas_from_vcas(altp,disa,vcas):
     """
@@ -403,6 +569,26 @@ def vtas_from_vcas(altp,disa,vcas):
     vtas = vsnd*mach
     return vtas
 
+
+#===========================================================================================================
+def vtas_from_vcas_derivatives(altp,disa,vcas):
+    """
+    True air speed from calibrated air speed with its exact partial derivatives, subsonic only
+    Returns vtas, d(vtas)/d(altp), d(vtas)/d(disa) and d(vtas)/d(vcas)
+    """
+    pamb,tamb,dpamb_daltp,dtamb_daltp,dtamb_ddisa = atmosphere_derivatives(altp,disa)
+    mach,dmach_dpamb,dmach_dvcas = mach_from_vcas_derivatives(pamb,vcas)
+    vsnd = sound_speed(tamb)
+    vtas = vsnd*mach
+
+    dvtas_dtamb = 0.5*vtas/tamb
+
+    dvtas_daltp = dvtas_dtamb*dtamb_daltp + vsnd*dmach_dpamb*dpamb_daltp
+    dvtas_ddisa = dvtas_dtamb*dtamb_ddisa
+    dvtas_dvcas = vsnd*dmach_dvcas
+
+    return vtas,dvtas_daltp,dvtas_ddisa,dvtas_dvcas
+
 #===========================================================================================================
 def cross_over_altp(Vcas,mach):
     """
@@ -419,6 +605,42 @@ def cross_over_altp(Vcas,mach):
 
     return altp
 
+#===========================================================================================================
+def air_speeds(altp,disa,speed,speed_type="mach"):
+    """
+    All speed quantities over a flight envelope, subsonic only
+    speed_type tells if speed is "mach", "vcas" or "vtas", altp, disa and speed can be floats or numpy arrays
+    Atmosphere is evaluated once per point, outputs are broadcast over all inputs
+    Returns Mach number, calibrated and true air speeds, dynamic pressure and Reynolds number per meter
+    """
+    r,gam,Cp,Cv = gas_data()
+
+    pamb,tamb,tstd,dtodz = atmosphere(altp,disa)
+    vsnd = sound_speed(tamb)
+
+    if (speed_type=="mach"):
+        mach = speed
+        vcas = vcas_from_mach(pamb,mach)
+        vtas = vsnd*mach
+    elif (speed_type=="vcas"):
+        vcas = speed
+        mach = mach_from_vcas(pamb,vcas)
+        vtas = vsnd*mach
+    elif (speed_type=="vtas"):
+        vtas = speed
+        mach = vtas/vsnd
+        vcas = vcas_from_mach(pamb,mach)
+    else:
+        raise Exception("air_speeds, speed_type is unknown")
+
+    pdyn = 0.5*gam*pamb*mach**2
+    rho,sig = air_density(pamb,tamb)
+    re = rho*vtas/gas_viscosity(tamb)
+
+    mach,vcas,vtas,pdyn,re = numpy.broadcast_arrays(mach,vcas,vtas,pdyn,re)
+
+    return mach[()],vcas[()],vtas[()],pdyn[()],re[()]
+
 #===========================================================================================================
 def climb_mode(speed_mode,dtodz,tstd,disa,mach):
     """
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled backend for the hot numerical kernels of earth
+
+Functions have the same signature and give the same results as their earth counterparts.
+Kernels are compiled with Numba when it is installed, otherwise calls fall back to the NumPy code of earth.
+Array calls of mach_from_vcas and climb_mode always use earth, NumPy's vectorized pow is faster than the compiled
+scalar loop for them, only their scalar calls are compiled.
+The backend can be switched with set_backend("numba") or set_backend("numpy").
+Numba is only imported at the first compiled call, importing it costs more than importing numpy and earth.
+"""
+
+import importlib.util
+import math
+
+import numpy
+
+import earth
+
+
+has_numba = importlib.util.find_spec("numba") is not None
+
+if has_numba:
+    backend = "numba"
+else:
+    backend = "numpy"
+
+numba = None        # Set by load_numba()
+prange = range
+
+KERNELS = ["atmosphere_layer", "atmosphere_kernel", "pressure_altitude_layer", "pressure_altitude_kernel", "mach_from_vcas_kernel",
+           "climb_mode_kernel", "reynolds_number_kernel"]
+LOOPS = ["atmosphere_loop", "pressure_altitude_loop", "reynolds_number_loop"]
+
+
+# Model constants, frozen into the compiled kernels
+Z,DTODZ,P,T = earth.isa_layers()
+G = earth.gravity()
+R,GAM,CP,CV = earth.gas_data()
+P0 = earth.sea_level_pressure()
+VC0 = earth.sea_level_sound_speed()
+MU0,T0,S = earth.GAS_SUTHERLAND["air"]
+
+
+#===========================================================================================================
+def set_backend(name):
+    """
+    Select "numba" (compiled kernels) or "numpy" (earth functions)
+    """
+    global backend
+    if (name=="numba" and not has_numba):
+        raise Exception("set_backend, numba is not installed")
+    if name not in ["numba","numpy"]:
+        raise Exception("set_backend, backend is unknown")
+    backend = name
+
+#===========================================================================================================
+def load_numba():
+    """
+    Import numba and replace kernels and loops of this module by their compiled version
+    Compilation itself happens at the first call of each kernel, or is read from numba cache
+    """
+    global numba, prange
+    import numba as nb
+    prange = nb.prange
+    for name in KERNELS:
+        globals()[name] = nb.njit(cache=True)(globals()[name])
+    for name in LOOPS:
+        globals()[name] = nb.njit(cache=True, parallel=True)(globals()[name])
+    numba = nb
+
+#===========================================================================================================
+def atmosphere_layer(altp,disa):
+    j = 0
+    while (j<len(DTODZ)-1 and Z[j+1]<=altp):
+        j = j + 1
+    if (0.<abs(DTODZ[j])):
+        pamb = P[j]*(1. + (DTODZ[j]/T[j])*(altp-Z[j]))**(-G/(R*DTODZ[j]))
+    else:
+        pamb = P[j]*math.exp(-(G/R)*((altp-Z[j])/T[j]))
+    tstd = T[j] + DTODZ[j]*(altp-Z[j])
+    tamb = tstd + disa
+    return pamb,tamb,tstd,DTODZ[j]
+
+def atmosphere_kernel(altp,disa):
+    if (Z[-1]<altp):
+        raise Exception("atmosphere, altitude cannot exceed 50km")
+    return atmosphere_layer(altp,disa)
+
+def atmosphere_loop(altp,disa,out):
+    # Range is checked by atmosphere(), an exception raised in a parallel loop does not reach the caller
+    for i in prange(len(altp)):
+        out[0,i],out[1,i],out[2,i],out[3,i] = atmosphere_layer(altp[i],disa[i])
+
+#===========================================================================================================
+def pressure_altitude_layer(pamb):
+    j = 0
+    while (j<len(DTODZ)-1 and pamb<P[j+1]):
+        j = j + 1
+    if (0.<abs(DTODZ[j])):
+        altp = Z[j] + ((pamb/P[j])**(-(R*DTODZ[j])/G) - 1)*(T[j]/DTODZ[j])
+    else:
+        altp = Z[j] + -(T[j]/(G/R))*math.log(pamb/P[j])
+    return altp
+
+def pressure_altitude_kernel(pamb):
+    if (pamb<P[-1]):
+        raise Exception("pressure_altitude, altitude cannot exceed 50km")
+    return pressure_altitude_layer(pamb)
+
+def pressure_altitude_loop(pamb,out):
+    # Range is checked by pressure_altitude()
+    for i in prange(len(pamb)):
+        out[0,i] = pressure_altitude_layer(pamb[i])
+
+#===========================================================================================================
+def mach_from_vcas_kernel(pamb,Vcas):
+    fac = GAM/(GAM-1.)
+    mach = math.sqrt(((((((GAM-1.)/2.)*(Vcas/VC0)**2+1)**fac-1.)*P0/pamb+1.)**(1./fac)-1.)*(2./(GAM-1.)))
+    return mach
+
+#===========================================================================================================
+def climb_mode_kernel(speed_mode,dtodz,tstd,disa,mach):
+    if (speed_mode==1):
+        fac = (GAM-1.)/2.
+        acc_factor = 1. + (((1.+fac*mach**2)**(GAM/(GAM-1.))-1.)/(1.+fac*mach**2)**(1./(GAM-1.))) \
+                        + ((GAM*R)/(2.*G))*(mach**2)*(tstd/(tstd+disa))*dtodz
+    elif (speed_mode==2):
+        acc_factor = 1. + ((GAM*R)/(2.*G))*(mach**2)*(tstd/(tstd+disa))*dtodz
+    else:
+        raise Exception("climb_mode index is out of range")
+    return acc_factor
+
+#===========================================================================================================
+def reynolds_number_kernel(pamb,tamb,mach):
+    vsnd = math.sqrt( GAM * R * tamb )
+    rho = pamb / ( R * tamb )
+    mu = (MU0*((T0+S)/(tamb+S))*(tamb/T0)**1.5)
+    re = rho*vsnd*mach/mu
+    return re
+
+def reynolds_number_loop(pamb,tamb,mach,out):
+    for i in prange(len(pamb)):
+        out[0,i] = reynolds_number_kernel(pamb[i],tamb[i],mach[i])
+
+
+#===========================================================================================================
+def apply_loop(loop, n_out, *inputs):
+    """
+    Broadcast array inputs, run the compiled loop over flat arrays and reshape its outputs
+    """
+    inputs = numpy.broadcast_arrays(*[numpy.asarray(x, dtype=float) for x in inputs])
+    out = numpy.empty((n_out,)+inputs[0].shape)
+    loop(*[numpy.ravel(x) for x in inputs], out.reshape(n_out,-1))
+    return out
+
+#===========================================================================================================
+def atmosphere(altp,disa):
+    """
+    Same as earth.atmosphere
+    """
+    if (backend=="numpy"):
+        return earth.atmosphere(altp,disa)
+    if numba is None:
+        load_numba()
+    if isinstance(altp,float) and isinstance(disa,(float,int)):
+        return atmosphere_kernel(altp,float(disa))
+    if (Z[-1]<numpy.asarray(altp)).any():
+        raise Exception("atmosphere, altitude cannot exceed 50km")
+    out = apply_loop(atmosphere_loop, 4, altp, disa)
+    return out[0],out[1],out[2],out[3]
+
+def pressure_altitude(pamb):
+    """
+    Same as earth.pressure_altitude
+    """
+    if (backend=="numpy"):
+        return earth.pressure_altitude(pamb)
+    if numba is None:
+        load_numba()
+    if isinstance(pamb,float):
+        return pressure_altitude_kernel(pamb)
+    if (numpy.asarray(pamb)<P[-1]).any():
+        raise Exception("pressure_altitude, altitude cannot exceed 50km")
+    return apply_loop(pressure_altitude_loop, 1, pamb)[0]
+
+def mach_from_vcas(pamb,Vcas):
+    """
+    Same as earth.mach_from_vcas, array calls use earth
+    """
+    if (backend=="numpy" or not (isinstance(pamb,float) and isinstance(Vcas,float))):
+        return earth.mach_from_vcas(pamb,Vcas)
+    if numba is None:
+        load_numba()
+    return mach_from_vcas_kernel(pamb,Vcas)
+
+def climb_mode(speed_mode,dtodz,tstd,disa,mach):
+    """
+    Same as earth.climb_mode, array calls use earth
+    """
+    scalar = isinstance(dtodz,float) and isinstance(tstd,float) and isinstance(disa,(float,int)) and isinstance(mach,float)
+    if (backend=="numpy" or not scalar):
+        return earth.climb_mode(speed_mode,dtodz,tstd,disa,mach)
+    if numba is None:
+        load_numba()
+    return climb_mode_kernel(speed_mode,dtodz,tstd,float(disa),mach)
+
+def reynolds_number(pamb,tamb,mach):
+    """
+    Same as earth.reynolds_number
+    """
+    if (backend=="numpy"):
+        return earth.reynolds_number(pamb,tamb,mach)
+    if numba is None:
+        load_numba()
+    if isinstance(pamb,float) and isinstance(tamb,float) and isinstance(mach,float):
+        return reynolds_number_kernel(pamb,tamb,mach)
+    return apply_loop(reynolds_number_loop, 1, pamb, tamb, mach)[0]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabulated atmosphere, optional fast backend of earth for mission and envelope computations
+
+Pressure, temperature, density, sound speed and viscosity are served by vectorized linear interpolation
+in tables built once against the exact earth functions and shared between processes through disk cache
+"""
+
+import os
+import tempfile
+
+import numpy
+
+import earth
+
+
+#===========================================================================================================
+def exact_state(altp,disa):
+    """
+    Reference atmosphere state computed with earth functions
+    Returns pressure, temperature, density, sound speed and dynamic viscosity
+    """
+    pamb,tamb,tstd,dtodz = earth.atmosphere(altp,disa)
+    rho,sig = earth.air_density(pamb,tamb)
+    vsnd = earth.sound_speed(tamb)
+    mu = earth.gas_viscosity(tamb)
+    return pamb,tamb,rho,vsnd,mu
+
+
+#===========================================================================================================
+def interpolate(table, x_min, x_max, x):
+    """
+    Linear interpolation of all rows of table on a regular grid between x_min and x_max
+    """
+    n = table.shape[1]
+    u = (x-x_min)*((n-1)/(x_max-x_min))
+    i = numpy.minimum(u.astype(numpy.intp), n-2)
+    f = u - i
+    j = i + 1
+    return [row.take(i) + (row.take(j)-row.take(i))*f for row in table]
+
+
+#===========================================================================================================
+class Atmosphere_table(object):
+    """
+    Atmosphere tabulated versus pressure altitude and ISA temperature shift
+
+    The ISA model is separable : pressure and standard temperature depend on altitude only, ambient
+    temperature is standard temperature plus disa, sound speed and viscosity depend on ambient temperature
+    only and density is the ideal gas law. So log(pamb) and tstd are tabulated versus altitude, sound speed
+    and viscosity versus ambient temperature, which covers the whole (altp, disa) domain with two 1D tables.
+
+    Each table is refined by halving its step until the relative interpolation error at all mid-nodes,
+    checked against earth.atmosphere, earth.sound_speed and earth.gas_viscosity, is below tol.
+    Altitude table is refined to tol/2 so that density, which combines pressure and temperature, stays below tol.
+    Tables are saved in cache_dir and memory-mapped, so processes using the same settings share them.
+    """
+    version = 1     # Increase when tabulated models change to invalidate cached tables
+
+    def __init__(self, tol=1.e-4,
+                       altp_min=0., altp_max=50000.,
+                       disa_min=-50., disa_max=50.,
+                       cache_dir=None):
+        self.tol = tol
+        self.altp_min = altp_min
+        self.altp_max = altp_max
+        self.disa_min = disa_min
+        self.disa_max = disa_max
+
+        Z,dtodz,P,T = earth.isa_layers()
+        altp = numpy.array([altp_min, altp_max] + [z for z in Z if altp_min<z<altp_max])
+        tstd = earth.atmosphere(altp,0.)[2]     # Standard temperature is piecewise linear, extrema are at these points
+        self.tamb_min = numpy.min(tstd) + disa_min
+        self.tamb_max = numpy.max(tstd) + disa_max
+
+        if (cache_dir is None):
+            cache_dir = os.path.join(tempfile.gettempdir(), "marilib_obj")
+        self.cache_dir = cache_dir
+
+        self.altp_table = None      # log(pamb) and tstd versus pressure altitude
+        self.tamb_table = None      # vsnd and mu versus ambient temperature
+
+        self.load()
+
+    def file_name(self, table):
+        return os.path.join(self.cache_dir, "atmosphere_%s_v%d_%g_%g_%g_%g_%g.npy"
+                                            % (table, self.version, self.tol, self.altp_min, self.altp_max,
+                                               self.disa_min, self.disa_max))
+
+    def load(self):
+        """
+        Map the cached tables, build and save them first if they do not exist
+        """
+        for table,build in [("altp_table",self.build_altp_table), ("tamb_table",self.build_tamb_table)]:
+            file_name = self.file_name(table)
+            if not os.path.isfile(file_name):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_name = "%s.%d.tmp" % (file_name, os.getpid())
+                with open(tmp_name, "wb") as f:
+                    numpy.save(f, build())
+                os.replace(tmp_name, file_name)     # Atomic, concurrent builders never expose a partial file
+            setattr(self, table, numpy.load(file_name, mmap_mode="r"))
+
+    def build_altp_table(self):
+        """
+        Start from 1000 m steps so that layer boundaries are nodes, which makes tstd exact
+        """
+        n = int(numpy.ceil((self.altp_max-self.altp_min)/1000.)) + 1
+        while True:
+            self.altp_table = self.tabulate_altp(numpy.linspace(self.altp_min, self.altp_max, n))
+            if (max(self.check_altp_table())<=0.5*self.tol):
+                return self.altp_table
+            n = 2*n - 1
+
+    def build_tamb_table(self):
+        n = int(numpy.ceil((self.tamb_max-self.tamb_min)/10.)) + 1
+        while True:
+            self.tamb_table = self.tabulate_tamb(numpy.linspace(self.tamb_min, self.tamb_max, n))
+            if (max(self.check_tamb_table())<=self.tol):
+                return self.tamb_table
+            n = 2*n - 1
+
+    def tabulate_altp(self, altp):
+        pamb,tamb,tstd,dtodz = earth.atmosphere(altp,0.)
+        return numpy.array([numpy.log(pamb),tstd])
+
+    def tabulate_tamb(self, tamb):
+        return numpy.array([earth.sound_speed(tamb),earth.gas_viscosity(tamb)])
+
+    def check_altp_table(self):
+        """
+        Max relative errors on pamb and tstd at altitude mid-nodes
+        """
+        n = self.altp_table.shape[1]
+        altp = numpy.linspace(self.altp_min, self.altp_max, 2*n-1)[1::2]
+        exact = self.tabulate_altp(altp)
+        table = interpolate(self.altp_table, self.altp_min, self.altp_max, altp)
+        return numpy.max(numpy.abs(numpy.exp(table[0]-exact[0])-1.)), numpy.max(numpy.abs(table[1]/exact[1]-1.))
+
+    def check_tamb_table(self):
+        """
+        Max relative errors on vsnd and mu at temperature mid-nodes
+        """
+        n = self.tamb_table.shape[1]
+        tamb = numpy.linspace(self.tamb_min, self.tamb_max, 2*n-1)[1::2]
+        exact = self.tabulate_tamb(tamb)
+        table = interpolate(self.tamb_table, self.tamb_min, self.tamb_max, tamb)
+        return [numpy.max(numpy.abs(t/e-1.)) for t,e in zip(table,exact)]
+
+    def check(self, n_altp=1001, n_disa=21):
+        """
+        Max relative error of pamb, tamb, rho, vsnd and mu versus exact_state over a regular (altp, disa) grid
+        """
+        A,D = numpy.meshgrid(numpy.linspace(self.altp_min, self.altp_max, n_altp),
+                             numpy.linspace(self.disa_min, self.disa_max, n_disa), indexing="ij")
+        exact = exact_state(A,D)
+        table = self.state(A,D)
+        return [numpy.max(numpy.abs(t/e-1.)) for t,e in zip(table,exact)]
+
+    def state(self, altp, disa):
+        """
+        Interpolated pressure, temperature, density, sound speed and dynamic viscosity
+        altp and disa can be floats or numpy arrays, they are broadcast together
+        """
+        altp,disa = numpy.broadcast_arrays(altp,disa)
+
+        if (altp<self.altp_min).any() or (self.altp_max<altp).any():
+            raise Exception("atmosphere_table, altitude is out of table range")
+        if (disa<self.disa_min).any() or (self.disa_max<disa).any():
+            raise Exception("atmosphere_table, disa is out of table range")
+
+        log_pamb,tstd = interpolate(self.altp_table, self.altp_min, self.altp_max, altp)
+        pamb = numpy.exp(log_pamb)
+        tamb = tstd + disa
+        vsnd,mu = interpolate(self.tamb_table, self.tamb_min, self.tamb_max, tamb)
+        rho,sig = earth.air_density(pamb,tamb)
+
+        return pamb[()],tamb[()],rho[()],vsnd[()],mu[()]
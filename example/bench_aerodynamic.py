@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the drag polar of aircraft.aerodynamic
+
+A population of 1e4 designs is evaluated, then its polar is queried as a mission integrator does : many lift
+coefficients at a few flight conditions. Queries are timed with and without the cache of the zero lift drag.
+A full polar over a grid of lift coefficient, Mach number and altitude is also computed for one design.
+
+Run from the repository root : python -m example.bench_aerodynamic
+"""
+
+import time
+
+import numpy as np
+
+import unit
+
+from aircraft.aerodynamic import Polar
+
+from example.bench_doe import factory, evaluate, doe, REFERENCE
+
+
+if __name__ == "__main__":
+    n = 10000
+    n_step = 200
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+    ac = evaluate(factory(**designs))
+    mach = ac.requirement.cruise_mach
+
+    # Cruise of each design at 3 altitudes, lift coefficient decreasing as fuel is burnt
+    conditions = [unit.m_ft(altp) for altp in [31000., 33000., 35000.]]
+    cz = np.linspace(0.55, 0.45, n_step)
+
+    print("%d designs, %d conditions, %d lift coefficients per condition" % (n, len(conditions), n_step))
+    ref = None
+    for label,cache_size in [("no cache", 0), ("cache", 256)]:
+        polar = Polar(ac, cache_size=cache_size)
+        t0 = time.perf_counter()
+        lod = [[polar.drag(c, mach, altp)[1] for c in cz] for altp in conditions]
+        t1 = time.perf_counter()
+        if ref is None:
+            ref = np.array(lod)
+        print("  %-10s %8.1fms  friction evaluations %4d  rdiff %.1e" % (label, 1e3*(t1-t0), polar.n_miss,
+                                                                        np.max(np.abs(np.array(lod)/ref-1.))))
+
+    ac = evaluate(factory(**REFERENCE))
+    polar = Polar(ac)
+    cz = np.linspace(0., 0.8, 81)[:,None,None]
+    mach = np.linspace(0.5, 0.85, 36)[:,None]
+    altp = unit.m_ft(np.linspace(20000., 41000., 22))
+    t0 = time.perf_counter()
+    cx,lod = polar.drag(cz, mach, altp)
+    t1 = time.perf_counter()
+    print("1 design, polar over a grid of %d points : %.1fms" % (cx.size, 1e3*(t1-t0)))
+    i,j,k = np.unravel_index(np.argmax(lod), lod.shape)
+    print("  max lift to drag ratio %.2f at cz = %.2f, mach = %.2f, altp = %.0f ft"
+          % (lod[i,j,k], cz[i,0,0], mach[j,0], unit.ft_m(altp[k])))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Cost of a variant of a baseline aircraft : full rebuild, deepcopy or copy on write clone
+
+Each variant changes the HTP aspect ratio, the wing aspect ratio or the cruise Mach number and is evaluated.
+Clones are evaluated incrementally, variant results are compared with a rebuilt aircraft and the baseline is
+checked unchanged.
+
+Run from the repository root : python -m example.bench_clone
+"""
+
+from copy import deepcopy
+
+import numpy as np
+
+from aircraft.airframe.component import owner
+from process.scheduler import Scheduler
+from example.bench_doe import factory, outputs, REFERENCE
+from example.timing import best_time
+
+
+baseline = factory(**REFERENCE)
+Scheduler(baseline).run()
+reference = outputs(baseline)
+
+def rebuild(slot, attr, value):
+    ac = factory(**REFERENCE)
+    setattr(owner(ac,slot), attr, value)
+    Scheduler(ac).run()
+    return ac
+
+def copied(slot, attr, value):
+    ac = deepcopy(baseline)
+    setattr(owner(ac,slot), attr, value)
+    Scheduler(ac).run()
+    return ac
+
+def cloned(slot, attr, value):
+    ac = baseline.clone()
+    setattr(owner(ac,slot), attr, value)
+    Scheduler(ac, evaluated=baseline).run()
+    return ac
+
+print("clone alone %.1f us, deepcopy alone %.1f us"
+      % (1e6*best_time(baseline.clone, 200), 1e6*best_time(lambda: deepcopy(baseline), 200)))
+
+for slot,attr,value in [("horizontal_stab","aspect_ratio",4.5), ("wing","aspect_ratio",10.),
+                         ("requirement","cruise_mach",0.74)]:
+    times = [1e6*best_time(lambda: fct(slot,attr,value), 200) for fct in (rebuild,copied,cloned)]
+    same = np.array_equal(outputs(cloned(slot,attr,value)), outputs(rebuild(slot,attr,value)))
+    print("%-28s rebuild %6.1f us, deepcopy %6.1f us, clone %6.1f us, clone equals rebuild : %s"
+          % (slot+"."+attr, *times, same))
+
+print("baseline unchanged :", np.array_equal(outputs(baseline), reference))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Batched evaluation of airframe components over a design of experiments
+
+All design variables of the DOE are held as arrays by one aircraft, geometry and mass of the N designs
+are computed in one pass of vectorized NumPy and compared with a loop of scalar evaluations.
+
+Run from the repository root : python -m example.bench_doe
+"""
+
+import time
+
+import numpy as np
+
+import unit
+from aircraft.requirement import Requirement
+from aircraft.arrangement import Arrangement
+from aircraft.root import Aircraft
+
+from aircraft.airframe import component
+
+from process.scheduler import Scheduler
+
+
+# Reference design of the benchmarks
+REFERENCE = dict(n_pax_ref=150., design_range=unit.m_NM(3000.), cruise_mach=0.78, aspect_ratio=9., taper_ratio=0.25)
+
+
+def doe(n, rng, mach_min=0.5):
+    """
+    Random design of experiments of n designs, as keyword arguments of factory
+    The default Mach range crosses the kink / no kink switch at Mach 0.66
+    """
+    return dict(n_pax_ref = rng.integers(40, 400, n).astype(float),
+                design_range = unit.m_NM(rng.uniform(1000., 7000., n)),
+                cruise_mach = rng.uniform(mach_min, 0.85, n),
+                aspect_ratio = rng.uniform(7., 12., n),
+                taper_ratio = rng.uniform(0.2, 0.4, n))
+
+
+def factory(n_pax_ref, design_range, cruise_mach, aspect_ratio, taper_ratio, stab_architecture="classic"):
+    agmt = Arrangement(stab_architecture = stab_architecture)
+    reqs = Requirement(n_pax_ref = n_pax_ref,
+                       design_range = design_range,
+                       cruise_mach = cruise_mach,
+                       cruise_altp = unit.m_ft(35000.),
+                       arrangement = agmt)
+
+    ac = Aircraft(reqs,agmt)
+
+    ac.airframe.cabin = component.Cabin(ac)
+    ac.airframe.fuselage = component.Fuselage(ac)
+    ac.airframe.wing = component.Wing(ac)
+    ac.airframe.wing.aspect_ratio = aspect_ratio
+    ac.airframe.wing.taper_ratio = taper_ratio
+
+    if (stab_architecture=="classic"):
+        ac.airframe.vertical_stab = component.VTP_classic(ac)
+        ac.airframe.horizontal_stab = component.HTP_classic(ac)
+    elif (stab_architecture=="t_tail"):
+        ac.airframe.vertical_stab = component.VTP_T(ac)
+        ac.airframe.horizontal_stab = component.HTP_T(ac)
+    elif (stab_architecture=="h_tail"):
+        ac.airframe.vertical_stab = component.VTP_H(ac)
+        ac.airframe.horizontal_stab = component.HTP_H(ac)
+    return ac
+
+
+def evaluate(ac):
+    Scheduler(ac).run()
+    return ac
+
+
+def outputs(ac):
+    af = ac.airframe
+    return np.array([af.cabin.mass, af.fuselage.mass, af.wing.mass, af.wing.mac, af.wing.c_kink,
+                     af.wing.setting, af.vertical_stab.mass, af.horizontal_stab.lever_arm])
+
+
+if __name__ == "__main__":
+    n = 100000
+    n_check = 500
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+
+    for stab in ["classic", "t_tail", "h_tail"]:
+        t0 = time.perf_counter()
+        batch = outputs(evaluate(factory(stab_architecture=stab, **designs)))
+        t1 = time.perf_counter()
+        loop = np.array([outputs(evaluate(factory(stab_architecture=stab, **{k:v[i] for k,v in designs.items()})))
+                         for i in range(n_check)]).T
+        t2 = time.perf_counter()
+
+        diff = np.max(np.abs(batch[:,:n_check]/loop - 1.))
+        t_loop = (t2-t1)*n/n_check
+        print("%-8s %d designs, batched %.3f s, scalar loop %.1f s (extrapolated), speedup %.0fx, max rdiff %.1e"
+              % (stab, n, t1-t0, t_loop, t_loop/(t1-t0), diff))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the compiled earth kernels against the NumPy ones, scalar calls and 1e6 element arrays
+
+Run from the repository root : python -m example.bench_earth_jit
+"""
+
+import sys
+
+import numpy as np
+
+import earth_jit
+
+from example.timing import best_time
+
+
+n = 1000000
+rng = np.random.default_rng(0)
+
+altp = rng.uniform(0., 45000., n)
+disa = rng.uniform(-30., 30., n)
+mach = rng.uniform(0.2, 0.85, n)
+vcas = rng.uniform(60., 180., n)
+
+earth_jit.set_backend("numpy")
+pamb,tamb,tstd,dtodz = earth_jit.atmosphere(altp,disa)
+
+cases = [("atmosphere",        lambda i: earth_jit.atmosphere(altp[i],disa[i])),
+         ("pressure_altitude", lambda i: earth_jit.pressure_altitude(pamb[i])),
+         ("mach_from_vcas",    lambda i: earth_jit.mach_from_vcas(pamb[i],vcas[i])),
+         ("climb_mode",        lambda i: earth_jit.climb_mode(1,dtodz[i],tstd[i],disa[i],mach[i])),
+         ("reynolds_number",   lambda i: earth_jit.reynolds_number(pamb[i],tamb[i],mach[i]))]
+
+if not earth_jit.has_numba:
+    print("numba is not installed, nothing to compare")
+    sys.exit(0)
+
+print("%-18s %12s %12s %8s %12s %12s %8s %10s" % ("kernel", "numpy 1pt", "numba 1pt", "speedup",
+                                                  "numpy 1e6", "numba 1e6", "speedup", "max rdiff"))
+for name,fct in cases:
+    scalar = 12345
+    result = {}
+    for backend in ["numpy","numba"]:
+        earth_jit.set_backend(backend)
+        fct(scalar), fct(slice(None))      # Compile and warm up
+        t_scalar = best_time(lambda: fct(scalar), 2000)
+        t_array = best_time(lambda: fct(slice(None)), 1, repeat=3)
+        result[backend] = (t_scalar, t_array, np.array(fct(slice(None))))
+    a,b = result["numba"][2],result["numpy"][2]
+    diff = np.max(np.abs(a-b)/np.maximum(np.abs(b), np.finfo(float).tiny))
+    print("%-18s %10.2fus %10.2fus %7.1fx %10.1fms %10.1fms %7.1fx %10.1e"
+          % (name, 1e6*result["numpy"][0], 1e6*result["numba"][0], result["numpy"][0]/result["numba"][0],
+             1e3*result["numpy"][1], 1e3*result["numba"][1], result["numpy"][1]/result["numba"][1], diff))
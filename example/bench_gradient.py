@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the finite difference gradient service of process.gradient
+
+Derivatives of component masses and of some geometry constraints with respect to the variables of a plan are
+computed for one design and for a population of 1e4 designs :
+ - one evaluation per variable, without coloring
+ - one evaluation per color of the sparsity pattern given by the component graph
+ - the same in a pool of 2 processes, which only pays off on large populations with more than one core
+The service is also built at Mach 0.6, without wing kink, and used at Mach 0.78, with a kink : the pattern of the
+component graph does not depend on the branches taken by the designs.
+Evaluations, time and difference to the complex step derivatives are printed. A plan of N designs is perturbed
+for all designs at once, its Jacobian is block diagonal over the designs and each evaluation gives N columns.
+
+Run from the repository root : python -m example.bench_gradient
+"""
+
+import os
+import time
+
+import numpy as np
+
+from process.plan import Plan
+from process.gradient import Finite_difference, complex_step
+
+from example.bench_doe import factory, doe, REFERENCE
+
+
+VARIABLES = ["requirement.n_pax_ref", "requirement.design_range", "requirement.cruise_mach",
+             "wing.area", "wing.aspect_ratio", "wing.taper_ratio", "aerodynamics.hld_conf_ld",
+             "vertical_stab.area", "vertical_stab.aspect_ratio", "vertical_stab.taper_ratio",
+             "horizontal_stab.area", "horizontal_stab.aspect_ratio", "horizontal_stab.taper_ratio",
+             "horizontal_stab.dihedral"]
+
+OUTPUTS = {"masses": ["cabin.mass", "fuselage.mass", "wing.mass", "vertical_stab.mass", "horizontal_stab.mass"],
+           "geometry": ["cabin.length", "fuselage.length", "wing.span", "wing.c_tip", "vertical_stab.height",
+                        "horizontal_stab.span"]}
+
+
+if __name__ == "__main__":
+    n = 10000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+
+    print("%d variables" % len(VARIABLES))
+    print("  %-40s %6s %10s %10s" % ("case", "eval", "time", "rdiff"))
+    for size,design in [("1", REFERENCE), ("1e4", designs)]:
+        plan = Plan(factory(**design))
+        for label,outputs in OUTPUTS.items():
+            cs = complex_step(plan, outputs, VARIABLES)
+            for case,coloring,n_process in [("no coloring", False, 1), ("coloring", True, 1),
+                                            ("coloring, 2 processes", True, 2)]:
+                fd = Finite_difference(plan, outputs, VARIABLES, coloring=coloring, n_process=n_process)
+                fd.gradient()       # Starts the pool
+                t0 = time.perf_counter()
+                grad = fd.gradient()
+                t1 = time.perf_counter()
+                fd.close()
+                rdiff = max(np.max(np.abs(grad[name]-cs[name])/np.max(np.abs(cs[name]))) for name in outputs)
+                print("  %-40s %6d %8.1fms %10.1e" % (label+", "+case+", "+size+" design(s)", fd.n_eval,
+                                                    1e3*(t1-t0), rdiff))
+
+    plan = Plan(factory(**dict(REFERENCE, cruise_mach=0.6)))
+    fd = Finite_difference(plan, OUTPUTS["geometry"], VARIABLES)
+    plan["requirement.cruise_mach"] = 0.78
+    grad = fd.gradient()
+    cs = complex_step(plan, OUTPUTS["geometry"], VARIABLES)
+    rdiff = max(np.max(np.abs(grad[name]-cs[name])/np.max(np.abs(cs[name]))) for name in OUTPUTS["geometry"])
+    print("  %-40s %6d %10s %10.1e" % ("geometry, built at Mach 0.6, used at 0.78", fd.n_eval, "", rdiff))
+    print("%d core(s) available to the pool" % len(os.sched_getaffinity(0)))
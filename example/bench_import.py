@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Import time benchmark with a regression budget, exits with an error when the budget is exceeded
+
+Run from the repository root : python -m example.bench_import [budget_in_seconds]
+Each measure is done in a fresh interpreter, bytecode is compiled by a first untimed run.
+"""
+
+import os
+import subprocess
+import sys
+
+modules = "earth, unit, aircraft.root"
+heavy = ["scipy", "numba", "matplotlib", "pandas"]     # Must not be loaded by the modules above
+budget = float(sys.argv[1]) if len(sys.argv)>1 else 0.15
+n_run = 10
+
+code = """
+import sys, time
+t0 = time.perf_counter()
+import %s
+t1 = time.perf_counter()
+print(t1-t0)
+print(" ".join(m for m in %r if m in sys.modules))
+""" % (modules, heavy)
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env = dict(os.environ, PYTHONPATH=root)
+env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+def run():
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, env=env,
+                         capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(out[0]), out[1].split()
+
+run()      # Warm up bytecode and file system caches
+times = []
+for i in range(n_run):
+    t, loaded = run()
+    times.append(t)
+times.sort()
+
+print("import %s" % modules)
+print("  best %.1f ms, median %.1f ms, budget %.1f ms" % (1e3*times[0], 1e3*times[n_run//2], 1e3*budget))
+
+if loaded:
+    print("  FAILED, heavy modules imported : %s" % ", ".join(loaded))
+    sys.exit(1)
+if (budget<times[n_run//2]):
+    print("  FAILED, import time exceeds budget")
+    sys.exit(1)
+print("  OK")
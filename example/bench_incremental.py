@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Incremental re-evaluation of an airframe after design changes
+
+After a first full run, the scheduler only re-evaluates the components downstream of modified attributes.
+Results are compared with a full evaluation of a fresh aircraft having the same design.
+
+Run from the repository root : python -m example.bench_incremental
+"""
+
+import time
+
+import numpy as np
+
+from aircraft.airframe.component import owner
+from process.scheduler import Scheduler
+from example.bench_doe import factory, outputs, REFERENCE
+
+
+changes = [("horizontal_stab", "aspect_ratio", 4.5),
+           ("vertical_stab", "area", 30.),
+           ("wing", "aspect_ratio", 10.),
+           ("fuselage", "form_factor", 1.06),
+           ("weight_cg", "mtow", 80000.),
+           ("requirement", "cruise_mach", 0.74),
+           (None, None, None)]       # No change, nothing to evaluate
+
+for stab in ["classic", "t_tail", "h_tail"]:
+    ac = factory(stab_architecture=stab, **REFERENCE)
+    scheduler = Scheduler(ac)
+    scheduler.run()
+    print("%s, first run : %d tasks evaluated" % (stab, scheduler.misses))
+
+    for slot,attr,val in changes:
+        hits,misses = scheduler.hits,scheduler.misses
+        if val is not None:
+            setattr(owner(ac,slot), attr, val)
+        t0 = time.perf_counter()
+        scheduler.run()
+        t1 = time.perf_counter()
+
+        ref = factory(stab_architecture=stab, **REFERENCE)
+        for s,a,v in changes[:changes.index((slot,attr,val))+1]:
+            if v is not None:
+                setattr(owner(ref,s), a, v)
+        Scheduler(ref).run()
+        ok = np.allclose(outputs(ac), outputs(ref), rtol=1e-15)
+
+        print("  %-28s evaluated %2d, skipped %2d, %6.1f us, same as full run : %s"
+              % ("no change" if slot is None else slot+"."+attr, scheduler.misses-misses, scheduler.hits-hits, 1e6*(t1-t0), ok))
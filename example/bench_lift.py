@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the low speed lift laws of the wing
+
+Maximum lift, lift at zero angle of attack and lift slope are computed over a grid of flap settings and Mach
+numbers, as low speed performance does, for one design and for 1e3 designs :
+ - by calls of Wing.high_lift and Wing.cza for each point of the grid
+ - by one call of the table returned by Wing.lift_table, built once
+
+Run from the repository root : python -m example.bench_lift
+"""
+
+import time
+
+import numpy as np
+
+from example.bench_doe import factory, evaluate, doe, REFERENCE
+
+
+if __name__ == "__main__":
+    n = 1000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+
+    hld_conf = np.linspace(0., 1., 11)
+    mach = np.linspace(0.1, 0.3, 21)
+
+    print("%d flap settings x %d Mach numbers" % (len(hld_conf), len(mach)))
+    for size,design in [("1", REFERENCE), ("1e3", designs)]:
+        ac = evaluate(factory(**design))
+        wing = ac.airframe.wing
+        width = ac.airframe.fuselage.width
+
+        t0 = time.perf_counter()
+        loop = []
+        for c in hld_conf:
+            for m in mach:
+                cz_max,cz_0 = wing.high_lift(c)
+                loop.append(np.broadcast_arrays(cz_max, cz_0,
+                                                wing.cza(m, width, wing.aspect_ratio, wing.span, wing.sweep25)))
+        t1 = time.perf_counter()
+        table = wing.lift_table()
+        ones = (1,)*np.ndim(width)      # Design axis
+        cz_max,cz_0,cza = table(hld_conf.reshape((-1,1)+ones), mach.reshape((-1,)+ones))
+        t2 = time.perf_counter()
+
+        loop = np.array(loop).reshape((len(hld_conf), len(mach), 3)+np.shape(width))
+        rdiff = max(np.max(np.abs(np.broadcast_to(v, loop[:,:,k].shape)/loop[:,:,k]-1.))
+                    for k,v in enumerate([cz_max, cz_0, cza]) if k!=1)
+        adiff = np.max(np.abs(np.broadcast_to(cz_0, loop[:,:,1].shape)-loop[:,:,1]))
+        print("  %-4s design(s)  loop %8.2fms  table %8.2fms  speedup %6.1f  rdiff %.1e  cz_0 adiff %.1e"
+              % (size, 1e3*(t1-t0), 1e3*(t2-t1), (t1-t0)/(t2-t1), rdiff, adiff))
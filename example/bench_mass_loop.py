@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the mass loop solvers, plain substitution against Anderson mixing and Newton
+
+One design and a population of 1e4 designs are converged with each method of process.mass_loop.Mass_loop.
+Iterations, plan evaluations, time and residual history are printed, solutions are compared to substitution.
+
+Run from the repository root : python -m example.bench_mass_loop
+"""
+
+import time
+
+import numpy as np
+
+from process.plan import Plan
+from process.mass_loop import Mass_loop, METHODS
+
+from example.bench_doe import factory, doe
+
+
+if __name__ == "__main__":
+    n = 10000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+    one = {k:v[0] for k,v in designs.items()}
+
+    for size,design in [("1", one), ("1e4", designs)]:
+        print("%s design(s)" % size)
+        print("  %-13s %6s %6s %10s %10s %10s  %s" % ("method", "iter", "eval", "time", "max iter", "rdiff",
+                                                     "max relative residual by iteration"))
+        ref = None
+        for method in METHODS:
+            loop = Mass_loop(Plan(factory(**design)), method)
+            t0 = time.perf_counter()
+            x = np.array(loop.solve())
+            t1 = time.perf_counter()
+            if ref is None:
+                ref = x
+            history = " ".join("%.0e" % r for r in loop.history)
+            print("  %-13s %6d %6d %8.1fms %10d %10.1e  %s" % (method, loop.n_iter, loop.n_eval, 1e3*(t1-t0),
+                                                             np.max(loop.iterations), np.max(np.abs(x/ref-1.)),
+                                                             history if len(history)<60 else history[:56]+" ..."))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the coupling solver on the three stabilizer architectures
+
+For each architecture :
+ - one design and a population of 1e3 designs are solved from the initial couplings with each method
+ - an optimization run is mimicked by 20 designs of increasing wing aspect ratio, each one solved from the initial
+   couplings by naive re-iteration, or by Newton with a Jacobian reused from the previous designs and a warm start
+Plan evaluations, Jacobian computations, time and difference to the naive re-iteration are printed.
+
+Run from the repository root : python -m example.bench_mda
+"""
+
+import time
+
+import numpy as np
+
+from process.plan import Plan
+from process.mda import Mda, METHODS
+
+from example.bench_doe import factory, doe, REFERENCE
+
+
+def run(mda, designs, seed, warm_start):
+    """
+    Solve the designs in sequence, couplings being reset to seed before each one
+    """
+    n_eval,n_jacobian,result = 0,0,[]
+    t0 = time.perf_counter()
+    for aspect_ratio in designs:
+        for name,value in zip(mda.couplings, seed):
+            mda.plan[name] = value
+        mda.plan["wing.aspect_ratio"] = aspect_ratio
+        result.append(mda.solve(warm_start=warm_start))
+        n_eval += mda.n_eval
+        n_jacobian += mda.n_jacobian
+    return n_eval, n_jacobian, time.perf_counter()-t0, np.array(result)
+
+
+if __name__ == "__main__":
+    n = 1000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+
+    for stab in ["classic", "t_tail", "h_tail"]:
+        print(stab)
+        print("  %-40s %6s %6s %6s %10s %10s" % ("case", "iter", "eval", "jac", "time", "rdiff"))
+        for size,design in [("1", REFERENCE), ("1e3", designs)]:
+            ref = None
+            for method in METHODS:
+                mda = Mda(Plan(factory(stab_architecture=stab, **design)), method)
+                t0 = time.perf_counter()
+                x = mda.solve()
+                t1 = time.perf_counter()
+                if ref is None:
+                    ref = x
+                print("  %-40s %6d %6d %6d %8.1fms %10.1e" % (method+", "+size+" design(s)", mda.n_iter, mda.n_eval,
+                                                           mda.n_jacobian, 1e3*(t1-t0), np.max(np.abs(x/ref-1.))))
+
+        aspect_ratios = np.linspace(9., 10., 20)
+        ref = None
+        for label,method,warm_start in [("substitution", "substitution", False),
+                                         ("newton, new jacobian", "newton", False),
+                                         ("newton, reuse + warm start", "newton", True)]:
+            mda = Mda(Plan(factory(stab_architecture=stab, **REFERENCE)), method, reuse_jacobian=warm_start)
+            seed = [mda.plan[name] for name in mda.couplings]
+            n_eval,n_jacobian,t,x = run(mda, aspect_ratios, seed, warm_start)
+            if ref is None:
+                ref = x
+            print("  %-40s %6s %6d %6d %8.1fms %10.1e" % (label+", 20 designs", "", n_eval, n_jacobian, 1e3*t,
+                                                        np.max(np.abs(x/ref-1.))))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Memory footprint and throughput of aircraft objects
+
+Builds and evaluates n aircraft (1e5 by default) and reports time per aircraft. Memory kept per aircraft and
+number of live memory blocks per aircraft are measured with tracemalloc over the first n_mem aircraft (1e4 by
+default), tracing makes building about 5 times slower.
+
+Run from the repository root : python -m example.bench_memory [n] [n_mem]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from process.scheduler import Scheduler
+from example.bench_doe import factory, REFERENCE
+
+
+n = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+n_mem = int(sys.argv[2]) if len(sys.argv)>2 else min(n, 10000)
+
+def build():
+    ac = factory(**REFERENCE)
+    Scheduler(ac).run()
+    return ac
+
+build()     # Warm up caches (ISA tables, imports)
+
+t0 = time.perf_counter()
+fleet = [build() for i in range(n)]
+t1 = time.perf_counter()
+del fleet
+
+tracemalloc.start()
+m0 = tracemalloc.get_traced_memory()[0]
+b0 = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+fleet = [build() for i in range(n_mem)]
+m1 = tracemalloc.get_traced_memory()[0]
+b1 = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+tracemalloc.stop()
+
+print("%d aircraft built and evaluated" % n)
+print("  time per aircraft     %8.1f us" % (1e6*(t1-t0)/n))
+print("  memory per aircraft   %8.0f bytes" % ((m1-m0)/n_mem))
+print("  blocks per aircraft   %8.1f" % ((b1-b0)/n_mem))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Breguet mission engine of performance.mission
+
+Designs are converged by process.mda.Mda and read back into their aircraft, then :
+ - the nominal, max payload and cost missions of one design are evaluated, and the time of one mission is measured
+ - the nominal mission of 1e4 designs is evaluated over 50 ranges up to their design range and 4 payloads in one call
+ - fuel_from_range and range_from_tow are checked to be inverse of each other
+
+Run from the repository root : python -m example.bench_mission
+"""
+
+import time
+
+import numpy as np
+
+import unit
+
+from process.plan import Plan
+from process.mda import Mda
+
+from performance.mission.general import Breguet
+from performance.mission.nominal import Nominal
+from performance.mission.max_payload import Max_payload
+from performance.mission.cost import Cost
+
+from example.bench_doe import factory, doe, REFERENCE
+
+
+def converged(design):
+    ac = factory(**design)
+    plan = Plan(ac)
+    Mda(plan).solve()
+    plan.read_back()
+    return ac
+
+
+if __name__ == "__main__":
+    n = 10000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng, mach_min=0.70)       # Wing area is not sized, slower designs cannot cruise
+
+    ac = converged(REFERENCE)
+    engine = Breguet(ac)
+    print("1 design, owe %.0f kg, mtow %.0f kg" % (engine.owe, engine.mtow))
+    for mission in [Nominal(ac, engine), Max_payload(ac, engine), Cost(ac, engine)]:
+        mission.eval()
+        print("  %-12s range %6.0f NM  payload %6.0f kg  tow %6.0f kg  block fuel %6.0f kg  reserve %5.0f kg  "
+              "block time %5.2f h" % (type(mission).__name__, unit.NM_m(mission.range), mission.payload, mission.tow,
+                                      mission.fuel_block, mission.fuel_reserve, unit.h_s(mission.time_block)))
+
+    n_call = 2000
+    t0 = time.perf_counter()
+    for k in range(n_call):
+        engine.fuel_from_range(unit.m_NM(3000.), engine.owe+15000.)
+    t1 = time.perf_counter()
+    print("  one mission : %.1f us" % (1e6*(t1-t0)/n_call))
+
+    ac = converged(designs)
+    t0 = time.perf_counter()
+    engine = Breguet(ac)
+    t1 = time.perf_counter()
+    dist = np.linspace(0.1, 1., 50)[:,None,None]*ac.requirement.design_range
+    payload = np.linspace(0.2, 1., 4)[:,None]*ac.weight_cg.m_pax_nominal*ac.requirement.n_pax_ref
+    tow,fuel_block,fuel_reserve,time_block = engine.fuel_from_range(dist, engine.owe+payload)
+    t2 = time.perf_counter()
+    print("1e4 designs, %d missions : engine %.1fms, missions %.1fms, %.2f us per mission"
+          % (tow.size, 1e3*(t1-t0), 1e3*(t2-t1), 1e6*(t2-t1)/tow.size))
+
+    dist_back = engine.range_from_tow(tow, engine.owe+payload)[0]
+    print("  range from tow against range : max rdiff %.1e" % np.max(np.abs(dist_back/dist-1.)))
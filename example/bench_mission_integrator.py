@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Integrator mission engine of performance.mission against the Breguet engine
+
+Designs are converged by process.mda.Mda and read back into their aircraft, then :
+ - the nominal mission of one design is flown by both engines, with the fuel and time of each segment
+ - the integration error is measured against a tight tolerance integration
+ - 1e3 designs are flown over 10 ranges up to their design range and 2 payloads in one call by both engines
+
+Run from the repository root : python -m example.bench_mission_integrator
+"""
+
+import time
+
+import numpy as np
+
+import unit
+
+from performance.mission.general import Breguet, Integrator
+from performance.mission.nominal import Nominal
+
+from example.bench_doe import doe, REFERENCE
+from example.bench_mission import converged
+
+
+def timed(engine, *args):
+    t0 = time.perf_counter()
+    out = engine.fuel_from_range(*args)
+    return out, time.perf_counter()-t0
+
+
+if __name__ == "__main__":
+    n = 1000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng, mach_min=0.70)       # Wing area is not sized, slower designs cannot cruise
+
+    ac = converged(REFERENCE)
+    print("1 design, nominal mission")
+    for engine in [Breguet(ac), Integrator(ac)]:
+        mission = Nominal(ac, engine)
+        mission.eval()
+        print("  %-10s tow %6.0f kg  block fuel %6.0f kg  reserve %5.0f kg  block time %5.2f h"
+              % (type(engine).__name__, mission.tow, mission.fuel_block, mission.fuel_reserve,
+                 unit.h_s(mission.time_block)))
+    for name,(fuel,t) in mission.segments.items():
+        print("    %-10s fuel %6.0f kg  time %5.2f h" % (name, fuel, unit.h_s(t)))
+
+    breguet = Breguet(ac)
+    integrator = Integrator(ac)
+    zfw = integrator.owe + 15000.
+    args = (unit.m_NM(3000.), zfw)
+    dt_b = min(timed(breguet, *args)[1] for k in range(20))
+    dt_i = min(timed(integrator, *args)[1] for k in range(5))
+    print("  one mission : Breguet %.1f us, Integrator %.1f ms" % (1e6*dt_b, 1e3*dt_i))
+
+    ref = Integrator(ac)
+    ref.rtol, ref.shoot_tol = 1.e-10, 1.e-9
+    tow_ref = ref.fuel_from_range(*args)[0]
+    for rtol in [1.e-4, 1.e-6, 1.e-8]:
+        integrator.rtol, integrator.shoot_tol = rtol, 0.1*rtol
+        integrator.n_step = 0
+        tow = integrator.fuel_from_range(*args)[0]
+        print("  rtol %.0e : %4d steps, tow rdiff to rtol 1e-10 %.1e" % (rtol, integrator.n_step, abs(tow/tow_ref-1.)))
+
+    ac = converged(designs)
+    breguet = Breguet(ac)
+    integrator = Integrator(ac)
+    dist = np.linspace(0.1, 1., 10)[:,None,None]*ac.requirement.design_range
+    payload = np.linspace(0.5, 1., 2)[:,None]*ac.weight_cg.m_pax_nominal*ac.requirement.n_pax_ref
+    zfw = integrator.owe + payload
+    out_b,dt_b = timed(breguet, dist, zfw)
+    out_i,dt_i = timed(integrator, dist, zfw)
+    size = out_i[0].size
+    print("1e3 designs, %d missions : Breguet %.1fms, %.2f us per mission, Integrator %.1fms, %.1f us per mission, "
+          "%d lockstep steps" % (size, 1e3*dt_b, 1e6*dt_b/size, 1e3*dt_i, 1e6*dt_i/size, integrator.n_step))
+
+    for k,label in enumerate(["tow", "block fuel", "reserve fuel", "block time"]):
+        rdiff = out_b[k]/out_i[k] - 1.
+        print("  Breguet against Integrator, %-12s : median rdiff %+.1e, min %+.1e, max %+.1e"
+              % (label, np.nanmedian(rdiff), np.nanmin(rdiff), np.nanmax(rdiff)))
+
+    dist_back = integrator.range_from_tow(out_i[0], zfw)[0]
+    print("  Integrator range from tow against range : max rdiff %.1e, %d missions out of reach"
+          % (np.nanmax(np.abs(dist_back/dist-1.)), np.sum(np.isnan(out_i[0]))))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the compiled evaluation plan against scheduler runs on the object view
+
+For each stabilizer architecture, one design and a DOE of 1e5 designs are evaluated repeatedly through
+process.plan.Plan and through process.scheduler.Scheduler, after changing the wing aspect ratio as an optimizer
+would. The scheduler only re-evaluates the tasks downstream of the wing while the plan runs all its kernels.
+Plan values are read back into a new aircraft and compared with the values computed by the scheduler.
+
+Run from the repository root : python -m example.bench_plan
+"""
+
+import numpy as np
+
+from aircraft.airframe.component import owner
+
+from process.scheduler import Scheduler
+from process.plan import Plan
+
+from example.bench_doe import factory, doe
+from example.timing import best_time
+
+
+def max_difference(names, ac1, ac2):
+    """
+    Max relative difference between the attributes of ac1 and ac2
+    """
+    diff = 0.
+    for name in names:
+        slot,attr = name.split(".")
+        a = np.asarray(getattr(owner(ac1, slot), attr), dtype=float)
+        b = np.asarray(getattr(owner(ac2, slot), attr), dtype=float)
+        a = a.reshape(a.shape+(1,)*(b.ndim-a.ndim))     # Values shared by all designs
+        b = b.reshape(b.shape+(1,)*(a.ndim-b.ndim))
+        diff = max(diff, np.nanmax(np.abs(a-b)/np.maximum(np.abs(a), np.finfo(float).tiny), initial=0.))
+    return diff
+
+
+if __name__ == "__main__":
+    n = 100000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+    one = {k:v[0] for k,v in designs.items()}
+
+    print("%-8s %-6s %12s %12s %8s %10s" % ("stab", "size", "scheduler", "plan", "speedup", "max rdiff"))
+    for stab in ["classic", "t_tail", "h_tail"]:
+        for size,design in [("1", one), ("1e5", designs)]:
+            ac = factory(stab_architecture=stab, **design)
+            plan = Plan(ac)
+            scheduler = Scheduler(ac)
+            aspect_ratio = np.asarray(design["aspect_ratio"])
+
+            def run_scheduler():
+                ac.airframe.wing.aspect_ratio = aspect_ratio*1.01
+                scheduler.run()
+
+            def run_plan():
+                plan["wing.aspect_ratio"] = aspect_ratio*1.01
+                plan.run()
+
+            number = 200 if size=="1" else 3
+            t_scheduler = best_time(run_scheduler, number)
+            t_plan = best_time(run_plan, number)
+
+            view = factory(stab_architecture=stab, **design)
+            plan.read_back(view)
+            diff = max_difference(plan.rows, ac, view)
+
+            print("%-8s %-6s %10.1fus %10.1fus %7.1fx %10.1e" % (stab, size, 1e6*t_scheduler, 1e6*t_plan,
+                                                                t_scheduler/t_plan, diff))
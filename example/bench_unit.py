@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Benchmark of unit.convert_from and unit.convert_to on large result tables
+
+Run from the repository root : python -m example.bench_unit
+"""
+
+import numpy as np
+
+import unit
+
+from example.timing import best_time
+
+
+n = 1000000
+altp = np.linspace(0., 12000., n)
+table = {"altp":altp, "range":[altp.copy() for i in range(4)], "time":(altp.copy(),altp.copy())}
+buffer = np.empty(n)
+
+cases = [("convert_to 1e6 array",        lambda: unit.convert_to("ft",altp)),
+         ("convert_to 1e6 array, out",   lambda: unit.convert_to("ft",altp,out=buffer)),
+         ("convert_from 1e6 array, out", lambda: unit.convert_from("ft",buffer,out=buffer)),
+         ("convert_between 1e6 array",   lambda: unit.convert_between("NM","km",altp)),
+         ("convert_to int 1e6 array",    lambda: unit.convert_to("int",altp)),
+         ("convert_to nested dict 7e6",  lambda: unit.convert_to("ft",table))]
+
+for name,fct in cases:
+    print("%-30s %8.2f ms" % (name, 1e3*best_time(fct)))
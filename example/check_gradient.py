@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Check of the complex step derivatives against central finite differences
+
+Derivatives of the converged masses, tail areas and some geometry with respect to the design variables are
+computed with process.gradient.complex_step, the couplings being converged by process.mda.Mda, for one design
+near the wing kink and for a population of 1e3 designs, in one evaluation for all variables. They are compared
+with central finite differences of converged evaluations, one pair of evaluations per variable. Designs where the
+finite differences straddle a branch of the laws (wing kink) are counted and left out of the comparison.
+
+Run from the repository root : python -m example.check_gradient
+"""
+
+import time
+
+import numpy as np
+
+from process.plan import Plan
+from process.mda import Mda
+from process.gradient import complex_step
+
+from example.bench_doe import factory, doe, REFERENCE
+
+
+VARIABLES = ["wing.area", "wing.aspect_ratio", "wing.taper_ratio",
+             "requirement.cruise_mach", "requirement.design_range", "requirement.n_pax_ref"]
+
+OUTPUTS = ["weight_cg.mtow", "weight_cg.mzfw", "wing.mass", "wing.c_root",
+           "horizontal_stab.area", "vertical_stab.area"]
+
+
+def finite_differences(plan, outputs, variables, solve, step=1.e-5):
+    """
+    Central finite differences of the outputs of plan, relative step on each variable
+    Also returns a mask of the designs where forward and backward differences disagree, a branch such as
+    the wing kink lies within the step
+    """
+    grad = {name: [] for name in outputs}
+    jump = False
+    for var in variables:
+        x = plan[var]
+        result = []
+        for dx in [step*x, 0., -step*x]:
+            plan[var] = x + dx
+            solve(plan)
+            result.append([plan[name] for name in outputs])
+        plan[var] = x
+        for name,yp,y0,ym in zip(outputs, *result):
+            grad[name].append((yp-ym)/(2.*step*x))
+            jump = jump | (np.abs((yp-y0)-(y0-ym)) > 1.e-3*np.maximum(np.abs(yp-y0), np.abs(y0-ym))
+                                                    + 1.e-10*np.abs(y0))      # Above convergence noise
+    solve(plan)
+    while np.ndim(jump)>np.ndim(plan["weight_cg.mtow"]):     # Vector outputs
+        jump = np.any(jump, axis=0)
+    return {name: np.moveaxis(np.array(g), 0, -1) for name,g in grad.items()}, jump
+
+
+if __name__ == "__main__":
+    n = 1000
+    rng = np.random.default_rng(0)
+
+    designs = doe(n, rng)
+    one = dict(REFERENCE, cruise_mach=0.6)
+
+    for stab in ["classic", "t_tail", "h_tail"]:
+        print(stab)
+        print("  %-12s %-24s %12s %12s %10s %8s" % ("designs", "output", "cs time", "fd time", "max rdiff", "jumps"))
+        for size,design in [("1", one), ("1e3", designs)]:
+            plan = Plan(factory(stab_architecture=stab, **design))
+            Mda(plan).solve()
+
+            t0 = time.perf_counter()
+            cs = complex_step(plan, OUTPUTS, VARIABLES, solve=lambda cplan: Mda(cplan).solve())
+            t1 = time.perf_counter()
+            fd,jump = finite_differences(plan, OUTPUTS, VARIABLES, solve=lambda plan: Mda(plan, tol=1.e-13).solve())
+            t2 = time.perf_counter()
+
+            for name in OUTPUTS:
+                scale = np.max(np.abs(fd[name]), axis=-1, keepdims=True)     # Per design and output
+                rdiff = np.max(np.where(jump[...,None], 0., np.abs(cs[name]-fd[name])/scale))
+                print("  %-12s %-24s %10.1fms %10.1fms %10.1e %8d" % (size, name, 1e3*(t1-t0), 1e3*(t2-t1), rdiff,
+                                                                     np.sum(jump)))
@@ -12,6 +12,8 @@ from aircraft.root import Aircraft
 
 from aircraft.airframe import component
 
+from process.scheduler import Scheduler
+
 agmt = Arrangement(body_type = "fuselage",          # "fuselage" or "blended"
                    wing_type = "classic",           # "classic" or "blended"
                    wing_attachment = "low",         # "low" or "high"
@@ -76,34 +78,6 @@ def factory(name = "my_plane",
 ac = factory(name = "my_plane", reqs = reqs, agmt = agmt)
 
 
-ac.airframe.cabin.eval_geometry()
-
-ac.airframe.fuselage.eval_geometry()
-
-ac.airframe.wing.eval_geometry()
-
-if (ac.arrangement.stab_architecture=="classic"):
-    ac.airframe.vertical_stab.eval_geometry()
-    ac.airframe.horizontal_stab.eval_geometry()
-elif (ac.arrangement.stab_architecture=="t_tail"):
-    ac.airframe.vertical_stab.eval_geometry()
-    ac.airframe.horizontal_stab.eval_geometry()
-elif (ac.arrangement.stab_architecture=="h_tail"):
-    ac.airframe.horizontal_stab.eval_geometry()
-    ac.airframe.vertical_stab.eval_geometry()
-else:
-    raise Exception("stab_architecture is not supported")
-
-
-
-ac.airframe.cabin.eval_mass()
-
-ac.airframe.fuselage.eval_mass()
-
-ac.airframe.wing.eval_mass()
-
-ac.airframe.vertical_stab.eval_mass()
-
-ac.airframe.horizontal_stab.eval_mass()
-
+scheduler = Scheduler(ac)
 
+scheduler.run()
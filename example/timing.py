@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Timing helper shared by the benchmarks, kept free of any aircraft import
+"""
+
+import timeit
+
+
+def best_time(fct, number=1, repeat=5):
+    """
+    Best time of one call of fct, over repeat runs of number calls
+    """
+    return min(timeit.repeat(fct, number=number, repeat=repeat))/number
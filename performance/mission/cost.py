@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+"""
+
+import numpy as np
+
+import unit
+
+from performance.mission.general import Mission
+
+
+class Cost(Mission):
+    """
+    Cost mission : nominal payload over the typical range flown by the aircraft, which is shorter than the design
+    range, 800 NM up to a design range of 3500 NM, 2000 NM above
+    """
+    def eval(self, range=None, payload=None):
+        """
+        Block fuel and block time of the mission, range and payload can be arrays
+        """
+        requirement = self.aircraft.requirement
+        if range is None:
+            range = np.where(requirement.design_range<=unit.m_NM(3500.), unit.m_NM(800.), unit.m_NM(2000.))[()]
+        if payload is None:
+            payload = self.aircraft.weight_cg.m_pax_nominal*requirement.n_pax_ref
+        self.eval_fuel(range, payload)
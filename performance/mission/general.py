@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+
+Mission engine and data common to all missions
+
+Breguet is the fast mission engine : closed form Breguet cruise at the cruise Mach number and altitude of the
+requirement, corrected for climb and descent, with taxi and reserve fuel (contingency, diversion, holding).
+All inputs and all aircraft values can be numpy arrays, they are broadcast together, so one call evaluates
+missions for arrays of range and payload over a population of designs.
+
+Integrator is the detailed mission engine : mass, distance, altitude and time are integrated along climb, cruise,
+descent, diversion and holding by an adaptive Runge-Kutta scheme, all missions of a call advancing in lockstep.
+"""
+
+import numpy as np
+
+import unit
+import earth
+
+from aircraft.aerodynamic import Polar
+
+
+class Breguet(object):
+    """
+    Closed form mission of an aircraft whose geometry and masses have been evaluated
+    Aircraft data, mission settings and flight conditions are read at construction, build a new engine when
+    they change. Lift to drag ratios come from the polar of the aircraft at the mean mass of each leg.
+
+    Climb and descent are taken as flown over climb_slope and descent_slope ground paths at speed_ratio times
+    the cruise speed : they cost the energy gained in climb at take off weight, minus the energy given back in
+    descent at landing weight, and the cruise drag over their path at lower speed
+    """
+    def __init__(self, aircraft, polar=None):
+        requirement = aircraft.requirement
+        weight_cg = aircraft.weight_cg
+
+        self.polar = Polar(aircraft) if polar is None else polar
+        self.sfc = weight_cg.cruise_sfc
+        self.reserve_ratio = weight_cg.reserve_ratio      # Contingency fuel over mission fuel
+
+        owe = weight_cg.owe
+        if owe is None:     # Not given, same law as the mass loop closure
+            airframe_mass = sum(comp.mass for comp in vars(aircraft.airframe).values() if comp.mass is not None)
+            owe = airframe_mass + weight_cg.other_mass_ratio*weight_cg.mtow
+        self.owe = owe
+        self.mtow = weight_cg.mtow
+        self.mfw = weight_cg.mfw
+
+        self.disa = 0.
+        self.cruise_mach = requirement.cruise_mach
+        self.cruise_altp = requirement.cruise_altp
+        self.diversion_range = unit.m_NM(200.)      # Diversion is flown at cruise Mach number and altitude
+        self.holding_time = unit.s_min(30.)
+        self.holding_mach = 0.35
+        self.holding_altp = unit.m_ft(1500.)
+        self.taxi_time = unit.s_min(16.)            # Taxi out and taxi in
+        self.taxi_fuel = 2.5e-6*self.taxi_time*self.mtow
+        self.climb_slope = 0.04
+        self.descent_slope = 0.05
+        self.speed_ratio = 0.75                     # Mean speed in climb and descent over cruise speed
+        self.lod_tol = 1.e-6                        # Convergence of the lift to drag ratio at the mean cruise mass
+        self.lod_pass_max = 20
+
+        self.segments = None        # Fuel and time of each flight segment, given by integrating engines
+
+        g = earth.gravity()
+        self.vtas,self.cruise_qs = self.condition(self.cruise_mach, self.cruise_altp)
+        self.holding_qs = self.condition(self.holding_mach, self.holding_altp)[1]
+
+        v_cd = self.speed_ratio*self.vtas
+        self.cd_path = self.cruise_altp*(1./self.climb_slope + 1./self.descent_slope)   # Ground path of climb and descent
+        self.cd_time = self.cd_path*(1./v_cd - 1./self.vtas)        # Time over cruise speed on this path
+        self.cd_energy = g*self.sfc*(self.cruise_altp + 0.5*self.vtas**2/g)/v_cd    # Climb energy fuel per kg
+
+    def condition(self, mach, altp):
+        """
+        True air speed and dynamic pressure times wing area of a flight condition
+        """
+        gam = earth.gas_data()[1]
+        pamb,tamb,tstd,dtodz = earth.atmosphere(altp, self.disa)
+        vtas = mach*earth.sound_speed(tamb)
+        return vtas, 0.5*gam*pamb*mach**2*self.polar.wing_area
+
+    def cruise_lod(self, mass):
+        cz = mass*earth.gravity()/self.cruise_qs
+        return self.polar.drag(cz, self.cruise_mach, self.cruise_altp, self.disa)[1]
+
+    def climb_descent(self, lod):
+        """
+        Climb and descent fuel is a*(tow+lw) + b*(tow-lw), lw being the landing weight
+        """
+        a = earth.gravity()*self.sfc*self.cd_time/(2.*lod)
+        return a, self.cd_energy
+
+    def solve_lod(self, lod, legs):
+        """
+        Lift to drag ratio at the mean mass of the cruise, legs(lod) giving mission fuel over landing weight and
+        landing weight. Solved by secant updates, missions out of reach are NaN and do not stop the iterations
+        Missions not converged after lod_pass_max passes are NaN
+        """
+        lod_ = res_ = None
+        for k in range(self.lod_pass_max):
+            kf,lw = legs(lod)
+            res = self.cruise_lod(lw*(1.+0.5*kf)) - lod
+            active = np.abs(res/lod)>self.lod_tol
+            if not np.any(active):
+                break
+            if lod_ is None:
+                step = res
+            else:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    step = np.where(res!=res_, res*(lod-lod_)/(res_-res), res)
+            lod_,res_ = lod,res
+            lod = lod + step
+        return np.where(active, np.nan, lod)[()]
+
+    def reserve(self, zfw):
+        """
+        Holding and diversion fuel, computed backward from the zero fuel weight
+        """
+        g = earth.gravity()
+        cz = zfw*g/self.holding_qs
+        lod = self.polar.drag(cz, self.holding_mach, self.holding_altp, self.disa)[1]
+        fuel_holding = zfw*(np.exp(self.holding_time*g*self.sfc/lod) - 1.)
+
+        mass = zfw + fuel_holding
+        lod = self.cruise_lod(mass)
+        fuel_diversion = mass*(np.exp(self.diversion_range*g*self.sfc/(self.vtas*lod)) - 1.)
+        return fuel_holding + fuel_diversion
+
+    def fuel_from_range(self, range, zfw):
+        """
+        Mission of a given range with a given zero fuel weight
+        Returns take off weight, block fuel, reserve fuel and block time, NaN for missions out of reach
+        """
+        g = earth.gravity()
+        c = self.reserve_ratio
+
+        fuel_reserve = self.reserve(zfw)
+        def legs(lod):
+            kf = np.exp(range*g*self.sfc/(self.vtas*lod)) - 1.     # Mission fuel over landing weight
+            lw = (zfw + fuel_reserve)/(1. - c*kf)
+            return kf, lw
+
+        lod = self.solve_lod(self.cruise_lod(zfw + fuel_reserve), legs)
+        kf,lw = legs(lod)
+
+        a,b = self.climb_descent(lod)
+        tow = lw*(1.+kf+a-b)/(1.-a-b)
+        tow = np.where((c*kf<1.) & (a+b<1.), tow, np.nan)[()]      # Out of reach of the aircraft
+
+        fuel_block = self.taxi_fuel + tow - lw
+        fuel_reserve = fuel_reserve + c*lw*kf
+        time_block = self.taxi_time + range/self.vtas + self.cd_time
+        return tow, fuel_block, fuel_reserve, time_block
+
+    def range_from_tow(self, tow, zfw):
+        """
+        Mission of a given take off weight with a given zero fuel weight
+        Returns range, block fuel, reserve fuel and block time
+        """
+        g = earth.gravity()
+        c = self.reserve_ratio
+
+        fuel_reserve = self.reserve(zfw)
+        def legs(lod):
+            a,b = self.climb_descent(lod)
+            q = tow*(1.-a-b)
+            lw = (zfw + fuel_reserve + c*q)/(1. + c*(1.+a-b))
+            kf = q/lw - 1. - a + b      # Mission fuel over landing weight
+            return kf, lw
+
+        lod = self.solve_lod(self.cruise_lod(0.5*(tow + zfw + fuel_reserve)), legs)
+        kf,lw = legs(lod)
+
+        range = (self.vtas*lod/(g*self.sfc))*np.log(1.+kf)
+        fuel_block = self.taxi_fuel + tow - lw
+        fuel_reserve = fuel_reserve + c*lw*kf
+        time_block = self.taxi_time + range/self.vtas + self.cd_time
+        return range, fuel_block, fuel_reserve, time_block
+
+
+# Dormand-Prince 5(4) scheme, stages of the last row give the 5th order solution, first stage of the next step
+DP_A = [[],
+        [1./5.],
+        [3./40., 9./40.],
+        [44./45., -56./15., 32./9.],
+        [19372./6561., -25360./2187., 64448./6561., -212./729.],
+        [9017./3168., -355./33., 46732./5247., 49./176., -5103./18656.],
+        [35./384., 0., 500./1113., 125./192., -2187./6784., 11./84.]]
+DP_E = [71./57600., 0., -71./16695., 71./1920., -17253./339200., 22./525., -1./40.]      # 5th minus 4th order
+
+
+class Integrator(Breguet):
+    """
+    Mission of an aircraft whose geometry and masses have been evaluated, integrated along its flight path
+    Same data and interface as Breguet, whose results are the first guesses of the shooting on take off weight
+    or range. Thrust balances drag, weight along the path and acceleration, fuel flow is sfc times thrust.
+
+    Climb and descent are flown at climb_slope and descent_slope, Mach number growing linearly with altitude from
+    low_mach at ground level to cruise_mach at cruise_altp. Top of climb is lowered when the range is too short
+    to reach cruise_altp. Diversion climbs to diversion_altp and descends to holding_altp, where holding is flown.
+    Contingency fuel is reserve_ratio times the trip fuel, from take off to landing.
+
+    Each segment integrates the state over a fixed length of one of its variables : altitude in climb and
+    descent, distance in cruise, time in holding. Every mission has its own step over this length, taken
+    in lockstep with the others, rejected steps leave the state unchanged.
+    """
+    def __init__(self, aircraft, polar=None):
+        # Climbs miss the zero lift drag cache at every stage, a small cache is enough for the level segments
+        super(Integrator, self).__init__(aircraft, Polar(aircraft, cache_size=8) if polar is None else polar)
+
+        self.low_mach = 0.35
+        self.diversion_altp = unit.m_ft(20000.)
+        self.idle_ratio = 0.1           # Idle thrust over drag in descent
+
+        self.rtol = 1.e-6               # Integration tolerances on mass, distance, altitude and time
+        self.atol = 1.e-3
+        self.step_init = 0.25           # Over the length of a segment
+        self.step_max = 1000
+        self.shoot_tol = 1.e-5          # Shooting tolerance on the mass at the end of holding, over zfw
+        self.shoot_pass_max = 10
+
+        self.n_step = 0
+
+    def speed_law(self, altp):
+        """
+        Mach number of climb and descent and its derivative with respect to altitude
+        """
+        dmach_dh = (self.cruise_mach - self.low_mach)/self.cruise_altp
+        mach = self.low_mach + dmach_dh*np.minimum(altp, self.cruise_altp)
+        return mach, np.where(altp<=self.cruise_altp, dmach_dh, 0.)
+
+    def flight(self, slope, mach=None):
+        """
+        Time derivatives of mass, distance, altitude and time flying along a path slope
+        Mach number follows the speed law if not given
+        """
+        g = earth.gravity()
+        gam = earth.gas_data()[1]
+        cos = 1./np.sqrt(1.+slope**2)
+        sin = slope*cos
+
+        def law(y):
+            mass,dist,altp,time = y
+            if mach is None:
+                m,dmach_dh = self.speed_law(altp)
+            else:
+                m,dmach_dh = mach,0.
+            pamb,tamb,tstd,dtodz = earth.atmosphere(altp, self.disa)
+            sound = earth.sound_speed(tamb)
+            vtas = m*sound
+            dv_dh = dmach_dh*sound + 0.5*vtas*dtodz/tamb
+            cz = mass*g*cos/(0.5*gam*pamb*m**2*self.polar.wing_area)
+            lod = self.polar.drag(cz, m, altp, self.disa)[1]
+            thrust = mass*g*(cos/lod + sin) + mass*vtas*sin*dv_dh
+            idle = self.idle_ratio*mass*g/lod
+            thrust = 0.5*(thrust + idle + np.sqrt((thrust - idle)**2 + idle**2))    # Smooth max, keeps the order
+            return np.array(np.broadcast_arrays(-self.sfc*thrust, vtas*cos, vtas*sin, 1.))
+        return law
+
+    def integrate(self, law, y, var, length):
+        """
+        Integrate the state y = (mass, distance, altitude, time) over a length of its component var,
+        law giving the time derivatives. Returns the state at the end of the segment
+        Missions not at the end of the segment after step_max steps are NaN, the others are returned
+        """
+        def rate(y):
+            dy = law(y)
+            return dy*(length/dy[var])      # Derivatives over the normalized length
+
+        y = np.array(np.broadcast_arrays(*y, length)[:4], dtype=float)
+        y_end = y[var] + length
+        shape = y.shape[1:]
+        s = np.zeros(shape)
+        h = np.full(shape, self.step_init)
+        done = np.zeros(shape, dtype=bool)
+
+        k = [rate(y)]
+        for n in range(self.step_max):
+            if done.all():
+                break
+            h = np.where(done, 0., np.minimum(h, 1.-s))
+            for a in DP_A[1:]:
+                y_new = y + h*sum(c*kj for c,kj in zip(a,k) if c!=0.)
+                k.append(rate(y_new))
+            err = np.abs(h*sum(c*kj for c,kj in zip(DP_E,k) if c!=0.))/(self.atol + self.rtol*np.abs(y_new))
+            err = np.max(err, axis=0)
+            self.n_step += 1
+
+            accept = ~(err>1.) & ~done      # Missions out of reach are NaN and accepted
+            y = np.where(accept, y_new, y)
+            k = [np.where(accept, k[-1], k[0])]
+            done = done | (accept & ((h>=1.-s) | np.isnan(err)))
+            s = s + np.where(accept, h, 0.)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                h = h*np.clip(0.9*err**(-0.2), 0.2, 5.)
+            h = np.where(np.isnan(h), self.step_init, h)
+        y[var] = y_end      # Exact, the speed law has a kink at cruise altitude
+        return np.where(done, y, np.nan)
+
+    def fly(self, tow, range):
+        """
+        Mission of a given range from a take off weight, then diversion and holding from the landing weight
+        Returns landing weight, mass at the end of holding and fuel and time of each segment
+        """
+        cs,ds = self.climb_slope,self.descent_slope
+        top = np.minimum(self.cruise_altp, range/(1./cs + 1./ds))
+        div_top = self.diversion_altp
+        legs = [("climb", self.flight(cs), 2, top),
+                ("cruise", self.flight(0., self.speed_law(top)[0]), 1, np.maximum(0., range - top*(1./cs + 1./ds))),
+                ("descent", self.flight(-ds), 2, -top),
+                ("diversion", self.flight(cs), 2, div_top),
+                ("diversion", self.flight(0., self.speed_law(div_top)[0]), 1,
+                 self.diversion_range - div_top/cs - (div_top - self.holding_altp)/ds),
+                ("diversion", self.flight(-ds), 2, self.holding_altp - div_top),
+                ("holding", self.flight(0., self.holding_mach), 3, self.holding_time)]
+
+        segments = {"taxi": (self.taxi_fuel, self.taxi_time)}
+        y = (tow, 0., 0., 0.)
+        for name,law,var,length in legs:
+            y_end = self.integrate(law, y, var, length)
+            fuel,time = segments.get(name, (0., 0.))
+            segments[name] = (fuel + y[0] - y_end[0], time + y_end[3] - y[3])
+            if (name=="descent"):
+                lw = y_end[0]
+            y = y_end
+        return lw, y[0], segments
+
+    def shoot(self, x, slope, zfw, fly):
+        """
+        Secant iterations on x so that the mass at the end of holding leaves the contingency fuel over zfw
+        fly(x) gives take off weight and the results of Integrator.fly, slope is a first guess of the derivative
+        Missions not converged after shoot_pass_max flights are NaN, all outputs belong to the last flight
+        """
+        x_ = res_ = None
+        for k in range(self.shoot_pass_max):
+            tow,(lw,mass,segments) = fly(x)
+            res = mass - self.reserve_ratio*(tow - lw) - zfw
+            active = np.abs(res)>self.shoot_tol*zfw     # Converged missions are frozen, secant steps would follow noise
+            if not np.any(active) or k==self.shoot_pass_max-1:
+                break
+            if x_ is None:
+                step = -res/slope
+            else:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    step = np.where(res!=res_, res*(x-x_)/(res_-res), -res/slope)
+            x_,res_ = x,res
+            x = x + np.where(active, step, 0.)
+
+        def converged(v):
+            return np.where(active | np.isnan(res), np.nan, v)[()]     # A flight out of reach gives a NaN residual
+        self.segments = {name:(converged(fuel), converged(time)) for name,(fuel,time) in segments.items()}
+        return converged(x), converged(tow), converged(lw)
+
+    def results(self, tow, lw, zfw):
+        """
+        Block fuel, reserve fuel and block time from the segments of the last mission flown
+        """
+        seg = self.segments
+        fuel_block = self.taxi_fuel + tow - lw
+        time_block = self.taxi_time + seg["climb"][1] + seg["cruise"][1] + seg["descent"][1]
+        return fuel_block, lw - zfw, time_block
+
+    def fuel_from_range(self, range, zfw):
+        """
+        Mission of a given range with a given zero fuel weight
+        Returns take off weight, block fuel, reserve fuel and block time, fuel and time of each segment are
+        left in segments
+        """
+        tow = super(Integrator, self).fuel_from_range(range, zfw)[0]
+        tow,lw = self.shoot(tow, 1., zfw, lambda x: (x, self.fly(x, range)))[1:]
+        return (tow,) + self.results(tow, lw, zfw)
+
+    def range_from_tow(self, tow, zfw):
+        """
+        Mission of a given take off weight with a given zero fuel weight
+        Returns range, block fuel, reserve fuel and block time, fuel and time of each segment are left in segments
+        """
+        range = super(Integrator, self).range_from_tow(tow, zfw)[0]
+        slope = -earth.gravity()*self.sfc*tow/(self.vtas*self.cruise_lod(tow))     # Mass per meter of cruise
+        range,tow,lw = self.shoot(range, slope, zfw, lambda x: (tow, self.fly(tow, x)))
+        return (range,) + self.results(tow, lw, zfw)
+
+
+class Mission(object):
+    """
+    Data of a mission, payload and range or take off weight, and its results
+    The engine is shared by all missions of an aircraft, a Breguet engine is built if none is given
+    """
+    def __init__(self, aircraft, engine=None):
+        self.aircraft = aircraft
+        self.engine = Breguet(aircraft) if engine is None else engine
+
+        self.range = None
+        self.payload = None
+        self.tow = None
+        self.fuel_block = None
+        self.fuel_reserve = None
+        self.fuel_total = None      # Fuel loaded before taxi out
+        self.time_block = None
+        self.segments = None        # Fuel and time of each flight segment, if the engine gives them
+
+    def eval_range(self, tow, payload):
+        self.tow = tow
+        self.payload = payload
+        zfw = self.engine.owe + payload
+        self.range,self.fuel_block,self.fuel_reserve,self.time_block = self.engine.range_from_tow(tow, zfw)
+        self.fuel_total = self.fuel_block + self.fuel_reserve
+        self.segments = self.engine.segments
+
+    def eval_fuel(self, range, payload):
+        self.range = range
+        self.payload = payload
+        zfw = self.engine.owe + payload
+        self.tow,self.fuel_block,self.fuel_reserve,self.time_block = self.engine.fuel_from_range(range, zfw)
+        self.fuel_total = self.fuel_block + self.fuel_reserve
+        self.segments = self.engine.segments
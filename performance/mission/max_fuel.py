@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+"""
+
+from performance.mission.general import Mission
+
+
+class Max_fuel(Mission):
+    """
+    Max fuel mission : take off at mtow with full tanks, payload is what remains
+    """
+    def eval(self):
+        """
+        Range and payload of the mission
+        """
+        engine = self.engine
+        if engine.mfw is None:
+            raise Exception("max_fuel, max fuel weight is not defined")
+        payload = engine.mtow - engine.owe - (engine.mfw - engine.taxi_fuel)
+        self.eval_range(engine.mtow, payload)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+"""
+
+from performance.mission.general import Mission
+
+
+class Max_payload(Mission):
+    """
+    Max payload mission : n_pax_ref passengers with max luggage and freight, take off at mtow
+    """
+    def eval(self, payload=None):
+        """
+        Range and fuel of the mission, payload can be an array
+        """
+        if payload is None:
+            payload = self.aircraft.weight_cg.m_pax_max*self.aircraft.requirement.n_pax_ref
+        self.eval_range(self.engine.mtow, payload)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+"""
+
+from performance.mission.general import Mission
+
+
+class Nominal(Mission):
+    """
+    Nominal mission : n_pax_ref passengers with nominal luggage over the design range
+    """
+    def eval(self, range=None, payload=None):
+        """
+        Fuel and take off weight of the mission, range and payload can be arrays
+        """
+        requirement = self.aircraft.requirement
+        if range is None:
+            range = requirement.design_range
+        if payload is None:
+            payload = self.aircraft.weight_cg.m_pax_nominal*requirement.n_pax_ref
+        self.eval_fuel(range, payload)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Created on Thu Jan 20 20:20:20 2020
+
+@author: DRUOT Thierry
+"""
+
+from performance.mission.general import Mission
+
+
+class Zero_payload(Mission):
+    """
+    Zero payload mission : ferry flight with full tanks
+    """
+    def eval(self):
+        """
+        Range and take off weight of the mission
+        """
+        engine = self.engine
+        if engine.mfw is None:
+            raise Exception("zero_payload, max fuel weight is not defined")
+        self.eval_range(engine.owe + engine.mfw - engine.taxi_fuel, 0.)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Derivatives of a compiled evaluation plan
+
+complex_step gives the exact derivatives of any value of a plan with respect to its variables, free of the
+truncation and cancellation errors of finite differences. The plan is copied on a complex buffer with one column
+per variable, added after the design axes, the variable of column j being shifted by i.h. One evaluation of the
+copy, with its couplings converged by a solver when one is given, then gives all derivatives at once :
+dy/dxj = Im(y[...,j])/h.
+
+Kernels only use analytic operations on the values. Branches (wing kink, max laws, layers of the atmosphere)
+are selected on real parts, so a derivative is the one of the branch taken by the design.
+
+Finite_difference is the forward difference service, for outputs that are not complex safe. The sparsity of the
+Jacobian comes from the component graph compiled in the plan : a variable only changes the outputs of the kernels
+downstream of it, cabin inputs do not change the horizontal stabilizer for example. The pattern holds whatever the
+branches taken by the designs. Variables changing disjoint sets of outputs get the same color and are perturbed in
+the same evaluation, so a gradient costs one evaluation per color instead of one per variable. Evaluations can run
+in a pool of processes, each holding a copy of the plan and reading the values of the gradient from shared memory.
+"""
+
+import copy
+import math
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def check_variables(plan, variables):
+    for name in variables:
+        if name not in plan.variables or isinstance(plan.rows[name], slice):
+            raise Exception("gradient, %s is not a scalar variable of the plan" % name)
+
+
+def complex_plan(plan, n):
+    """
+    Copy of plan on a complex buffer where every design is repeated n times along a new last axis
+    Compiled rows and kernels are shared with plan, which is not modified
+    """
+    cplan = copy.copy(plan)
+    cplan.buffer = np.repeat(plan.buffer[...,None], n, axis=-1).astype(complex)
+    cplan.modified = set()
+    return cplan
+
+
+def complex_step(plan, outputs, variables, solve=None, h=1.e-30):
+    """
+    Derivatives of outputs with respect to variables, lists of "slot.attribute" names of the plan
+    variables must be scalar variables of the plan, solve(cplan) converges the couplings of the complex plan if
+    the outputs depend on them, for example lambda cplan: Mda(cplan).solve()
+    Returns a dict giving for each output an array of the shape of the output plus one last axis of derivatives,
+    in the order of variables
+    """
+    check_variables(plan, variables)
+
+    cplan = complex_plan(plan, len(variables))
+    step = 1j*h*np.eye(len(variables))
+    for j,name in enumerate(variables):
+        cplan[name] = cplan[name] + step[j]
+    cplan.run()
+    if solve is not None:
+        solve(cplan)
+
+    return {name: np.imag(cplan[name])/h for name in outputs}
+
+
+def color_columns(pattern):
+    """
+    Greedy column coloring of a boolean sparsity pattern (outputs, variables), densest columns first
+    Columns of the same color have no common row, returns the list of columns of each color
+    """
+    colors = []
+    rows = []       # Rows covered by each color
+    for j in np.argsort(-np.sum(pattern, axis=0), kind="stable"):
+        for color,covered in zip(colors, rows):
+            if not np.any(covered & pattern[:,j]):
+                color.append(j)
+                covered |= pattern[:,j]
+                break
+        else:
+            colors.append([j])
+            rows.append(pattern[:,j].copy())
+    return [sorted(color) for color in colors]
+
+
+_worker_plan = None     # Copy of the plan held by each process of the pool
+_worker_memory = None   # Shared memory written by the main process
+_worker_buffer = None   # Values of the current gradient, in _worker_memory
+
+def _init_worker(plan, memory_name):
+    global _worker_plan, _worker_memory, _worker_buffer
+    _worker_memory = shared_memory.SharedMemory(memory_name)
+    _worker_plan = plan
+    _worker_buffer = np.ndarray(plan.buffer.shape, plan.buffer.dtype, _worker_memory.buf)
+
+def _evaluate_in_worker(perturbations, outputs):
+    return evaluate(_worker_plan, _worker_buffer, perturbations, outputs)
+
+def evaluate(plan, buffer, perturbations, outputs):
+    """
+    Evaluate plan from the values of buffer with the variables shifted by perturbations, a list of (name, dx)
+    Only the kernels downstream of the perturbed variables run, returns the values of outputs
+    """
+    plan.buffer[...] = buffer
+    plan.modified.clear()
+    for name,dx in perturbations:
+        plan[name] = buffer[plan.rows[name]] + dx
+    plan.run()
+    return [plan[name] for name in outputs]
+
+
+class Finite_difference(object):
+    """
+    Forward difference gradient service of the outputs of a compiled plan with respect to some of its variables
+    n_process > 1 runs the perturbed evaluations in a pool of processes, kept until close is called
+    Each task of the pool costs a process round trip of about 2 ms and a copy of the buffer in the worker, the pool
+    only pays off for large populations, whose evaluations take well above that, with one free core per process.
+    For one design, or on a single core, serial evaluations are faster
+    """
+    def __init__(self, plan, outputs, variables, step=1.e-6, n_process=1, coloring=True):
+        check_variables(plan, variables)
+        self.plan = plan
+        self.outputs = outputs
+        self.variables = variables
+        self.step = step            # Relative to the value of the variable, absolute when the value is zero
+        self.n_process = n_process
+
+        self.pattern = self.sparsity()
+        if coloring:
+            self.colors = color_columns(self.pattern)
+        else:
+            self.colors = [[j] for j in range(len(variables))]
+
+        self.pool = None
+        self.memory = None          # Shared memory holding the values of the gradient for the pool
+        self.n_eval = 0             # Evaluations of the last gradient, one per color
+
+    def sparsity(self):
+        """
+        Boolean pattern (outputs, variables), True where an output is written by a kernel downstream of a variable
+        """
+        pattern = np.zeros((len(self.outputs), len(self.variables)), dtype=bool)
+        for j,var in enumerate(self.variables):
+            written = [rows for k in self.plan.downstream[var] for rows in self.plan.kernels[k][3]]
+            for i,name in enumerate(self.outputs):
+                pattern[i,j] = (name==var or self.plan.rows[name] in written)
+        return pattern
+
+    def gradient(self):
+        """
+        Derivatives of the outputs at the current values of the variables
+        Returns a dict giving for each output an array of the shape of the output plus one last axis of
+        derivatives, in the order of variables, derivatives outside the sparsity pattern are zero
+        """
+        self.plan.run()
+        buffer = self.plan.buffer.copy()
+        base = [self.plan[name] for name in self.outputs]
+
+        dx = []
+        for name in self.variables:
+            x = buffer[self.plan.rows[name]]
+            dx.append(self.step*np.where(x==0., 1., np.abs(x)))
+        tasks = [[(self.variables[j], dx[j]) for j in color] for color in self.colors]
+
+        if (self.n_process>1):
+            if self.pool is None:
+                self.memory = shared_memory.SharedMemory(create=True, size=buffer.nbytes)
+                self.pool = ProcessPoolExecutor(self.n_process, initializer=_init_worker,
+                                                initargs=(self.plan, self.memory.name))
+            np.ndarray(buffer.shape, buffer.dtype, self.memory.buf)[...] = buffer     # Sent once per gradient
+            n = len(tasks)
+            results = list(self.pool.map(_evaluate_in_worker, tasks, [self.outputs]*n,
+                                         chunksize=math.ceil(n/self.n_process)))
+        else:
+            results = [evaluate(self.plan, buffer, task, self.outputs) for task in tasks]
+            self.plan.buffer[...] = buffer      # Back to the unperturbed values
+        self.n_eval = len(tasks)
+
+        grad = {}
+        for i,name in enumerate(self.outputs):
+            columns = [np.zeros(np.shape(base[i]))]*len(self.variables)
+            for color,values in zip(self.colors, results):
+                for j in color:
+                    if self.pattern[i,j]:
+                        columns[j] = (values[i]-base[i])/dx[j]
+            grad[name] = np.moveaxis(np.array(np.broadcast_arrays(*columns)), 0, -1)
+        return grad
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Convergence of the mass loop
+
+Wing geometry and wing mass depend on mtow and mzfw, which in turn depend on the airframe mass through
+Weight_cg.closure. Mass_loop solves r(x) = closure(x) - x = 0, with x = (mtow, mzfw), for all the designs of a
+compiled plan (see process.plan) at once. Available methods are :
+ - "substitution" : x = closure(x), the plain fixed point iteration, kept as reference
+ - "anderson" : Anderson mixing of the last depth iterates, one evaluation per iteration
+ - "newton" : Newton steps with a forward difference Jacobian, three evaluations per iteration
+
+Designs are independent, each one has its own mixing coefficients or Jacobian and stops moving once converged.
+"""
+
+import numpy as np
+
+
+METHODS = ["substitution", "anderson", "newton"]
+
+
+def relative_error(x, r):
+    """
+    Max relative residual over the first axis, design by design
+    With complex values (complex step), the imaginary parts, which carry the derivatives, must converge too :
+    their residual is taken relative to the largest imaginary part of the design, iterate or residual
+    """
+    error = np.max(np.abs(r.real)/np.abs(x.real), axis=0)
+    if np.iscomplexobj(r):
+        imag = np.max(np.abs(r.imag/x.real), axis=0)
+        scale = np.maximum(np.max(np.abs(x.imag/x.real), axis=0), imag)
+        error = np.maximum(error, imag/np.where(scale>0., scale, 1.))
+    return error
+
+
+class Mass_loop(object):
+    """
+    Mass loop solver of the designs held by plan, the converged masses are left in the plan
+    """
+    def __init__(self, plan, method="anderson", depth=2, tol=1.e-9, max_iter=100):
+        if method not in METHODS:
+            raise Exception("mass_loop, method is unknown : "+method)
+        self.plan = plan
+        self.method = method
+        self.depth = depth          # Number of previous iterates mixed by Anderson
+        self.tol = tol              # On the relative residual of each design
+        self.max_iter = max_iter
+
+        self.masses = [name for name in plan.rows if name.endswith(".mass")]     # Airframe component masses
+
+        self.owe = None
+        self.n_eval = 0             # Number of plan evaluations
+        self.n_iter = 0
+        self.history = []           # Max relative residual over all designs, at each iteration
+        self.iterations = None      # Number of iterations of each design
+
+    def value(self, name):
+        if name in self.plan.rows:
+            return self.plan[name]
+        return self.plan.constants[name]
+
+    def residual(self, x):
+        """
+        Evaluate the plan with mtow = x[0] and mzfw = x[1], return closure(x) - x
+        """
+        self.plan["weight_cg.mtow"] = x[0]
+        self.plan["weight_cg.mzfw"] = x[1]
+        self.plan.run()
+        self.n_eval += 1
+
+        airframe_mass = sum(self.value(name) for name in self.masses)
+        owe,mtow,mzfw = self.plan.aircraft.weight_cg.closure(airframe_mass, x[0],
+                                                             self.value("requirement.n_pax_ref"),
+                                                             self.value("requirement.design_range"),
+                                                             self.value("requirement.cruise_mach"),
+                                                             self.value("requirement.cruise_altp"))
+        self.owe = owe
+        return np.array(np.broadcast_arrays(mtow, mzfw)) - x
+
+    def anderson(self, X, R):
+        """
+        New iterate from the last iterates X and their residuals R, lists of (2,...) arrays
+        The mixing coefficients minimize the norm of the combined residual, design by design
+        """
+        x,r = X[-1],R[-1]
+        if (len(X)<2):
+            return x + r
+        dX = np.moveaxis(np.diff(X, axis=0), (0,1), (-1,-2))      # (...,2,m), designs first
+        dR = np.moveaxis(np.diff(R, axis=0), (0,1), (-1,-2))
+        A = np.swapaxes(dR, -1, -2) @ dR
+        b = np.swapaxes(dR, -1, -2) @ np.moveaxis(r, 0, -1)[...,None]
+        A = A + (1.e-12*np.trace(A, axis1=-2, axis2=-1)[...,None,None] + 1.e-300)*np.eye(A.shape[-1])
+        gamma = np.linalg.solve(A, b)
+        step = (dX + dR) @ gamma
+        return x + r - np.moveaxis(step[...,0], -1, 0)
+
+    def newton(self, x, r):
+        """
+        Newton step from x, the Jacobian of the residual is computed by forward differences
+        """
+        J = np.empty(np.shape(np.moveaxis(x, 0, -1))+(2,), dtype=x.dtype)
+        for j in range(2):
+            dx = np.zeros_like(x)
+            dx[j] = 1.e-6*x[j]
+            J[...,:,j] = np.moveaxis((self.residual(x+dx) - r)/dx[j], 0, -1)
+        step = np.linalg.solve(J, np.moveaxis(r, 0, -1)[...,None])[...,0]
+        return x - np.moveaxis(step, -1, 0)
+
+    def solve(self):
+        """
+        Converge mtow and mzfw of all designs, return them
+        Raise if some design is not converged after max_iter iterations
+        """
+        x = np.array(np.broadcast_arrays(self.plan["weight_cg.mtow"], self.plan["weight_cg.mzfw"]),
+                     dtype=self.plan.buffer.dtype)
+        r = self.residual(x)
+        X,R = [x],[r]
+        self.n_eval = 1
+        self.history = []
+        self.iterations = np.zeros(x.shape[1:], dtype=int)
+
+        for k in range(self.max_iter+1):
+            error = relative_error(x, r)
+            self.history.append(np.max(error))
+            converged = error<self.tol
+            if converged.all():
+                break
+            if (k==self.max_iter):
+                raise Exception("mass_loop, %d designs not converged after %d iterations"
+                                % (np.sum(~converged), self.max_iter))
+            self.iterations += ~converged
+
+            if (self.method=="substitution"):
+                x_new = x + r
+            elif (self.method=="anderson"):
+                x_new = self.anderson(X, R)
+            else:
+                x_new = self.newton(x, r)
+
+            x = np.where(converged, x, x_new)      # Converged designs stay where they are
+            r = self.residual(x)
+            X.append(x)
+            R.append(r)
+            del X[:-self.depth-1], R[:-self.depth-1]
+
+        self.n_iter = len(self.history) - 1
+        return x[0][()], x[1][()]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Multidisciplinary analysis of the aircraft couplings
+
+The coupling variables are mtow and mzfw, closed by Weight_cg.closure, and the area of every component having
+a sizing_kernel, the tail areas sized by their volume rule. Wing area drives the tail areas through the wing mac
+and span, tail lever arms come from the geometry, masses feed the wing setting and the engine failure sizing
+of the VTP. Mda solves target(x) = x for all designs of a compiled plan (see process.plan) at once :
+ - "substitution" : x = target(x) for all couplings at the same time, the naive re-iteration
+ - "gauss_seidel" : couplings are updated block after block, each block sees the blocks updated before it
+ - "newton" : Newton steps with a forward difference Jacobian
+
+In Newton mode, the Jacobian is kept from one solve to the next, so the nearby designs of an optimization run
+reuse it as long as the residual keeps decreasing fast enough, otherwise it is computed again. A solve can also
+start from the previous converged state instead of the current values of the plan (warm start).
+"""
+
+import numpy as np
+
+from aircraft.airframe.component import owner
+
+from process.mass_loop import relative_error
+
+
+METHODS = ["substitution", "gauss_seidel", "newton"]
+
+
+class Mda(object):
+    """
+    Coupling solver of the designs held by plan, the converged couplings are left in the plan
+    """
+    def __init__(self, plan, method="newton", tol=1.e-9, max_iter=100, reuse_jacobian=True, rate=0.2):
+        if method not in METHODS:
+            raise Exception("mda, method is unknown : "+method)
+        self.plan = plan
+        self.method = method
+        self.tol = tol                          # On the relative residual of each coupling of each design
+        self.max_iter = max_iter
+        self.reuse_jacobian = reuse_jacobian
+        self.rate = rate        # A reused Jacobian is updated when the residual is not divided by 1/rate at each step
+
+        self.masses = [name for name in plan.rows if name.endswith(".mass")]     # Airframe component masses
+        self.sized = [slot for slot,comp in vars(plan.aircraft.airframe).items() if hasattr(comp, "sizing_kernel")]
+
+        self.couplings = ["weight_cg.mtow", "weight_cg.mzfw"] + [slot+".area" for slot in self.sized]
+        self.blocks = [[2+k] for k in range(len(self.sized))] + [[0,1]]      # Gauss-Seidel order, tails then masses
+
+        self.x = None               # Last converged couplings
+        self.jacobian = None
+        self.last = None            # Couplings last written into the plan
+
+        self.n_eval = 0             # Number of plan evaluations of the last solve
+        self.n_jacobian = 0         # Number of Jacobian computations of the last solve
+        self.n_iter = 0
+        self.history = []           # Max relative residual over all couplings and designs, at each iteration
+
+    def value(self, name):
+        if name in self.plan.rows:
+            return self.plan[name]
+        if name in self.plan.constants:
+            return self.plan.constants[name]
+        slot,attr = name.split(".")
+        return getattr(owner(self.plan.aircraft, slot), attr)
+
+    def target(self, x):
+        """
+        Evaluate the plan with couplings x, return the couplings they imply
+        Only the couplings that changed since the previous evaluation are written in the plan
+        """
+        for k,name in enumerate(self.couplings):
+            if (self.last is None or np.any(x[k]!=self.last[k])):
+                self.plan[name] = x[k]
+        self.last = x.copy()
+        self.plan.run()
+        self.n_eval += 1
+
+        airframe_mass = sum(self.value(name) for name in self.masses)
+        owe,mtow,mzfw = self.plan.aircraft.weight_cg.closure(airframe_mass, x[0],
+                                                             self.value("requirement.n_pax_ref"),
+                                                             self.value("requirement.design_range"),
+                                                             self.value("requirement.cruise_mach"),
+                                                             self.value("requirement.cruise_altp"))
+        areas = []
+        for slot in self.sized:
+            comp = getattr(self.plan.aircraft.airframe, slot)
+            areas.append(comp.sizing_kernel(*[self.value(name) for name in comp.sizing_inputs]))
+        return np.array(np.broadcast_arrays(mtow, mzfw, *areas))
+
+    def error(self, x, r):
+        return relative_error(x, r)
+
+    def compute_jacobian(self, x, r):
+        """
+        Forward difference Jacobian of the residual target(x) - x, one evaluation per coupling
+        """
+        n = len(self.couplings)
+        J = np.empty(np.shape(np.moveaxis(x, 0, -1))+(n,), dtype=x.dtype)
+        for j in range(n):
+            dx = np.zeros_like(x)
+            dx[j] = 1.e-6*x[j]
+            J[...,:,j] = np.moveaxis((self.target(x+dx) - (x+dx) - r)/dx[j], 0, -1)
+        self.n_jacobian += 1
+        return J
+
+    def newton_step(self, x, r):
+        step = np.linalg.solve(self.jacobian, np.moveaxis(r, 0, -1)[...,None])[...,0]
+        return x - np.moveaxis(step, -1, 0)
+
+    def solve(self, warm_start=False):
+        """
+        Converge the couplings of all designs and return them, stacked in the order of self.couplings
+        warm_start starts from the last converged couplings instead of the current values of the plan
+        Raise if some design is not converged after max_iter iterations
+        """
+        if (warm_start and self.x is not None):
+            x = self.x.copy()
+        else:
+            x = np.array(np.broadcast_arrays(*[self.plan[name] for name in self.couplings]),
+                         dtype=self.plan.buffer.dtype)
+        self.last = None
+        self.n_eval = 0
+        self.n_jacobian = 0
+        self.history = []
+        if (not self.reuse_jacobian or self.jacobian is None or self.jacobian.shape[:-2]!=x.shape[1:]):
+            self.jacobian = None
+
+        r = self.target(x) - x
+        for k in range(self.max_iter+1):
+            error = self.error(x, r)
+            self.history.append(np.max(error))
+            converged = error<self.tol
+            if converged.all():
+                break
+            if (k==self.max_iter):
+                raise Exception("mda, %d designs not converged after %d iterations" % (np.sum(~converged), self.max_iter))
+
+            if (self.method=="substitution"):
+                x_new = x + r
+            elif (self.method=="gauss_seidel"):
+                x_new = x.copy()
+                target = x + r
+                for i,block in enumerate(self.blocks):
+                    if (i>0):
+                        target = self.target(x_new)
+                    x_new[block] = target[block]
+            else:
+                if self.jacobian is None:
+                    self.jacobian = self.compute_jacobian(x, r)
+                x_new = self.newton_step(x, r)
+
+            x_new = np.where(converged, x, x_new)      # Converged designs stay where they are
+            r_new = self.target(x_new) - x_new
+
+            if (self.method=="newton" and np.max(self.error(x_new, r_new))>self.rate*self.history[-1]):
+                self.jacobian = None        # Slow convergence, the Jacobian is recomputed at next step
+            x,r = x_new,r_new
+
+        self.n_iter = len(self.history) - 1
+        self.x = x
+        return x
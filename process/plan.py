@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Flat evaluation plan of an aircraft
+
+Plan compiles the components of a configured aircraft into an ordered list of kernel calls over one preallocated
+float buffer. Each "slot.attribute" read or written by a kernel owns fixed rows of the buffer, one for a scalar,
+three for a vector. Plan.run reads the kernel arguments from the buffer and writes their results back into it,
+in the order found by process.scheduler, without any attribute lookup on the aircraft. Like the scheduler, it only
+evaluates the kernels downstream of the variables set since the previous run.
+
+Settings that are not floats, strings such as arrangement.wing_attachment or integers such as wing.hld_type,
+are frozen at compilation.
+When the aircraft holds arrays of N designs, the buffer has shape (n_row, N) and kernels run on rows of N values.
+Values shared by all designs at compilation, such as a common cruise altitude, only use the first column.
+The buffer is complex when some value of the aircraft is complex, kernels then carry complex step derivatives
+(see process.gradient).
+"""
+
+import numpy as np
+
+from aircraft.airframe.component import VECTORS, owner
+
+from process.scheduler import Scheduler
+
+
+class Plan(object):
+    """
+    Compiled evaluation of the geometry and mass of an aircraft
+    The aircraft is evaluated once at compilation, which gives the shape of all values
+    """
+    def __init__(self, aircraft):
+        self.aircraft = aircraft
+
+        self.rows = {}          # Buffer index of each "slot.attribute", rows of a vector are a slice
+        self.constants = {}     # Kernel inputs that are not floats, frozen at compilation
+        self.variables = []     # Inputs that no other task computes, they can be set between runs
+        self.kernels = []       # (task, kernel, inputs, output rows) in evaluation order
+        self.downstream = {}    # Indices of the kernels to evaluate when a variable is set
+        self.buffer = None
+        self.modified = set()   # Variables set since the last run
+
+        self.compile()
+
+    def compile(self):
+        scheduler = Scheduler(self.aircraft)
+        scheduler.run()
+
+        names = []
+        for task in scheduler.order():
+            for name in scheduler.inputs(task):
+                if (scheduler.producer.get(name) in [None,task] and name not in self.variables):
+                    self.variables.append(name)
+            names += [name for name in scheduler.inputs(task)+scheduler.outputs(task) if name not in names]
+
+        values = {}
+        shapes = {}
+        n_row = 0
+        for name in names:
+            value = scheduler.value(name)
+            if isinstance(value, (str, int, np.integer)):
+                self.constants[name] = value
+                continue
+            values[name] = np.asarray(value, dtype=np.result_type(value, float))
+            if name.split(".")[1] in VECTORS:
+                self.rows[name] = slice(n_row, n_row+3)
+                shapes[name] = values[name].shape[1:]
+                n_row += 3
+            else:
+                self.rows[name] = n_row
+                shapes[name] = values[name].shape
+                n_row += 1
+        self.variables = [name for name in self.variables if name in self.rows]
+
+        batch = np.broadcast_shapes(*shapes.values())
+        self.buffer = np.empty((n_row,)+batch, dtype=np.result_type(float, *values.values()))
+        for name,value in values.items():
+            if (len(batch)>0 and shapes[name]==()):
+                self.rows[name] = (self.rows[name],)+(0,)*len(batch)     # Shared by all designs
+            self.buffer[self.rows[name]] = value
+
+        self.kernels = []
+        for task in scheduler.order():
+            slot,step = task
+            kernel = getattr(scheduler.slots[slot], step+"_kernel")
+            inputs = [(self.rows.get(name), self.constants.get(name)) for name in scheduler.inputs(task)]
+            outputs = [self.rows[name] for name in scheduler.outputs(task)]
+            self.kernels.append((task, kernel, inputs, outputs))
+
+        for name in self.variables:
+            dirty = set()
+            for task in scheduler.order():
+                if (name in scheduler.inputs(task) or len(scheduler.depends[task] & dirty)>0):
+                    dirty.add(task)
+            self.downstream[name] = {k for k,kernel in enumerate(self.kernels) if kernel[0] in dirty}
+
+    def __getitem__(self, name):
+        return np.array(self.buffer[self.rows[name]])[()]
+
+    def __setitem__(self, name, value):
+        if name not in self.variables:
+            raise Exception("plan, %s is not a variable of the plan" % name)
+        rows = self.rows[name]
+        if (isinstance(rows, tuple) and np.ndim(value)>np.ndim(self.buffer[rows])):
+            raise Exception("plan, %s is shared by all designs, it cannot be set per design" % name)
+        if (isinstance(rows, slice) and np.ndim(value)<self.buffer.ndim):
+            value = np.reshape(value, (3,)+(1,)*(self.buffer.ndim-1))     # Same vector for all designs
+        self.buffer[rows] = value
+        self.modified.add(name)
+
+    def run(self, full=False):
+        """
+        Evaluate in order the kernels downstream of the modified variables, or all kernels if full is True
+        """
+        if full:
+            dirty = range(len(self.kernels))
+        else:
+            dirty = set().union(*[self.downstream[name] for name in self.modified])
+        self.modified.clear()
+
+        buffer = self.buffer
+        for k in sorted(dirty):
+            task,kernel,inputs,outputs = self.kernels[k]
+            results = kernel(*[constant if rows is None else buffer[rows] for rows,constant in inputs])
+            for rows,value in zip(outputs, results):
+                if (np.ndim(value)==1 and isinstance(rows, (slice, tuple))):
+                    ndim = buffer[rows].ndim
+                    if (ndim>1):
+                        value = np.reshape(value, (3,)+(1,)*(ndim-1))     # Constant vector
+                buffer[rows] = value
+
+    def read_back(self, aircraft=None):
+        """
+        Copy the values of the buffer into the attributes of aircraft, the compiled aircraft by default
+        """
+        if aircraft is None:
+            aircraft = self.aircraft
+        for name,rows in self.rows.items():
+            slot,attr = name.split(".")
+            setattr(owner(aircraft, slot), attr, np.array(self.buffer[rows])[()])
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Evaluation scheduler of airframe components
+
+Each component of aircraft.airframe declares the attributes read and written by its geometry and mass kernels
+(see component.Component). The scheduler links every input to the task producing it, sorts the tasks
+in topological order and groups them in levels of independent tasks that can be evaluated concurrently.
+
+Components record the names of their modified attributes, so after a first full run, Scheduler.run only
+evaluates the tasks reading an attribute modified since the previous run and the tasks downstream of them.
+Inputs held by top level objects of the aircraft (requirement, weight_cg...) do not record their changes,
+their values are kept at the end of each run and compared at the next one.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from aircraft.airframe.component import Component, owner
+
+
+STEPS = ["geometry", "mass"]
+
+
+def is_unset(value):
+    """
+    True if value has not been computed yet : None, or an array filled with None or NaN
+    """
+    if value is None:
+        return True
+    if isinstance(value, np.ndarray) and value.size>0:
+        if value.dtype==object:
+            return all(v is None for v in value.flat)
+        if value.dtype.kind in "fc":
+            return bool(np.isnan(value).all())
+    return False
+
+
+def snapshot(value):
+    """
+    Copy of value kept to detect later changes, arrays can be modified in place
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
+def same_value(value, kept):
+    """
+    True if value equals kept, NaN equal to NaN
+    """
+    if value is kept:
+        return True
+    try:
+        return bool(np.array_equal(value, kept, equal_nan=True))
+    except TypeError:       # Strings or objects, NaN does not apply
+        return bool(np.array_equal(value, kept))
+
+
+class Scheduler(object):
+    """
+    Evaluate the components of an aircraft in an order that respects their declared inputs and outputs
+    Tasks are (slot, step) couples, slot is the name of a component in aircraft.airframe, step is "geometry" or "mass"
+    """
+    def __init__(self, aircraft, n_thread=1, evaluated=False):
+        """
+        evaluated tells that the aircraft is already fully evaluated, for example a clone of an evaluated aircraft,
+        then the first run only evaluates the tasks downstream of the attributes modified since the cloning
+        evaluated can also be the evaluated aircraft the clone was made from, inputs held by top level objects are
+        then compared with its values, otherwise with their values when the scheduler is built
+        """
+        self.aircraft = aircraft
+        self.n_thread = n_thread
+
+        self.slots = {}         # Components by slot name
+        self.producer = {}      # Task producing each "slot.attribute"
+        self.depends = {}       # Tasks that each task depends on
+        self.levels = []        # Groups of independent tasks, in evaluation order
+        self.external = {}      # Values of the inputs held by top level objects at the last run
+
+        self.evaluated = evaluated is not False     # True once all tasks have been evaluated
+        self.hits = 0           # Number of task evaluations skipped because their inputs did not change
+        self.misses = 0         # Number of task evaluations done
+
+        self.build()
+        if evaluated is True:
+            self.record_external(aircraft)
+        elif evaluated is not False:
+            self.record_external(evaluated)
+
+    def components(self):
+        return {slot:comp for slot,comp in vars(self.aircraft.airframe).items() if isinstance(comp, Component)}
+
+    def inputs(self, task):
+        slot,step = task
+        return getattr(self.slots[slot], step+"_inputs")
+
+    def outputs(self, task):
+        slot,step = task
+        return getattr(self.slots[slot], step+"_outputs")
+
+    def value(self, name):
+        slot,attr = name.split(".")
+        if slot in self.slots:
+            return getattr(self.slots[slot], attr, None)
+        return getattr(owner(self.aircraft, slot), attr, None)
+
+    def build(self):
+        """
+        Link inputs to producers and sort tasks by levels, raise if the graph is inconsistent
+        """
+        self.slots = self.components()
+        tasks = [(slot,step) for slot in self.slots for step in STEPS]
+
+        self.producer = {}
+        for task in tasks:
+            for name in self.outputs(task):
+                if name in self.producer:
+                    raise Exception("scheduler, %s is computed by both %s and %s" % (name, self.producer[name], task))
+                self.producer[name] = task
+
+        self.depends = {}
+        for task in tasks:
+            slot,step = task
+            self.depends[task] = set()
+            if (step=="mass"):
+                self.depends[task].add((slot,"geometry"))       # Mass always comes after geometry
+            for name in self.inputs(task):
+                if name in self.producer:
+                    if self.producer[name]!=task:
+                        self.depends[task].add(self.producer[name])
+                elif is_unset(self.value(name)):
+                    raise Exception("scheduler, %s needed by %s is not set and no component computes it" % (name, task))
+
+        self.levels = []
+        done = set()
+        while len(done)<len(tasks):
+            level = [task for task in tasks if task not in done and self.depends[task]<=done]
+            if (len(level)==0):
+                cycle = [task for task in tasks if task not in done]
+                raise Exception("scheduler, dependency cycle, tasks that cannot be ordered : %s" % cycle)
+            self.levels.append(level)
+            done.update(level)
+
+    def external_inputs(self):
+        """
+        Declared inputs held by top level objects of the aircraft, for example requirement.cruise_mach
+        """
+        return {name for task in self.depends for name in self.inputs(task) if name.split(".")[0] not in self.slots}
+
+    def record_external(self, aircraft):
+        self.external = {}
+        for name in self.external_inputs():
+            slot,attr = name.split(".")
+            self.external[name] = snapshot(getattr(owner(aircraft, slot), attr, None))
+
+    def invalidate(self):
+        """
+        Force the evaluation of all tasks at next run
+        Needed when data that no task declares as input is modified
+        """
+        self.evaluated = False
+
+    def dirty_tasks(self):
+        """
+        Tasks reading an attribute modified since the last run and all the tasks downstream of them
+        A modified attribute is read by the tasks declaring it as input and by the tasks of its own component
+        Inputs held by top level objects are modified when their value differs from the one of the last run
+        """
+        if not self.evaluated:
+            return set(self.order())
+        dirty = set()
+        for name,kept in self.external.items():
+            if not same_value(self.value(name), kept):
+                dirty.update(task for task in self.depends if name in self.inputs(task))
+        for slot,comp in self.slots.items():
+            if (len(comp.modified)>0):
+                dirty.add((slot,"geometry"))
+                for attr in comp.modified:
+                    name = slot+"."+attr
+                    dirty.update(task for task in self.depends if name in self.inputs(task))
+        for task in self.order():
+            if (len(self.depends[task] & dirty)>0):
+                dirty.add(task)
+        return dirty
+
+    def order(self):
+        """
+        Tasks in evaluation order
+        """
+        return [task for level in self.levels for task in level]
+
+    def run_task(self, task):
+        slot,step = task
+        for name in self.inputs(task):
+            if self.producer.get(name)!=task and is_unset(self.value(name)):     # Inputs computed by the task itself may be unset
+                raise Exception("scheduler, %s is evaluated before its input %s is computed" % (task, name))
+        getattr(self.slots[slot], "eval_"+step)()
+        for name in self.outputs(task):
+            if is_unset(self.value(name)):
+                raise Exception("scheduler, %s did not compute its declared output %s" % (task, name))
+
+    def run(self):
+        """
+        Evaluate tasks whose inputs changed since the last run, all of them at first run
+        Tasks of the same level run concurrently when n_thread is more than 1
+        If a task raises, the next run evaluates all tasks again
+        """
+        if (self.components()!=self.slots):     # A component has been added or replaced
+            self.build()
+            self.evaluated = False
+
+        dirty = self.dirty_tasks()
+        for comp in self.slots.values():
+            comp.modified.clear()
+
+        try:
+            if (self.n_thread<=1):
+                for task in self.order():
+                    if task in dirty:
+                        self.run_task(task)
+            else:
+                with ThreadPoolExecutor(self.n_thread) as executor:
+                    for level in self.levels:
+                        list(executor.map(self.run_task, [task for task in level if task in dirty]))    # list() raises task exceptions
+        except Exception:
+            self.evaluated = False      # Modified attributes are forgotten, next run evaluates all tasks
+            raise
+
+        for comp in self.slots.values():
+            comp.modified.clear()       # Attributes set by the tasks themselves
+        self.record_external(self.aircraft)
+
+        self.hits += len(self.depends) - len(dirty)
+        self.misses += len(dirty)
+        self.evaluated = True
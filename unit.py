@@ -8,7 +8,6 @@ Created on Thu Jan 24 23:22:21 2019
 """
 
 import numpy
-from copy import deepcopy
 
       
 def s_min(min): return min*60.   # Translate minutes into seconds
@@ -76,9 +75,22 @@ def smart_round(X, S):
 #	Generic unit converter
 #
 #=========================================================================
-UNIT = {}
-
-# dim = "Distance"
+class Unit_dict(dict):
+    """
+    Factors from unit labels to standard unit, labels are registered with the dimension in UNIT.dim
+    """
+    def __init__(self):
+        super().__init__()
+        self.dim = None
+        self.dimension = {}
+
+    def __setitem__(self, ulab, factor):
+        super().__setitem__(ulab, factor)
+        self.dimension[ulab] = self.dim
+
+UNIT = Unit_dict()
+
+UNIT.dim = "Distance"
 UNIT["m"] = 1.
 UNIT["cm"] = 0.01
 UNIT["mm"] = 0.001
@@ -88,25 +100,25 @@ UNIT["km"] = 1000.
 UNIT["ft"] = 0.3048
 UNIT["NM"] = 1852.
 
-# dim = "YearlyDistance"
+UNIT.dim = "YearlyDistance"
 UNIT["km/year"] = 1.
 UNIT["1e12.km/year"] = 1.e-12
 
-# dim = "Area"
+UNIT.dim = "Area"
 UNIT["m2"] = 1.
 UNIT["cm2"] = 0.0001
 UNIT["ft2"] = 0.0929030
 UNIT["inch2"] = 0.00064516
 UNIT["in2"] = 0.00064516
 
-# dim = "Duration"
+UNIT.dim = "Duration"
 UNIT["s"] = 1.
 UNIT["min"] = 60.
 UNIT["h"] = 3600.
 UNIT["an"] = 31557600.
 UNIT["year"] = 31557600.
 
-# dim = "Velocity"
+UNIT.dim = "Velocity"
 UNIT["m/s"] = 1.
 UNIT["ft/s"] = 0.3048
 UNIT["ft/min"] = 0.00508
@@ -114,13 +126,13 @@ UNIT["km/h"] = 0.2777777778
 UNIT["kt"] = 0.5144444444
 UNIT["mph"] = 0.4469444
 
-# dim = "Acceleration"
+UNIT.dim = "Acceleration"
 UNIT["m/s2"] = 1.
 UNIT["km/s2"] = 1000.
 UNIT["ft/s2"] = 0.3048
 UNIT["kt/s"] = 0.5144444444
 
-# dim = "AbsoluteTemperature"
+UNIT.dim = "AbsoluteTemperature"
 UNIT["KELVIN"] = 1.
 UNIT["Kelvin"] = 1.
 UNIT["K"] = 1.
@@ -128,72 +140,72 @@ UNIT["RANKINE"] = 0.5555556
 UNIT["Rankine"] = 0.5555556
 UNIT["R"] = 0.5555556
 
-# dim = "AbsoluteTemperatureinCelsius"
+UNIT.dim = "AbsoluteTemperatureinCelsius"
 UNIT["CELSIUS"] = 1.
 UNIT["Celsius"] = 1.
 UNIT["C"] = 1.
 
-# dim = "DeltaofTemperature"
+UNIT.dim = "DeltaofTemperature"
 UNIT["degK"] = 1.
 UNIT["degC"] = 1.
 UNIT["degF"] = 0.5555556
 UNIT["degR"] = 0.5555556
 
-# dim = "Temparaturevariationrate"
+UNIT.dim = "Temparaturevariationrate"
 UNIT["degK/s"] = 1.
 UNIT["degF/s"] = 0.5555556
 
-# dim = "Temparaturegradiant"
+UNIT.dim = "Temparaturegradiant"
 UNIT["degK/m"] = 1.
 UNIT["degK/km"] = 0.001
 UNIT["degF/m"] = 0.5555556
 UNIT["degF/km"] = 5.555556e-4
 
-# dim = "DeciBell"
+UNIT.dim = "DeciBell"
 UNIT["dB"] = 1.
 
-# dim = "EffectivePerceivedDeciBell"
+UNIT.dim = "EffectivePerceivedDeciBell"
 UNIT["EPNdB"] = 1.
 
-# dim = "Mass"
+UNIT.dim = "Mass"
 UNIT["kg"] = 1.
 UNIT["g"] = 0.001
 UNIT["lb"] = 0.4535924
 UNIT["lbm"] = 0.4535924
 UNIT["t"] = 1000.
 
-# dim = "MassIndex"
+UNIT.dim = "MassIndex"
 UNIT["g/kg"] = 1.
 
-# dim = "MasstoForceratio"
+UNIT.dim = "MasstoForceratio"
 UNIT["kg/N"] = 1.
 UNIT["g/N"] = 0.001
 UNIT["g/kN"] = 0.000001
 
-# dim = "MassperSeat"
+UNIT.dim = "MassperSeat"
 UNIT["kg/seat"] = 1.
 UNIT["g/seat"] = 0.001
 
-# dim = "MassperSeatandperDistance"
+UNIT.dim = "MassperSeatandperDistance"
 UNIT["kg/m/seat"] = 1.
 UNIT["kg/NM/seat"] = 0.000540
 
-# dim = "SpecificConsumptionvsThrust"
+UNIT.dim = "SpecificConsumptionvsThrust"
 UNIT["kg/N/s"] = 1.
 UNIT["kg/daN/h"] = 2.77778e-05
 UNIT["lb/lbf/h"] = 0.000028327
 
-# dim = "SpecificEnergyConsumption"
+UNIT.dim = "SpecificEnergyConsumption"
 UNIT["J/N/s"] = 1.
 UNIT["kJ/daN/h"] = 1.e3
 UNIT["MJ/lbf/h"] = 1.e6
 
-# dim = "SpecificConsumptionvsPower"
+UNIT.dim = "SpecificConsumptionvsPower"
 UNIT["kg/W/s"] = 1.
 UNIT["kg/kW/h"] = 2.77778e-07
 UNIT["lb/shp/h"] = 1.68969e-07
 
-# dim = "Force"
+UNIT.dim = "Force"
 UNIT["N"] = 1.
 UNIT["kN"] = 1000.
 UNIT["lbf"] = 4.4482198
@@ -201,7 +213,7 @@ UNIT["klbf"] = 4448.2198
 UNIT["daN"] = 10.
 UNIT["kgf"] = 9.8066502
 
-# dim = "Pressure"
+UNIT.dim = "Pressure"
 UNIT["Pa"] = 1.
 UNIT["kPa"] = 1000.
 UNIT["MPa"] = 1000000.
@@ -213,36 +225,36 @@ UNIT["psi"] = 6895.
 UNIT["N/m2"] = 1.
 UNIT["daN/m2"] = 10.
 
-# dim = "Pressurevariationrate"
+UNIT.dim = "Pressurevariationrate"
 UNIT["Pa/s"] = 1.
 UNIT["atm/s"] = 101325.
 UNIT["bar/s"] = 100000.
 
-# dim = "VolumetricMass"
+UNIT.dim = "VolumetricMass"
 UNIT["kg/m3"] = 1.
 UNIT["kg/l"] = 1000.
 UNIT["lb/ft3"] = 16.018499
 
-# dim = "MassSensitivity"
+UNIT.dim = "MassSensitivity"
 UNIT["1/kg"] = 1.
 UNIT["%/kg"] = 0.01
 UNIT["%/ton"] = 0.01 * 0.001
 
-# dim = "VolumetricMassFlow"
+UNIT.dim = "VolumetricMassFlow"
 UNIT["kg/m3/s"] = 1.
 UNIT["lb/ft3/s"] = 16.018499
 
-# dim = "StandardUnit"
+UNIT.dim = "StandardUnit"
 UNIT["si"] = 1.
 UNIT["std"] = 1.
 UNIT["uc"] = 1.
 UNIT["cu"] = 1.
 
-# dim = "Angle"
+UNIT.dim = "Angle"
 UNIT["rad"] = 1.
 UNIT["deg"] = 0.0174533
 
-# dim = "Volume"
+UNIT.dim = "Volume"
 UNIT["m3"] = 1.
 UNIT["dm3"] = 0.001
 UNIT["cm3"] = 0.000001
@@ -251,7 +263,7 @@ UNIT["litre"] = 0.001
 UNIT["l"] = 0.001
 UNIT["ft3"] = 0.0283168
 
-# dim = "VolumeFlow"
+UNIT.dim = "VolumeFlow"
 UNIT["m3/s"] = 1.
 UNIT["litre/s"] = 0.001
 UNIT["l/s"] = 0.001
@@ -265,27 +277,27 @@ UNIT["litre/h"] = 3.6
 UNIT["l/h"] = 3.6
 UNIT["ft3/h"] = 101.94048
 
-# dim = "VolumeCoefficient"
+UNIT.dim = "VolumeCoefficient"
 UNIT["m2/kN"] = 1.
 
-# dim = "MachNumber"
+UNIT.dim = "MachNumber"
 UNIT["Mach"] = 1.
 UNIT["mach"] = 1.
 
-# dim = "DragCount"
+UNIT.dim = "DragCount"
 UNIT["cx"] = 1.
 UNIT["dc"] = 0.0001
 
-# dim = "DragSensitivity"
+UNIT.dim = "DragSensitivity"
 UNIT["1/cx"] = 1.
 UNIT["%/cx"] = 0.01
 UNIT["%/dc"] = 0.01 * 10000.
 
-# dim = "MachNumbervariationrate"
+UNIT.dim = "MachNumbervariationrate"
 UNIT["Mach/s"] = 1.
 UNIT["mach/s"] = 1.
 
-# dim = "MassFlow"
+UNIT.dim = "MassFlow"
 UNIT["kg/s"] = 1.
 UNIT["kg/h"] = 0.0002778
 UNIT["lb/s"] = 0.4535924
@@ -293,7 +305,7 @@ UNIT["kg/min"] = 0.0166667
 UNIT["lb/min"] = 0.00756
 UNIT["lb/h"] = 0.000126
 
-# dim = "Power"
+UNIT.dim = "Power"
 UNIT["Watt"] = 1.
 UNIT["W"] = 1.
 UNIT["kW"] = 1.e3
@@ -302,62 +314,62 @@ UNIT["GW"] = 1.e9
 UNIT["TW"] = 1.e12
 UNIT["shp"] = 745.70001
 
-# dim = "PowerDensity"
+UNIT.dim = "PowerDensity"
 UNIT["W/kg"] = 1.
 UNIT["kW/kg"] = 1.e3
 
-# dim = "PowerDensityPerTime"
+UNIT.dim = "PowerDensityPerTime"
 UNIT["kW/daN/h"] = 1 / 36.
 
-# dim = "Euro"
+UNIT.dim = "Euro"
 UNIT["E"] = 1.
 UNIT["Ec."] = 0.01
 UNIT["kE"] = 1000.
 UNIT["ME"] = 1000000.
 
-# dim = "Cost"
+UNIT.dim = "Cost"
 UNIT["$"] = 1.
 UNIT["$c."] = 0.01
 UNIT["k$"] = 1000.
 UNIT["M$"] = 1000000.
 
-# dim = "HourlyCost"
+UNIT.dim = "HourlyCost"
 UNIT["$/h"] = 1.
 
-# dim = "Utilisation"
+UNIT.dim = "Utilisation"
 UNIT["trip/year"] = 1.
 
-# dim = "TripCost"
+UNIT.dim = "TripCost"
 UNIT["$/vol"] = 1.
 UNIT["$/trip"] = 1.
 
-# dim = "CosttoDistanceratio"
+UNIT.dim = "CosttoDistanceratio"
 UNIT["$/km"] = 1.
 UNIT["$/NM"] = 0.5399568
 
-# dim = "CostDistancePax"
+UNIT.dim = "CostDistancePax"
 UNIT["$/km/pax"] = 1.
 UNIT["$/NM/pax"] = 0.5399568
 
-# dim = "Lineic"
+UNIT.dim = "Lineic"
 UNIT["1/m"] = 1.
 
-# dim = "Viscosity"
+UNIT.dim = "Viscosity"
 UNIT["Poises"] = 1.
 UNIT["Pl.10e6"] = 0.000001
 
-# dim = "SpecificCost"
+UNIT.dim = "SpecificCost"
 UNIT["$/pax/km"] = 1.
 UNIT["$/pax/NM"] = 0.5399568
 
-# dim = "InverseAnglular"
+UNIT.dim = "InverseAnglular"
 UNIT["1/rad"] = 1.
 UNIT["1/deg"] = 57.29578
 
-# dim = "InversesquaredAngular"
+UNIT.dim = "InversesquaredAngular"
 UNIT["1/rad2"] = 1.
 
-# dim = "MassicDistance"
+UNIT.dim = "MassicDistance"
 UNIT["m/kg"] = 1.
 UNIT["km/t"] = 1.
 UNIT["km/kg"] = 1000.
@@ -365,40 +377,40 @@ UNIT["NM/t"] = 1.852
 UNIT["NM/kg"] = 1852.
 UNIT["NM/lb"] = 4082.8923
 
-# dim = "EnergeticDistance"
+UNIT.dim = "EnergeticDistance"
 UNIT["m/J"] = 1.
 UNIT["km/kWh"] = 3600.
 
-# dim = "SurfacicMass"
+UNIT.dim = "SurfacicMass"
 UNIT["kg/m2"] = 1.
 UNIT["lb/ft2"] = 4.8825102
 
-# dim = "LineicMass"
+UNIT.dim = "LineicMass"
 UNIT["kg/m"] = 1.
 UNIT["kg/km"] = 0.001
 UNIT["lb/m"] = 0.4535924
 
-# dim = "Momentum"
+UNIT.dim = "Momentum"
 UNIT["N.m"] = 1.
 UNIT["daN.m"] = 10.
 UNIT["kgf.m"] = 9.8066502
 UNIT["lbf.ft"] = 1.3558174
 
-# dim = "InertiaMomentum"
+UNIT.dim = "InertiaMomentum"
 UNIT["kg.m2"] = 1.
 UNIT["lb.m2"] = 0.4535924
 
-# dim = "AngularVelocity"
+UNIT.dim = "AngularVelocity"
 UNIT["rad/s"] = 1.
 UNIT["deg/s"] = 0.0174533
 UNIT["rpm"] = 0.1047198
 
-# dim = "AngularAcceleration"
+UNIT.dim = "AngularAcceleration"
 UNIT["rad/s2"] = 1.
 UNIT["deg/s2"] = 0.0174533
 UNIT["rpm/s"] = 0.1047198
 
-# dim = "Energy"
+UNIT.dim = "Energy"
 UNIT["J"] = 1.
 UNIT["kJ"] = 1.e3
 UNIT["MJ"] = 1.e6
@@ -410,7 +422,7 @@ UNIT["MWh"] = 3600.e6
 UNIT["GWh"] = 3600.e9
 UNIT["TWh"] = 3600.e12
 
-# dim = "EnergyDensity"
+UNIT.dim = "EnergyDensity"
 UNIT["J/kg"] = 1.
 UNIT["kJ/kg"] = 1.e3
 UNIT["MJ/kg"] = 1.e6
@@ -421,38 +433,33 @@ UNIT["kWh/kg"] = 3600.e3
 UNIT["MWh/kg"] = 3600.e6
 UNIT["GWh/kg"] = 3600.e9
 UNIT["TWh/kg"] = 3600.e12
-
-# dim = "MassicEnergy"
-UNIT["J/kg"] = 1.
-UNIT["kJ/kg"] = 1000.
-UNIT["MJ/kg"] = 1000000.
 UNIT["btu/lb"] = 2325.9612
 
-# dim = "FuelCost"
+UNIT.dim = "FuelCost"
 UNIT["$/l"] = 1.
 UNIT["$/gal"] = 0.264173
 UNIT["$/USgal"] = 0.264173
 UNIT["$/USbrl"] = 0.00838644
 
-# dim = "BatteryMassCost"
+UNIT.dim = "BatteryMassCost"
 UNIT["$/kg"] = 1.
 
-# dim = "BatteryEnergyCost"
+UNIT.dim = "BatteryEnergyCost"
 UNIT["$/kWh"] = 1. / UNIT['kWh']
 
-# dim = "nodimension"
+UNIT.dim = "nodimension"
 UNIT["sd"] = 1
 UNIT["no_dim"] = 1
 UNIT["%"] = 0.01
 UNIT["%/%"] = 1.
 
-# dim = "integer"
+UNIT.dim = "integer"
 UNIT["integer"] = 1
 UNIT["int"] = 1
 UNIT["entier"] = 1
 UNIT["numeric"] = 1
 
-# dim = "variouscounts"
+UNIT.dim = "variouscounts"
 UNIT["aircraft"] = 1
 UNIT["engine"] = 1
 UNIT["pilot"] = 1
@@ -463,80 +470,130 @@ UNIT["seat"] = 1
 UNIT["door"] = 1
 UNIT["wheel"] = 1
 
-# dim = "string"
+UNIT.dim = "string"
 UNIT["string"] = 1
 UNIT["text"] = 1
 
-# dim = "textdate"
+UNIT.dim = "textdate"
 UNIT["text_date"] = 1
 
-# dim = "GlobalWarmingEnergy"
+UNIT.dim = "GlobalWarmingEnergy"
 UNIT["W/m2/km/year"] = 1.
 UNIT["1e-6.W/m2/km/year"] = 1.e-6
 UNIT["1e-12.W/m2/km/year"] = 1.e-12
 
-# dim = "SpecificMassicEmission"
+UNIT.dim = "SpecificMassicEmission"
 UNIT["g/seat/m"] = 1.
 UNIT["g/seat/km"] = 0.001
 
-# dim = "SpecificVolumicConsumption"
+UNIT.dim = "SpecificVolumicConsumption"
 UNIT["m3/seat/m"] = 1.
 UNIT["l/seat/100km"] = 0.01
 
-# dim = "CO2metric"
+UNIT.dim = "CO2metric"
 UNIT["kg/m/m^0.48"] = 1.
 UNIT["kg/km/m^0.48"] = 0.001
 UNIT["kg/km/m0.48"] = 0.001
 UNIT["kg/NM/m^0.48"] = 1./1852.
 
-# dim = "GlobalWarmingTemperature"
+UNIT.dim = "GlobalWarmingTemperature"
 UNIT["K/m2/km/year"] = 1.
 UNIT["1e-6.K/m2/km/year"] = 1.e-6
 UNIT["1e-12.K/m2/km/year"] = 1.e-12
 
-# dim = "DataStructure"
+UNIT.dim = "DataStructure"
 UNIT["structure"] = 1
 UNIT["dict"] = 1
 UNIT["array"] = 1
 
 
+UNIT.dim = None
+
+INTEGER = [ulab for ulab,dim in UNIT.dimension.items() if dim=="integer"]
+
+
 # Conversion functions
 #-------------------------------------------------------------------------
-def convert_from(ulab, val):
+def convert_from(ulab, val, out=None):
     # Convert val expressed in ulab to corresponding standard unit
+    # Numeric arrays are converted with one multiplication, into out if given, out=val converts in place
+    # Lists, tuples and dicts are converted recursively into new containers of the same type
     if isinstance(val, (type(None), str)):
         return val
+    if isinstance(val, numpy.ndarray) and val.dtype!=object:
+        return numpy.multiply(val, UNIT[ulab], out=out)
+    if isinstance(val, numpy.ndarray):
+        return numpy.array([convert_from(ulab, v) for v in val])
     if isinstance(val, list):
         return [convert_from(ulab, v) for v in val]
     if isinstance(val, tuple):
-        return (convert_from(ulab, v) for v in val)
-    if isinstance(val, numpy.ndarray):
-        return numpy.array([convert_from(ulab, v) for v in val])
+        return tuple([convert_from(ulab, v) for v in val])
     if isinstance(val, dict):
-        dic_val = deepcopy(val)
-        for k, v in dic_val.items():
-            dic_val[k] = convert_from(ulab, v)
-        return dic_val
+        return {k: convert_from(ulab, v) for k, v in val.items()}
     return val * UNIT[ulab]
 
 
-def convert_to(ulab, val):
+def convert_to(ulab, val, out=None):
     # Convert val expressed in standard unit to ulab
+    # Numeric arrays are converted with one division, into out if given, out=val converts in place
+    # Lists, tuples and dicts are converted recursively into new containers of the same type
     if isinstance(val, (type(None), str)):
         return val
+    if isinstance(val, numpy.ndarray) and val.dtype!=object:
+        if ulab in INTEGER:
+            val = numpy.trunc(val, out=out)
+        return numpy.divide(val, UNIT[ulab], out=out)
+    if isinstance(val, numpy.ndarray):
+        return numpy.array([convert_to(ulab, v) for v in val])
     if isinstance(val, list):
         return [convert_to(ulab, v) for v in val]
     if isinstance(val, tuple):
         return tuple([convert_to(ulab, v) for v in val])
-    if isinstance(val, numpy.ndarray):
-        return numpy.array([convert_to(ulab, v) for v in val])
     if isinstance(val, dict):
-        dic_val = deepcopy(val)
-        for k, v in dic_val.items():
-            dic_val[k] = convert_to(ulab, v)
-        return dic_val
-    if ulab in ["integer", "int", "entier", "numeric"]:
+        return {k: convert_to(ulab, v) for k, v in val.items()}
+    if ulab in INTEGER:
         val = int(val)
     return val / UNIT[ulab]
 
 
+def dimension(ulab):
+    # Dimension of unit label ulab
+    if ulab not in UNIT.dimension:
+        raise Exception("dimension, unit label is unknown : "+str(ulab))
+    return UNIT.dimension[ulab]
+
+
+FACTOR = {}     # Direct conversion factors, computed once per couple of labels
+
+def conversion_factor(ulab_from, ulab_to):
+    # Factor from ulab_from to ulab_to, the two labels must have the same dimension
+    key = (ulab_from, ulab_to)
+    if key not in FACTOR:
+        if dimension(ulab_from)!=dimension(ulab_to):
+            raise Exception("conversion_factor, "+ulab_from+" and "+ulab_to+" have different dimensions")
+        FACTOR[key] = UNIT[ulab_from] / UNIT[ulab_to]
+    return FACTOR[key]
+
+
+def convert_between(ulab_from, ulab_to, val, out=None):
+    # Convert val expressed in ulab_from to ulab_to with one cached factor
+    # Numeric arrays are converted with one multiplication, into out if given, out=val converts in place
+    factor = conversion_factor(ulab_from, ulab_to)
+    if isinstance(val, (type(None), str)):
+        return val
+    if isinstance(val, numpy.ndarray) and val.dtype!=object:
+        val = numpy.multiply(val, factor, out=out)
+        if ulab_to in INTEGER:
+            val = numpy.trunc(val, out=val)
+        return val
+    if isinstance(val, numpy.ndarray):
+        return numpy.array([convert_between(ulab_from, ulab_to, v) for v in val])
+    if isinstance(val, list):
+        return [convert_between(ulab_from, ulab_to, v) for v in val]
+    if isinstance(val, tuple):
+        return tuple([convert_between(ulab_from, ulab_to, v) for v in val])
+    if isinstance(val, dict):
+        return {k: convert_between(ulab_from, ulab_to, v) for k, v in val.items()}
+    if ulab_to in INTEGER:
+        return float(int(val * factor))
+    return val * factor